@@ -0,0 +1,71 @@
+"""Compare cache codecs by stored size and decode latency.
+
+Run from the repository root: python -m benchmarks.cache_codec
+"""
+import timeit
+import uuid
+from datetime import datetime, timezone
+from itertools import cycle, islice
+from pathlib import Path
+
+from src.domain.models.chat import Message, Source
+from src.infrastructure.cache.codecs import CacheCodec, CacheEntry, JsonCodec, MsgpackCodec
+
+# realistic quotes: chunks of this repository's own code
+FILES = sorted(Path(__file__).resolve().parent.parent.joinpath("src").rglob("*.py"))
+QUOTES = [
+    text[:800] for text in (path.read_text() for path in FILES) if len(text) >= 800
+]
+
+
+def make_entry(n_sources: int, content_size: int) -> CacheEntry:
+    """Create entry with answer of given size and number of quoted sources."""
+    return CacheEntry(
+        query="How is the database session created?",
+        message=Message(
+            id=uuid.uuid4(),
+            role="assistant",
+            content=("The session is created by the infrastructure provider. " * 64)[:content_size],
+            created_at=datetime.now(timezone.utc),
+            sources=[
+                Source(
+                    title=f"src/module_{i}.py",
+                    url=f"https://gitlab.example.com/group/project/-/blob/main/src/module_{i}.py",
+                    quote=quote
+                )
+                for i, quote in enumerate(islice(cycle(QUOTES), n_sources))
+            ]
+        )
+    )
+
+
+def measure(codec: CacheCodec, entry: CacheEntry, number: int = 2000):
+    """Get stored size in bytes, encode and decode latency in microseconds."""
+    data = codec.encode(entry)
+    encode = timeit.timeit(lambda: codec.encode(entry), number=number) / number * 1e6
+    decode = timeit.timeit(lambda: codec.decode(data), number=number) / number * 1e6
+    return len(data), encode, decode
+
+
+def main():
+    """Print comparison table."""
+    codecs = {
+        "json": JsonCodec(),
+        "msgpack": MsgpackCodec(compress_min_size=2**31),
+        "msgpack+zlib": MsgpackCodec(),
+    }
+    cases = {
+        "short, no sources": make_entry(0, 200),
+        "3 sources": make_entry(3, 1500),
+        "10 sources": make_entry(10, 3000),
+    }
+
+    print(f"{'case':<20}{'codec':<14}{'bytes':>8}{'encode, us':>14}{'decode, us':>14}")
+    for case, entry in cases.items():
+        for name, codec in codecs.items():
+            size, encode, decode = measure(codec, entry)
+            print(f"{case:<20}{name:<14}{size:>8}{encode:>14.1f}{decode:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
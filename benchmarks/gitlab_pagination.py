@@ -0,0 +1,45 @@
+"""Measure time to list all projects of a GitLab instance with simulated latency.
+
+Compares page size and number of pages fetched concurrently by GitLabClient.
+Run from the repository root: python -m benchmarks.gitlab_pagination
+"""
+import asyncio
+import time
+
+import httpx
+
+from src.infrastructure.external.gitlab_client import GitLabClient
+from tests.gitlab_stub import BASE_URL, TOKEN, make_transport
+
+PROJECTS = 2000
+LATENCY = 0.05 # sec per request, round trip plus GitLab's own time
+
+
+async def measure(per_page: int, concurrency: int) -> float:
+    """Get seconds to list all projects."""
+    transport = make_transport(total=PROJECTS, latency=LATENCY)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = GitLabClient(http_client, max_concurrency=concurrency, per_page=per_page)
+        started_at = time.perf_counter()
+        repositories = await client.list_projects(BASE_URL, TOKEN)
+        elapsed = time.perf_counter() - started_at
+
+    if len(repositories) != PROJECTS:
+        raise RuntimeError(f"Listed {len(repositories)} projects of {PROJECTS}")
+    return elapsed
+
+
+async def main() -> None:
+    """Print listing time per mode."""
+    modes = [(20, 1), (100, 1), (100, 4), (100, 8)]
+
+    print(f"{PROJECTS} projects, {LATENCY * 1000:.0f} ms per request")
+    print(f"{'per_page':>10} {'concurrency':>12} {'requests':>10} {'seconds':>10}")
+    for per_page, concurrency in modes:
+        elapsed = await measure(per_page, concurrency)
+        requests = (PROJECTS + per_page - 1) // per_page
+        print(f"{per_page:>10} {concurrency:>12} {requests:>10} {elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
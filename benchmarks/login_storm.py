@@ -0,0 +1,105 @@
+"""Measure latency of an unrelated endpoint during a burst of logins.
+
+Compares bcrypt verification run inline on the event loop with PasswordHasher.
+Run from the repository root: python -m benchmarks.login_storm
+"""
+import asyncio
+import statistics
+import time
+from typing import List, Optional
+
+import httpx
+from fastapi import FastAPI
+
+from src.infrastructure.security.password import (
+    PasswordHasher,
+    get_password_hash,
+    verify_password,
+)
+
+LOGINS = 16
+PINGS = 400
+PING_INTERVAL = 0.005 # sec
+WORKERS = 4
+
+PASSWORD = "correct horse battery staple" # noqa: S105
+HASHED_PASSWORD = get_password_hash(PASSWORD)
+
+
+def make_app(password_hasher: Optional[PasswordHasher]) -> FastAPI:
+    """Create app with a login-like endpoint and an unrelated cheap one."""
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login() -> dict:
+        if password_hasher is None:
+            ok = verify_password(PASSWORD, HASHED_PASSWORD)
+        else:
+            ok = await password_hasher.verify(PASSWORD, HASHED_PASSWORD)
+        return {"ok": ok}
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    return app
+
+
+async def measure(password_hasher: Optional[PasswordHasher], storm: bool) -> List[float]:
+    """Get latencies (ms) of /ping, sent at a steady rate, with logins spread alongside.
+
+    Latency is counted from the moment a ping was due, so time the loop was blocked
+    before sending it is included.
+    """
+    transport = httpx.ASGITransport(app=make_app(password_hasher))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies = []
+
+        started_at = time.perf_counter()
+
+        async def ping(due: float) -> None:
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/ping")
+            latencies.append((time.perf_counter() - due) * 1000)
+
+        async def login(due: float) -> None:
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.post("/login")
+
+        window = PINGS * PING_INTERVAL
+        await asyncio.gather(
+            *(ping(started_at + i * PING_INTERVAL) for i in range(PINGS)),
+            *(login(started_at + i * window / LOGINS) for i in range(LOGINS if storm else 0))
+        )
+
+    return latencies
+
+
+def percentile(values: List[float], q: int) -> float:
+    """Get q-th percentile of values."""
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def main() -> None:
+    """Print /ping latency percentiles per mode."""
+    password_hasher = PasswordHasher(max_workers=WORKERS)
+    modes = [
+        ("idle", None, False),
+        ("storm, inline bcrypt", None, True),
+        (f"storm, PasswordHasher({WORKERS})", password_hasher, True),
+    ]
+
+    print(f"{LOGINS} logins, {PINGS} pings every {PING_INTERVAL * 1000:.0f} ms")
+    print(f"{'mode':<28} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for name, hasher, storm in modes:
+        latencies = await measure(hasher, storm)
+        print(
+            f"{name:<28} {percentile(latencies, 50):>10.2f} "
+            f"{percentile(latencies, 99):>10.2f} {max(latencies):>10.2f}"
+        )
+
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,13 +1,27 @@
+import hmac
+import math
 import uuid
-from typing import Optional
+from typing import Annotated, Awaitable, Callable, Optional
 
 from dishka.integrations.fastapi import FromDishka, inject
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import OAuth2PasswordBearer
+from pydantic import ValidationError
 
-from src.core.security_policy import ROLE_PERMISSIONS, Action
-from src.domain.models.user import User as DomainUser
+from src.api.schemas.repository import GitLabWebhookEvent
+from src.core.security_policy import (
+    ACTION_BITS,
+    RATE_LIMITS,
+    Action,
+    RateLimit,
+    role_permissions,
+)
+from src.core.settings import settings
+from src.domain.models.user import Principal
 from src.domain.repositories.user_repo import IUserRepository
+from src.infrastructure.cache.rate_limiter import RateLimiter
+from src.infrastructure.cache.revocation import TokenRevocationList
 from src.infrastructure.security.jwt import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/token")
@@ -16,9 +30,10 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/token")
 @inject
 async def get_current_user(
     user_repo: FromDishka[IUserRepository],
+    revocations: FromDishka[TokenRevocationList],
     token: str = Depends(oauth2_scheme),
-) -> DomainUser:
-    """Decode JWT token and find user in database."""
+) -> Principal:
+    """Decode JWT token, check it isn't revoked and find user in cache or database."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,6 +44,10 @@ async def get_current_user(
     if payload is None:
         raise credentials_exception
 
+    jti: Optional[str] = payload.get("jti")
+    if jti is not None and await revocations.is_revoked(jti):
+        raise credentials_exception
+
     user_id_str: Optional[str] = payload.get("sub")
     if user_id_str is None:
         raise credentials_exception
@@ -38,7 +57,7 @@ async def get_current_user(
     except ValueError as error:
         raise credentials_exception from error
 
-    user = await user_repo.get_by_id(user_id=user_id)
+    user = await user_repo.get_principal(user_id=user_id)
     if user is None:
         raise credentials_exception
 
@@ -51,11 +70,95 @@ class PermissionChecker:
 
     def __init__(self, required_action: Action):
         self.required_action = required_action
+        self.required_bit = ACTION_BITS[required_action]
 
-    def __call__(self, user: DomainUser = Depends(get_current_user)) -> None:
+    def __call__(self, user: Principal = Depends(get_current_user)) -> None:
         """Check user's access."""
-        if self.required_action not in ROLE_PERMISSIONS[user.role]:
+        if not role_permissions.allows(user.role, self.required_bit):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required permission: {self.required_action.value}"
             )
+
+
+async def _throttle(limiter: RateLimiter, action: Action, client: str, limit: RateLimit) -> None:
+    retry_after = await limiter.acquire(action.value, client, limit)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def client_address(request: Request) -> str:
+    """Get client's IP address, from X-Forwarded-For of TRUSTED_PROXY_HOPS proxies if set.
+
+    Every proxy appends the address it got the request from, so only the last ones
+    are trusted: the rest of the header is up to the client.
+    """
+    host = request.client.host if request.client else "unknown"
+    hops = settings.TRUSTED_PROXY_HOPS
+    if hops <= 0:
+        return host
+
+    forwarded = [
+        address.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for address in header.split(",")
+        if address.strip()
+    ]
+    # the request didn't come through all the proxies: only the peer is known
+    if len(forwarded) < hops:
+        return host
+
+    return forwarded[-hops]
+
+
+def rate_limited(action: Action, by_user: bool = True) -> Callable[..., Awaitable[None]]:
+    """Create dependency limiting how often a client performs action, by RATE_LIMITS.
+
+    Clients are told apart by current user or, for anonymous actions, by IP address
+    (see client_address).
+    """
+    limit = RATE_LIMITS[action]
+
+    if by_user:
+        @inject
+        async def limit_user(
+            limiter: FromDishka[RateLimiter],
+            user: Principal = Depends(get_current_user),
+        ) -> None:
+            await _throttle(limiter, action, f"user:{user.id}", limit)
+
+        return limit_user
+
+    @inject
+    async def limit_ip(request: Request, limiter: FromDishka[RateLimiter]) -> None:
+        await _throttle(limiter, action, f"ip:{client_address(request)}", limit)
+
+    return limit_ip
+
+
+def verify_gitlab_token(x_gitlab_token: Annotated[Optional[str], Header()] = None) -> None:
+    """Check secret token of GitLab's webhook event."""
+    webhook_secret = settings.GITLAB_WEBHOOK_SECRET
+    if webhook_secret is None or not hmac.compare_digest(
+        (x_gitlab_token or "").encode(),
+        webhook_secret.get_secret_value().encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook token."
+        )
+
+
+async def gitlab_webhook_event(
+        request: Request,
+        _: None = Depends(verify_gitlab_token)
+) -> GitLabWebhookEvent:
+    """Get GitLab's webhook event, parsed only once its secret token is checked."""
+    try:
+        return GitLabWebhookEvent.model_validate_json(await request.body())
+    except ValidationError as error:
+        raise RequestValidationError(error.errors(include_url=False)) from error
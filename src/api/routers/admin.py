@@ -1,13 +1,24 @@
-from typing import List
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Optional
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 
 from src.api.dependencies import PermissionChecker
-from src.api.schemas.admin import RoleCreate, RoleResponse, UserResponse, UserRoleUpdate
+from src.api.schemas.admin import (
+    RoleCreate,
+    RoleResponse,
+    UserPageResponse,
+    UserResponse,
+    UserRoleUpdate,
+)
 from src.application.services.admin_service import AdminService
+from src.core.metrics import metrics
 from src.core.security_policy import Action
+from src.core.settings import settings
+from src.domain.models.user import User, UserFilter
 
 router_admin = APIRouter(
     dependencies=[Depends(PermissionChecker(Action.ADMIN_ACCESS))],
@@ -15,13 +26,52 @@ router_admin = APIRouter(
 )
 
 
+def _user_filter(
+        role: Optional[str] = Query(default=None, description="only users with this role"),
+        username_prefix: Optional[str] = Query(
+            default=None,
+            description="only users whose username starts with it"
+        )
+) -> UserFilter:
+    return UserFilter(role=role, username_prefix=username_prefix)
+
+
 @router_admin.get(
     "/users",
-    response_model=List[UserResponse]
+    response_model=UserPageResponse
 )
-async def get_all_users(admin_service: FromDishka[AdminService]):
-    """Get all users from database."""
-    return await admin_service.get_all_users()
+async def get_users(
+    admin_service: FromDishka[AdminService],
+    filters: UserFilter = Depends(_user_filter),
+    limit: int = Query(default=settings.USERS_PAGE_SIZE, ge=1, le=settings.USERS_MAX_PAGE_SIZE),
+    after: Optional[str] = Query(
+        default=None,
+        description="next_cursor from the previous page to get the next one"
+    ),
+):
+    """Get a page of users ordered by username; pass next_cursor as after to go further."""
+    return await admin_service.get_users_page(filters=filters, limit=limit, after=after)
+
+
+@router_admin.get(
+    "/users/export",
+    response_class=StreamingResponse
+)
+async def export_users(
+    admin_service: FromDishka[AdminService],
+    filters: UserFilter = Depends(_user_filter),
+):
+    """Stream all users ordered by username as NDJSON, one user per line."""
+    return StreamingResponse(
+        _to_ndjson(admin_service.export_users(filters)),
+        media_type="application/x-ndjson"
+    )
+
+
+async def _to_ndjson(users: AsyncIterator[User]) -> AsyncIterator[str]:
+    async with aclosing(users):
+        async for user in users:
+            yield UserResponse.model_validate(user).model_dump_json() + "\n"
 
 
 @router_admin.get(
@@ -56,3 +106,12 @@ async def create_new_role(
 ):
     """Create new custom role."""
     return await admin_service.create_new_role(role_create)
+
+
+@router_admin.get(
+    "/metrics",
+    response_model=Dict[str, float]
+)
+async def get_metrics():
+    """Get in-process counters of the worker that serves the request."""
+    return metrics.snapshot()
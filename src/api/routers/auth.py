@@ -1,11 +1,12 @@
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from src.api.dependencies import get_current_user
+from src.api.dependencies import get_current_user, oauth2_scheme, rate_limited
 from src.api.schemas.auth import Token, UserRegistration, UserResponse
 from src.application.services.auth_service import AuthService
-from src.domain.models.user import User
+from src.core.security_policy import Action
+from src.domain.models.user import Principal
 
 router = APIRouter(route_class=DishkaRoute)
 
@@ -13,6 +14,7 @@ router = APIRouter(route_class=DishkaRoute)
 @router.post(
     "/token",
     response_model=Token,
+    dependencies=[Depends(rate_limited(Action.AUTH_LOGIN, by_user=False))]
 )
 async def login_for_access_token(
     auth_service: FromDishka[AuthService],
@@ -26,6 +28,15 @@ async def login_for_access_token(
     return Token(**token_data)
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    auth_service: FromDishka[AuthService],
+    token: str = Depends(oauth2_scheme)
+):
+    """Revoke the current JWT token."""
+    await auth_service.revoke_token(token)
+
+
 @router.post("/register", response_model=UserResponse)
 async def register(
     user_create: UserRegistration, auth_service: FromDishka[AuthService]
@@ -39,6 +50,6 @@ async def register(
     "/me",
     response_model=UserResponse,
 )
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: Principal = Depends(get_current_user)):
     """Get information about current user."""
     return current_user
@@ -1,20 +1,26 @@
-from typing import List
+import json
+from contextlib import aclosing
+from typing import AsyncIterator, List, Optional, Union
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 
-from src.api.dependencies import PermissionChecker, get_current_user
+from src.api.dependencies import PermissionChecker, get_current_user, rate_limited
 from src.api.schemas.chat import (
     ChatBase,
     ChatHistoryResponse,
     ChatResponse,
+    ChatSummaryResponse,
     MessageCreate,
     MessageResponse,
 )
 from src.application.services.chat_service import ChatService
 from src.core.security_policy import Action
-from src.domain.models.user import User
+from src.core.settings import settings
+from src.domain.models.chat import AnswerChunk, Message
+from src.domain.models.user import Principal
 
 router_chat = APIRouter(
     dependencies=[Depends(get_current_user)],
@@ -31,7 +37,7 @@ router_chat = APIRouter(
 async def create_new_chat(
         chat_data: ChatBase,
         service: FromDishka[ChatService],
-        current_user: User = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_user)
 ):
     """Create new chat with a title."""
     return await service.create_chat(
@@ -42,12 +48,12 @@ async def create_new_chat(
 
 @router_chat.get(
     "/",
-    response_model=List[ChatResponse],
+    response_model=List[ChatSummaryResponse],
     dependencies=[Depends(PermissionChecker(Action.CHAT_READ))]
 )
 async def get_user_chats(
         service: FromDishka[ChatService],
-        current_user: User = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_user)
 ):
     """Get all chat for a specific user."""
     return await service.get_user_chats(current_user.id)
@@ -61,26 +67,43 @@ async def get_user_chats(
 async def get_chat_history(
         chat_id: UUID4,
         service: FromDishka[ChatService],
-        current_user: User = Depends(get_current_user)
+        limit: int = Query(
+            default=settings.CHAT_HISTORY_PAGE_SIZE,
+            ge=1,
+            le=settings.CHAT_HISTORY_MAX_PAGE_SIZE
+        ),
+        before: Optional[str] = Query(
+            default=None,
+            description="next_cursor from the previous page to get older messages"
+        ),
+        current_user: Principal = Depends(get_current_user)
 ):
-    """Get chat history by chat_id."""
+    """Get chat history by chat_id.
+
+    Return the latest limit messages; pass next_cursor as before to go further back.
+    """
     return await service.get_chat_history(
         user_id=current_user.id,
-        chat_id=chat_id
+        chat_id=chat_id,
+        limit=limit,
+        before=before
     )
 
 
 @router_chat.post(
     "/{chat_id}/message",
     response_model=MessageResponse,
-    dependencies=[Depends(PermissionChecker(Action.CHAT_WRITE))]
+    dependencies=[
+        Depends(PermissionChecker(Action.CHAT_WRITE)),
+        Depends(rate_limited(Action.CHAT_WRITE))
+    ]
 )
 async def send(
         chat_id: UUID4,
         repo_ids: List[UUID4],
         message: MessageCreate,
         service: FromDishka[ChatService],
-        current_user: User = Depends(get_current_user)
+        current_user: Principal = Depends(get_current_user)
 ):
     """QnA iteration.
 
@@ -95,3 +118,61 @@ async def send(
         repo_ids=repo_ids,
         question=message.content
     )
+
+
+@router_chat.post(
+    "/{chat_id}/message/stream",
+    response_class=StreamingResponse,
+    dependencies=[
+        Depends(PermissionChecker(Action.CHAT_WRITE)),
+        Depends(rate_limited(Action.CHAT_WRITE))
+    ]
+)
+async def send_stream(
+        chat_id: UUID4,
+        repo_ids: List[UUID4],
+        message: MessageCreate,
+        service: FromDishka[ChatService],
+        current_user: Principal = Depends(get_current_user)
+):
+    """QnA iteration with the answer streamed as server-sent events.
+
+    Events:
+    - token: {"content": "..."} - the next part of the answer;
+    - sources: [...] - sources of the answer, sent after the whole answer;
+    - message: {...} - the saved answer, the last event of the stream.
+
+    If the client disconnects, nothing is saved to the chat; the answer's generation,
+    shared with identical questions, still completes and is cached.
+    """
+    events = await service.stream_question(
+        user_id=current_user.id,
+        chat_id=chat_id,
+        repo_ids=repo_ids,
+        question=message.content
+    )
+
+    return StreamingResponse(
+        _to_server_sent_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _to_server_sent_events(
+        events: AsyncIterator[Union[AnswerChunk, Message]]
+) -> AsyncIterator[str]:
+    async with aclosing(events):
+        async for event in events:
+            if isinstance(event, Message):
+                data = MessageResponse.model_validate(event).model_dump_json()
+                yield _format_event("message", data)
+            elif event.sources is not None:
+                data = json.dumps([source.model_dump(mode="json") for source in event.sources])
+                yield _format_event("sources", data)
+            else:
+                yield _format_event("token", json.dumps({"content": event.content}))
+
+
+def _format_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
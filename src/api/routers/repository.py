@@ -3,9 +3,10 @@ from typing import List
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
 from fastapi import APIRouter, Depends, status
 
-from src.api.dependencies import PermissionChecker
+from src.api.dependencies import PermissionChecker, gitlab_webhook_event
 from src.api.schemas.repository import (
     GitLabConfigCreate,
+    GitLabWebhookEvent,
     Repository,
 )
 from src.application.services.index_service import IndexService
@@ -43,3 +44,17 @@ async def list_gitlab_repositories(
     """Get list of repositories that are available for indexing."""
     return await service.list_repositories()
 
+
+@router_repository.post(
+    "/webhook",
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def receive_gitlab_webhook(
+    service: FromDishka[IndexService],
+    event: GitLabWebhookEvent = Depends(gitlab_webhook_event)
+):
+    """Receive GitLab's push and merge request events to reindex changed files.
+
+    Event's secret token (X-Gitlab-Token) is checked before its body is read.
+    """
+    return await service.receive_webhook(event=event)
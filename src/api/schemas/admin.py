@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -41,3 +41,10 @@ class UserResponse(UserBase):
     id: UUID
     role: str = Field(..., example="admin")
 
+
+class UserPageResponse(BaseModel):
+
+    """Data structure for a page of users ordered by username."""
+
+    users: List[UserResponse]
+    next_cursor: Optional[str] = None
@@ -33,7 +33,7 @@ class UserInDB(UserBase):
     """Data structure for ful user information fields."""
 
     id: UUID
-    role: UserRole = UserRole.USER
+    role: str = UserRole.USER.value
 
 
 class UserResponse(UserInDB):
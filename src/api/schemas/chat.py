@@ -65,8 +65,17 @@ class ChatResponse(ChatBase):
     owner_id: UUID
 
 
+class ChatSummaryResponse(ChatResponse):
+
+    """Data structure for chat in the list of user's chats (without messages)."""
+
+    message_count: int = 0
+    last_activity_at: Optional[datetime] = None
+
+
 class ChatHistoryResponse(ChatResponse):
 
-    """Data structure for a full chat history with all messages."""
+    """Data structure for a page of chat history, from the oldest message to the latest one."""
 
     messages: List[MessageResponse]
+    next_cursor: Optional[str] = None
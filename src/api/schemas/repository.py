@@ -44,6 +44,39 @@ class IndexingJob(BaseModel):
     details: Optional[str] = None  # возможно мета инфа
 
 
+class GitLabProject(BaseModel):
+
+    """Data structure for project in GitLab's webhook event."""
+
+    id: int
+    default_branch: Optional[str] = None
+
+
+class GitLabCommit(BaseModel):
+
+    """Data structure for commit in GitLab's push event."""
+
+    added: List[str] = []
+    modified: List[str] = []
+    removed: List[str] = []
+
+
+class GitLabWebhookEvent(BaseModel):
+
+    """Data structure for GitLab's push or merge request webhook event.
+
+    Only fields of push events are read: a merge lands as a push to the target branch.
+    """
+
+    object_kind: str
+    project: GitLabProject
+    ref: Optional[str] = None
+    before: Optional[str] = None
+    after: Optional[str] = None
+    commits: List[GitLabCommit] = []
+    total_commits_count: int = 0
+
+
 class JobStatusUpdate(BaseModel):
 
     """Data structure for job's status updating."""
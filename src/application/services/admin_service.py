@@ -1,11 +1,19 @@
 import uuid
-from typing import List
+from typing import AsyncIterator, List, Optional
 
 from fastapi import HTTPException, status
 from pydantic import UUID4
 
 from src.api.schemas.admin import RoleCreate
-from src.domain.models.user import Role as DomainRole, User as DomainUser
+from src.core.security_policy import BUILT_IN_ROLES
+from src.core.settings import settings
+from src.domain.models.user import (
+    Role as DomainRole,
+    User as DomainUser,
+    UserCursor,
+    UserFilter,
+    UserPage,
+)
 from src.domain.repositories.role_repo import IRoleRepository
 from src.domain.repositories.user_repo import IUserRepository
 
@@ -14,13 +22,47 @@ class AdminService:
 
     """Provides methods for managing users, roles, and permissions."""
 
-    def __init__(self, user_repo: IUserRepository, role_repo: IRoleRepository):
+    def __init__(
+            self,
+            user_repo: IUserRepository,
+            role_repo: IRoleRepository
+    ):
         self.user_repo = user_repo
         self.role_repo = role_repo
 
-    async def get_all_users(self) -> List[DomainUser]:
-        """Get all users from database."""
-        return await self.user_repo.get_all_users()
+    async def get_users_page(
+            self,
+            filters: UserFilter,
+            limit: int = settings.USERS_PAGE_SIZE,
+            after: Optional[str] = None
+    ) -> UserPage:
+        """Get a page of users matching filters, ordered by username.
+
+        Return limit users following the after cursor (the first ones if it's None).
+        """
+        cursor = None
+        if after:
+            try:
+                cursor = UserCursor.decode(after)
+            except ValueError as error:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor."
+                ) from error
+
+        # one extra user tells whether there is a next page
+        users = await self.user_repo.get_users(limit=limit + 1, filters=filters, after=cursor)
+
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = UserCursor(username=users[-1].username).encode()
+
+        return UserPage(users=users, next_cursor=next_cursor)
+
+    def export_users(self, filters: UserFilter) -> AsyncIterator[DomainUser]:
+        """Stream all users matching filters, ordered by username."""
+        return self.user_repo.stream_users(filters)
 
     async def get_all_roles(self) -> List[DomainRole]:
         """Get all roles from database."""
@@ -35,8 +77,8 @@ class AdminService:
                 detail="There is no such user with given user_id.",
             )
 
-        existing_role = await self.role_repo.get_by_name(role_name)
-        if not existing_role:
+        # built-in roles needn't be stored in db
+        if role_name not in BUILT_IN_ROLES and not await self.role_repo.get_by_name(role_name):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="There is no such role with given role_name. Try to create it firts.",
@@ -48,7 +90,13 @@ class AdminService:
         return updated_user
 
     async def create_new_role(self, role_create: RoleCreate) -> DomainRole:
-        """Create new custom role."""
+        """Create new custom role, effective in permission checks once it's committed."""
+        if role_create.name in BUILT_IN_ROLES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Built-in role can't be created"
+            )
+
         existing_role = await self.role_repo.get_by_name(role_create.name)
         if existing_role:
             raise HTTPException(
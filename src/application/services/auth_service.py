@@ -5,37 +5,36 @@ from fastapi import HTTPException, status
 from src.api.schemas.auth import UserRegistration
 from src.domain.models.user import User as DomainUser
 from src.domain.repositories.user_repo import IUserRepository
-from src.infrastructure.security.jwt import create_access_token
-from src.infrastructure.security.password import get_password_hash, verify_password
+from src.infrastructure.cache.revocation import TokenRevocationList
+from src.infrastructure.security.jwt import create_access_token, decode_access_token
+from src.infrastructure.security.password import PasswordHasher
 
 
 class AuthService:
 
     """Provides method for authentification."""
 
-    def __init__(self, user_repo: IUserRepository):
+    def __init__(
+            self,
+            user_repo: IUserRepository,
+            password_hasher: PasswordHasher,
+            revocations: TokenRevocationList
+    ):
         self.user_repo = user_repo
+        self.password_hasher = password_hasher
+        self.revocations = revocations
 
     async def register_new_user(self, user_registration: UserRegistration) -> DomainUser:
         """Register new user.
 
-        1. Check that no user exists with the same email or username
+        1. Check that username and email aren't taken, before the costly hashing
         2. Hash the password
-        3. Save the user in db.
+        3. Save the user in db unless a user with the same username or email exists
+        4. On conflict (registered meanwhile), find out which of them is taken.
         """
-        user_from_db = await self.user_repo.get_by_username(user_registration.username)
-        if user_from_db:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Username is already registered"
-            )
-
-        user_from_db = await self.user_repo.get_by_email(user_registration.email)
-        if user_from_db:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Email is already registered"
-            )
+        await self._check_not_taken(user_registration)
 
-        hashed_password = get_password_hash(user_registration.password)
+        hashed_password = await self.password_hasher.hash(user_registration.password)
         new_user = DomainUser(
             id=uuid.uuid4(),
             username=user_registration.username,
@@ -44,14 +43,30 @@ class AuthService:
             hashed_password=hashed_password,
         )
 
-        created_user = await self.user_repo.create(new_user)
-        if not created_user:
+        created_user = await self.user_repo.create_if_unique(new_user)
+        if created_user:
+            return created_user
+
+        await self._check_not_taken(user_registration)
+
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User could not be created (possible duplicate)",
+        )
+
+    async def _check_not_taken(self, user_registration: UserRegistration) -> None:
+        taken_field = await self.user_repo.get_taken_field(
+            username=user_registration.username,
+            email=user_registration.email
+        )
+        if taken_field == "username":
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="User could not be created (possible duplicate)",
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Username is already registered"
+            )
+        if taken_field == "email":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Email is already registered"
             )
-
-        return created_user
 
     async def authenticate_user(self, username: str, password: str) -> dict:
         """Authentificate user.
@@ -69,7 +84,7 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        if not verify_password(password, user.hashed_password):
+        if not await self.password_hasher.verify(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -80,3 +95,22 @@ class AuthService:
         access_token = create_access_token(data=token_data)
 
         return {"access_token": access_token, "token_type": "bearer"}
+
+    async def revoke_token(self, token: str) -> None:
+        """Revoke token until it expires, so it can't be used anymore (logout)."""
+        payload = decode_access_token(token)
+        if payload is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        jti = payload.get("jti")
+        if jti is None or "exp" not in payload:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Token can't be revoked",
+            )
+
+        await self.revocations.revoke(jti, expires_at=payload["exp"])
@@ -1,13 +1,26 @@
+import asyncio
 import uuid
+from contextlib import aclosing, nullcontext
 from datetime import datetime
-from typing import List, Optional
+from functools import partial
+from typing import AsyncContextManager, AsyncIterator, Callable, List, Optional, Union
 
 from fastapi import HTTPException, status
 from pydantic import UUID4
 
-from src.domain.models.chat import Chat, Message, MessageRole, Source
+from src.core.settings import settings
+from src.domain.models.chat import (
+    AnswerChunk,
+    Chat,
+    ChatHistory,
+    ChatSummary,
+    Message,
+    MessageCursor,
+    MessageRole,
+)
 from src.domain.repositories.cache_repo import ICacheRepository
 from src.domain.repositories.chat_repo import IChatRepository
+from src.infrastructure.external.llm_client import LLMClient
 
 
 class ChatService:
@@ -17,47 +30,87 @@ class ChatService:
     def __init__(
             self,
             chat_repo: IChatRepository,
-            cache_repo: ICacheRepository
+            cache_repo: ICacheRepository,
+            llm_client: LLMClient,
+            chat_unit_of_work: Optional[Callable[[], AsyncContextManager[IChatRepository]]] = None
     ):
         self.chat_repo = chat_repo
         self.cache_repo = cache_repo
+        self.llm_client = llm_client
+        # streams outlive the request's session: they use short ones of their own
+        self.chat_unit_of_work = chat_unit_of_work
 
     async def create_chat(self, owner_id: UUID4, title: str) -> Chat:
         """Create a new chat with specified title for user by their id."""
         return await self.chat_repo.create_chat(owner_id, title)
 
-    async def get_user_chats(self, user_id: UUID4) -> List[Chat]:
+    async def get_user_chats(self, user_id: UUID4) -> List[ChatSummary]:
         """Get all user chats by user_id."""
         return await self.chat_repo.get_user_chats(user_id)
 
-    async def get_chat_history(self, user_id: UUID4, chat_id: UUID4) -> Optional[Chat]:
-        """Get chat history.
+    async def get_chat_history(
+            self,
+            user_id: UUID4,
+            chat_id: UUID4,
+            limit: int = settings.CHAT_HISTORY_PAGE_SIZE,
+            before: Optional[str] = None
+    ) -> ChatHistory:
+        """Get a page of chat history.
 
         1. Check that user has an access to this chat.
-        2. Return chat history by its id.
+        2. Return limit latest messages older than the before cursor (all latest if it's None).
         """
-        chat = await self.chat_repo.get_chat_full(chat_id)
+        cursor = None
+        if before:
+            try:
+                cursor = MessageCursor.decode(before)
+            except ValueError as error:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor."
+                ) from error
+
+        chat = await self.chat_repo.get_chat(chat_id)
         await self._validate_chat_access(
             user_id=user_id,
             chat_id=chat_id,
-            chat=chat
+            owner_id=chat.owner_id if chat else None
+        )
+
+        # one extra message tells whether there is an older page
+        messages = await self.chat_repo.get_chat_messages(
+            chat_id=chat_id,
+            limit=limit + 1,
+            before=cursor
         )
 
-        return chat
+        next_cursor = None
+        if len(messages) > limit:
+            messages = messages[1:]
+            next_cursor = MessageCursor(
+                created_at=messages[0].created_at,
+                id=messages[0].id
+            ).encode()
+
+        return ChatHistory(
+            **chat.model_dump(exclude={"messages"}),
+            messages=messages,
+            next_cursor=next_cursor
+        )
 
     async def _validate_chat_access(
             self,
             user_id: UUID4,
             chat_id: UUID4,
-            chat: Optional[Chat] = None,
-    ) -> Optional[Chat]:
-        if not chat:
+            owner_id: Optional[UUID4] = None,
+    ) -> None:
+        if not owner_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Chat {chat_id} not found"
             )
 
-        if chat.owner_id != user_id:
+        if owner_id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"User {user_id} doesn't have access to the chat {chat_id}."
@@ -77,51 +130,146 @@ class ChatService:
         3. Run RAG pipeline (later).
         4. Save RAG answer.
         """
-        chat = await self.chat_repo.get_chat_full(chat_id)
         await self._validate_chat_access(
             user_id=user_id,
             chat_id=chat_id,
-            chat=chat
+            owner_id=await self.chat_repo.get_chat_owner(chat_id)
         )
 
-        cache_key = self.cache_repo.construct_cache_key(
+        cache_key = await self.cache_repo.construct_cache_key(
             query=question,
             repository_ids=repo_ids
         )
 
-        message = await self.cache_repo.get_cached_value(cache_key)
-
-        if message is None:
-            message = Message(
-                id=uuid.uuid4(),
-                role=MessageRole.ASSISTANT,
-                content="Will be a real llm call later :)",
-                created_at=datetime.now(),
-                sources=[
-                    Source(
-                        title="README.md",
-                        url="https://gitlab/mock_project/readme/",
-                        quote="Mock quote"
-                    )
-                ]
-            )
+        # concurrent identical questions share one generation
+        message = await self.cache_repo.get_or_generate(
+            key=cache_key,
+            generate=partial(self.llm_client.ask, question, repo_ids),
+            query=question
+        )
 
-            await self.cache_repo.put_cache_value(
-                key=cache_key,
-                message=message
-            )
+        return await self._save_answer(chat_id, question, message)
 
-        await self.chat_repo.add_message(
-            chat_id=chat_id,
-            role="user",
-            content=question
+    async def stream_question(
+            self,
+            user_id: UUID4,
+            chat_id: UUID4,
+            repo_ids: List[UUID4],
+            question: str
+    ) -> AsyncIterator[Union[AnswerChunk, Message]]:
+        """QnA iteration with the answer streamed chunk by chunk.
+
+        Access is checked before the stream is returned. The stream yields
+        chunks with answer content, then one chunk with sources and finally
+        the saved assistant's Message, yielded once it's committed. The answer
+        isn't saved to the chat if the stream is closed before its end (e.g. client
+        disconnected), but its generation, shared with identical questions, still
+        completes and is cached.
+        """
+        async with self._stream_chat_repo() as chat_repo:
+            owner_id = await chat_repo.get_chat_owner(chat_id)
+        await self._validate_chat_access(user_id=user_id, chat_id=chat_id, owner_id=owner_id)
+
+        return self._stream_answer(chat_id, repo_ids, question)
+
+    async def _stream_answer(
+            self,
+            chat_id: UUID4,
+            repo_ids: List[UUID4],
+            question: str
+    ) -> AsyncIterator[Union[AnswerChunk, Message]]:
+        cache_key = await self.cache_repo.construct_cache_key(
+            query=question,
+            repository_ids=repo_ids
         )
 
-        assistant_message = await self.chat_repo.add_message(
+        # concurrent identical questions share one generation: the stream that runs it
+        # gets the answer chunk by chunk, the others get it as one chunk when it's ready
+        chunks: asyncio.Queue[str] = asyncio.Queue()
+        generated = False
+
+        async def generate() -> Message:
+            nonlocal generated
+            generated = True
+            return await self._generate_streamed(question, repo_ids, chunks)
+
+        answer = asyncio.ensure_future(self.cache_repo.get_or_generate(
+            key=cache_key,
+            generate=generate,
+            query=question
+        ))
+        chunk = None
+        try:
+            while not answer.done():
+                chunk = asyncio.ensure_future(chunks.get())
+                await asyncio.wait({chunk, answer}, return_when=asyncio.FIRST_COMPLETED)
+                if chunk.done():
+                    yield AnswerChunk(content=chunk.result())
+
+            message = answer.result()
+        finally:
+            if chunk is not None:
+                chunk.cancel()
+            # the generation itself isn't cancelled: its answer is cached for the others
+            answer.cancel()
+
+        while not chunks.empty():
+            yield AnswerChunk(content=chunks.get_nowait())
+        if not generated:
+            yield AnswerChunk(content=message.content)
+
+        yield AnswerChunk(sources=message.sources or [])
+
+        async with self._stream_chat_repo() as chat_repo:
+            saved_message = await self._save_answer(chat_id, question, message, chat_repo)
+        yield saved_message
+
+    def _stream_chat_repo(self) -> AsyncContextManager[IChatRepository]:
+        if self.chat_unit_of_work is None:
+            return nullcontext(self.chat_repo)
+
+        return self.chat_unit_of_work()
+
+    async def _generate_streamed(
+            self,
+            question: str,
+            repo_ids: List[UUID4],
+            chunks: asyncio.Queue
+    ) -> Message:
+        content = []
+        sources = []
+        async with aclosing(self.llm_client.stream(question, repo_ids)) as stream:
+            async for chunk in stream:
+                if chunk.content:
+                    content.append(chunk.content)
+                    chunks.put_nowait(chunk.content)
+                sources.extend(chunk.sources or [])
+
+        return Message(
+            id=uuid.uuid4(),
+            role=MessageRole.ASSISTANT,
+            content="".join(content),
+            created_at=datetime.now(),
+            sources=sources
+        )
+
+    async def _save_answer(
+            self,
+            chat_id: UUID4,
+            question: str,
+            answer: Message,
+            chat_repo: Optional[IChatRepository] = None
+    ) -> Message:
+        _, assistant_message = await (chat_repo or self.chat_repo).add_messages(
             chat_id=chat_id,
-            role="assistant",
-            content=message.content,
-            sources=[source.model_dump(mode="json") for source in message.sources]
+            messages=[
+                {"role": "user", "content": question},
+                {
+                    "role": "assistant",
+                    "content": answer.content,
+                    "sources": [source.model_dump(mode="json") for source in answer.sources or []]
+                },
+            ]
         )
 
         return assistant_message
@@ -3,12 +3,21 @@ from typing import Dict, List, Optional
 from fastapi import HTTPException, status
 from pydantic import UUID4
 
-from src.api.schemas.repository import JobStatusUpdate
+from src.api.schemas.repository import GitLabWebhookEvent, JobStatusUpdate
 from src.core.settings import settings
-from src.domain.models.knowledge import IndexingJob, Repository
+from src.domain.models.knowledge import (
+    IndexingJob,
+    JobStatus,
+    Repository,
+    RepositoryChanges,
+)
+from src.domain.repositories.cache_repo import ICacheRepository
 from src.domain.repositories.gitlab_repo import IGitLabRepository
 from src.domain.repositories.job_repo import IJobRepository
-from src.infrastructure.external.gitlab_client import GitLabClient
+from src.infrastructure.cache.gitlab_catalogue import GitLabCatalogue
+from src.infrastructure.cache.gitlab_config import GitLabConfigHolder, GitLabCredentials
+from src.infrastructure.cache.push_debouncer import PushDebouncer
+from src.infrastructure.external.gitlab_client import GitLabClient, repository_id
 from src.infrastructure.external.mlops_client import MLOpsClient
 from src.infrastructure.security.encription import decrypt_data, encrypt_data
 
@@ -20,12 +29,21 @@ class IndexService:
     def __init__(
             self,
             gitlab_repo: IGitLabRepository,
-            job_repo: IJobRepository
+            job_repo: IJobRepository,
+            cache_repo: Optional[ICacheRepository] = None,
+            gitlab_client: Optional[GitLabClient] = None,
+            catalogue: Optional[GitLabCatalogue] = None,
+            push_debouncer: Optional[PushDebouncer] = None,
+            config_holder: Optional[GitLabConfigHolder] = None
     ):
             self.gitlab_repo = gitlab_repo
             self.job_repo = job_repo
+            self.cache_repo = cache_repo
 
-            self.gitlab_client = GitLabClient()
+            self.gitlab_client = gitlab_client
+            self.catalogue = catalogue
+            self.push_debouncer = push_debouncer
+            self.config_holder = config_holder
             self.mlops_client = MLOpsClient(base_url=settings.MLOPS_SERVICE_URL.get_secret_value())
 
     async def configure_gitlab(self, url: str, private_token: str) -> Dict[str, str]:
@@ -37,36 +55,38 @@ class IndexService:
         return {"status": "ok", "message": "GitLab configuration saved successfully."}
 
     async def list_repositories(self) -> List[Repository]:
-        """Get all repositories for given GitLab instance."""
-        config = await self.gitlab_repo.get_config()
-        if not config:
+        """Get all repositories for given GitLab instance, from catalogue's cache if there's one."""
+        credentials = await self._get_credentials()
+        if not credentials:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="GitLab is not configured yet. Please add config first."
             )
 
-        raw_token = decrypt_data(config.private_token_encrypted)
+        if self.catalogue is not None:
+            return await self.catalogue.list_projects(
+                base_url=credentials.url,
+                token=credentials.token
+            )
 
         return await self.gitlab_client.list_projects(
-            base_url=config.url,
-            token=raw_token
+            base_url=credentials.url,
+            token=credentials.token
         )
 
     async def trigger_indexing(self, repository_ids: List[UUID4]) -> IndexingJob:
         """Trigger and run indexing service."""
-        config = await self.gitlab_repo.get_config()
-        if not config:
+        credentials = await self._get_credentials()
+        if not credentials:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="GitLab is not configured yet. You should configure it first."
             )
 
-        decrypted_token = decrypt_data(config.private_token_encrypted)
-
         job_info = await self.mlops_client.trigger_indexing(
             repo_ids=repository_ids,
-            gitlab_url=config.url,
-            gitlab_token=decrypted_token
+            gitlab_url=credentials.url,
+            gitlab_token=credentials.token
         )
 
         await self.job_repo.create_job(
@@ -78,6 +98,53 @@ class IndexService:
 
         return job_info
 
+    async def trigger_incremental_indexing(self, changes: RepositoryChanges) -> IndexingJob:
+        """Trigger indexing of changed files of a repository."""
+        credentials = await self._get_credentials()
+        if not credentials:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="GitLab is not configured yet. You should configure it first."
+            )
+
+        job_info = await self.mlops_client.trigger_incremental_indexing(
+            changes=changes,
+            gitlab_url=credentials.url,
+            gitlab_token=credentials.token
+        )
+
+        await self.job_repo.create_job(
+            job_id=job_info.id,
+            repo_ids=[changes.repository_id],
+            status=job_info.status,
+            details=job_info.details
+        )
+
+        return job_info
+
+    async def receive_webhook(self, event: GitLabWebhookEvent) -> Dict[str, str]:
+        """Queue changes pushed to a default branch by GitLab's verified webhook event.
+
+        Pushes to a repository are coalesced, so it's reindexed once per burst of them.
+        """
+        if not _is_default_branch_push(event):
+            return {"status": "ok", "message": "Event is ignored."}
+
+        credentials = await self._get_credentials()
+        if not credentials:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="GitLab is not configured yet. Please add config first."
+            )
+
+        changes = _pushed_changes(repository_id(credentials.url, event.project.id), event)
+        if self.push_debouncer is not None:
+            await self.push_debouncer.add(changes)
+        else:
+            await self.trigger_incremental_indexing(changes)
+
+        return {"status": "ok", "message": "Push is queued for indexing."}
+
     async def delete_indexind_job(self, job_id: str) -> bool:
         """Delete an existing job by its id.
 
@@ -89,6 +156,20 @@ class IndexService:
 
         return {"status": "error", "message": f"Job {job_id} doesn't exist."}
 
+    async def _get_credentials(self) -> Optional[GitLabCredentials]:
+        """Get GitLab url with decrypted token, from config holder if there's one."""
+        if self.config_holder is not None:
+            return await self.config_holder.get(self.gitlab_repo.get_config)
+
+        config = await self.gitlab_repo.get_config()
+        if not config:
+            return None
+
+        return GitLabCredentials(
+            url=str(config.url),
+            token=decrypt_data(config.private_token_encrypted)
+        )
+
     async def get_indexing_status(self, job_id: str) -> Optional[IndexingJob]:
         """Get status for existing indexing job."""
         return await self.job_repo.get_job(job_id)
@@ -98,5 +179,52 @@ class IndexService:
             job_id: str,
             status_update: JobStatusUpdate
     ) -> Optional[IndexingJob]:
-        """Update a status of an existing job by its id."""
-        return await self.job_repo.update_job_status(job_id, status_update.status)
+        """Update a status of an existing job by its id.
+
+        Successfully reindexed repositories get new cache generations, so answers
+        cached before that aren't served anymore.
+        """
+        job = await self.job_repo.update_job_status(job_id, status_update.status)
+
+        if job and job.status == JobStatus.SUCCESS and self.cache_repo is not None:
+            await self.cache_repo.bump_generations(job.repository_ids)
+
+        return job
+
+
+NULL_SHA = "0" * 40
+
+
+def _is_default_branch_push(event: GitLabWebhookEvent) -> bool:
+    # merge requests are indexed by pushes of their merges; deleted branches aren't
+    return (
+        event.object_kind == "push"
+        and event.project.default_branch is not None
+        and event.ref == f"refs/heads/{event.project.default_branch}"
+        and event.after not in (None, NULL_SHA)
+    )
+
+
+def _pushed_changes(repo_id: UUID4, event: GitLabWebhookEvent) -> RepositoryChanges:
+    if event.before in (None, NULL_SHA) or event.total_commits_count > len(event.commits):
+        # new branch or commits GitLab left out of the event: files are unknown
+        return RepositoryChanges(
+            repository_id=repo_id,
+            before=event.before or NULL_SHA,
+            after=event.after
+        )
+
+    paths: Dict[str, bool] = {}
+    for commit in event.commits:
+        for path in commit.added + commit.modified:
+            paths[path] = True
+        for path in commit.removed:
+            paths[path] = False
+
+    return RepositoryChanges(
+        repository_id=repo_id,
+        before=event.before,
+        after=event.after,
+        paths=[path for path, exists in paths.items() if exists],
+        removed_paths=[path for path, exists in paths.items() if not exists]
+    )
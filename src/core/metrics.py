@@ -0,0 +1,29 @@
+from collections import defaultdict
+from typing import Dict
+
+
+class Metrics:
+
+    """In-process counters of the worker. Not thread-safe, like the rest of in-process state."""
+
+    def __init__(self):
+        self._counters: Dict[str, float] = defaultdict(float)
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Increase counter by value."""
+        self._counters[name] += value
+
+    def get(self, name: str) -> float:
+        """Get counter's value."""
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get values of all counters."""
+        return dict(self._counters)
+
+    def reset(self) -> None:
+        """Set all counters to zero."""
+        self._counters.clear()
+
+
+metrics = Metrics()
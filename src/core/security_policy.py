@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Dict, Set
+from typing import Dict, Iterable, Mapping, NamedTuple, Set
 
 from src.domain.models.user import UserRole
 
@@ -22,6 +22,8 @@ class Action(str, Enum):
 
     ADMIN_ACCESS = "admin:access" # for getting and changing values in db
 
+    AUTH_LOGIN = "auth:login" # getting token by password, allowed to anyone
+
 ROLE_PERMISSIONS: Dict[UserRole, Set[Action]] = {
     UserRole.USER: {
         Action.CHAT_READ,
@@ -43,3 +45,77 @@ ROLE_PERMISSIONS: Dict[UserRole, Set[Action]] = {
         Action.ADMIN_ACCESS
     }
 }
+
+# names of roles of ROLE_PERMISSIONS, which custom roles can't take
+BUILT_IN_ROLES = frozenset(role.value for role in ROLE_PERMISSIONS)
+
+
+class RateLimit(NamedTuple):
+
+    """Data structure for token bucket: refill rate (tokens per second) and capacity."""
+
+    rate: float
+    burst: int
+
+
+# how often one client (user or, for anonymous actions, IP) can perform an action
+RATE_LIMITS: Dict[Action, RateLimit] = {
+    Action.CHAT_WRITE: RateLimit(rate=10 / 60, burst=10), # LLM calls
+    Action.AUTH_LOGIN: RateLimit(rate=5 / 60, burst=5), # bcrypt verifications
+}
+
+# bit of each action in compiled permission masks
+ACTION_BITS: Dict[Action, int] = {action: 1 << i for i, action in enumerate(Action)}
+
+
+def compile_permissions(permissions: Iterable[str]) -> int:
+    """Compile permissions to bitmask over Action. Unknown permissions are ignored."""
+    mask = 0
+    for permission in permissions:
+        try:
+            mask |= ACTION_BITS[Action(permission)]
+        except ValueError:
+            continue
+
+    return mask
+
+
+class RolePermissions:
+
+    """Compiled permission bitmask of every role, checked in memory.
+
+    Built-in roles of ROLE_PERMISSIONS are always there and can't be overridden by
+    roles stored in db, which are loaded beneath them. Version is the roles' version
+    the masks were built from.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._defaults = {
+            role.value: compile_permissions(actions) for role, actions in ROLE_PERMISSIONS.items()
+        }
+        self._masks: Dict[str, int] = dict(self._defaults)
+
+    def allows(self, role: str, action_bit: int) -> bool:
+        """Check if role has the action of given bit."""
+        return self._masks.get(role, 0) & action_bit != 0
+
+    def set_role(self, role: str, permissions: Iterable[str]) -> None:
+        """Put role's permissions, unless it's a built-in role."""
+        if role not in self._defaults:
+            self._masks[role] = compile_permissions(permissions)
+
+    def load(self, roles: Mapping[str, Iterable[str]], version: int) -> None:
+        """Replace all roles but the built-in ones by given roles' permissions."""
+        masks = {role: compile_permissions(permissions) for role, permissions in roles.items()}
+        masks.update(self._defaults)
+
+        self._masks = masks
+        self.version = version
+
+    def reset(self) -> None:
+        """Leave built-in roles only."""
+        self.load({}, version=0)
+
+
+role_permissions = RolePermissions()
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -16,9 +18,64 @@ class Settings(BaseSettings):
     SECRET_KEY: SecretStr
     ENCRYPTION_KEY: SecretStr
     MLOPS_SERVICE_URL: SecretStr
+    LLM_SERVICE_URL: SecretStr
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    CACHE_TTL: int = 300 # sec
+    PASSWORD_HASH_WORKERS: int = 4
+    TOKEN_CACHE_SIZE: int = 10_000
+    REVOKED_TOKENS_CAPACITY: int = 100_000
+    REVOKED_TOKENS_FALSE_POSITIVE_RATE: float = 0.01
+    REVOKED_TOKENS_FAIL_CLOSED: bool = False # reject all tokens if Redis is down at cold start
+    REVOCATION_CHANNEL: str = "token:revocation"
+    ROLES_CHANNEL: str = "roles:changes"
+    TRUSTED_PROXY_HOPS: int = 0 # reverse proxies appending to X-Forwarded-For, 0 ignores it
+    CACHE_TTL: int = 7 * 24 * 60 * 60 # sec, hard: value is removed
+    CACHE_SOFT_TTL: int = 24 * 60 * 60 # sec, soft: value is served while refreshed
+    CACHE_CODEC: Literal["msgpack", "json"] = "msgpack"
+    CACHE_COMPRESS_MIN_SIZE: int = 1024 # bytes
+    CACHE_LOCK_TIMEOUT: int = 60 # sec
+    CACHE_LOCK_WAIT_TIMEOUT: float = 60 # sec
+    CACHE_LOCK_POLL_INTERVAL: float = 0.05 # sec
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidation"
+    CACHE_GENERATIONS_CHANNEL: str = "cache:generations"
+    CACHE_GENERATIONS_TTL: int = 60 # sec, bounds staleness if a bump's announcement is lost
+    LOCAL_CACHE_SIZE: int = 1_000
+    LOCAL_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LOCAL_CACHE_TTL: int = 60 # sec
+    SEMANTIC_CACHE_EMBEDDING_URL: Optional[SecretStr] = None # semantic cache is off without it
+    SEMANTIC_CACHE_EMBEDDING_TIMEOUT: float = 2 # sec
+    SEMANTIC_CACHE_THRESHOLD: float = 0.9 # cosine similarity of the model's embeddings
+    SEMANTIC_CACHE_DIM: int = 512 # the model's embedding size
+    SEMANTIC_CACHE_SCOPE_SIZE: int = 10_000
+    SEMANTIC_CACHE_MAX_SCOPES: int = 1_000
+    CHAT_HISTORY_PAGE_SIZE: int = 50
+    CHAT_HISTORY_MAX_PAGE_SIZE: int = 200
+    USERS_PAGE_SIZE: int = 100
+    USERS_MAX_PAGE_SIZE: int = 1000
+    USERS_EXPORT_BATCH_SIZE: int = 1000
+    CHAT_OWNER_CACHE_SIZE: int = 10_000
+    CHAT_OWNER_CACHE_TTL: int = 300 # sec
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL: int = 30 # sec
+    PRINCIPAL_INVALIDATION_CHANNEL: str = "principal:invalidation"
+    GITLAB_HTTP2: bool = True
+    GITLAB_MAX_CONNECTIONS: int = 20
+    GITLAB_PAGE_CONCURRENCY: int = 8
+    GITLAB_PER_PAGE: int = 100 # GitLab's max
+    GITLAB_TIMEOUT: float = 30 # sec
+    GITLAB_RATE_LIMIT: float = 2000 / 60 # requests per sec, until GitLab tells its own
+    GITLAB_RATE_LIMIT_BURST: int = 20
+    GITLAB_MAX_RETRIES: int = 5
+    GITLAB_BACKOFF_BASE: float = 0.5 # sec
+    GITLAB_BACKOFF_MAX: float = 30 # sec
+    GITLAB_WEBHOOK_SECRET: Optional[SecretStr] = None # webhooks are rejected without it
+    GITLAB_WEBHOOK_DEBOUNCE: float = 30 # sec, pushes to a repository within it are coalesced
+    GITLAB_CONFIG_CHANNEL: str = "gitlab:config"
+    GITLAB_CONFIG_TTL: int = 5 * 60 # sec, bounds staleness if a change is missed
+    GITLAB_CATALOGUE_CACHE_SIZE: int = 16
+    GITLAB_CATALOGUE_REFRESH_INTERVAL: int = 60 # sec, changes are listed after that
+    GITLAB_CATALOGUE_FULL_REFRESH_INTERVAL: int = 60 * 60 # sec
+    GITLAB_CATALOGUE_TTL: int = 24 * 60 * 60 # sec
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
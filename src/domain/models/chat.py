@@ -5,6 +5,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, HttpUrl
 
+from src.domain.models.cursor import Cursor
+
 
 class MessageRole(str, Enum):
 
@@ -38,6 +40,14 @@ class Message(BaseModel):
     sources: Optional[List[Source]] = None
 
 
+class AnswerChunk(BaseModel):
+
+    """Data structure for a part of the answer streamed from LLM."""
+
+    content: str = ""
+    sources: Optional[List[Source]] = None
+
+
 class Chat(BaseModel):
 
     """Data structure for chat."""
@@ -49,3 +59,35 @@ class Chat(BaseModel):
     owner_id: UUID
     created_at: datetime
     messages: Optional[List[Message]] = None
+
+
+class ChatHistory(Chat):
+
+    """Data structure for a page of chat history.
+
+    next_cursor points to the oldest message of the page and is None when there are no older ones.
+    """
+
+    next_cursor: Optional[str] = None
+
+
+class MessageCursor(Cursor):
+
+    """Data structure for keyset pagination position (created_at, id) in chat history."""
+
+    created_at: datetime
+    id: UUID
+
+
+class ChatSummary(BaseModel):
+
+    """Data structure for chat without messages, but with cheap aggregates over them."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    title: str
+    owner_id: UUID
+    created_at: datetime
+    message_count: int = 0
+    last_activity_at: Optional[datetime] = None
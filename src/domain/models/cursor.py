@@ -0,0 +1,24 @@
+import base64
+from typing import Type, TypeVar
+
+from pydantic import BaseModel
+
+CursorT = TypeVar("CursorT", bound="Cursor")
+
+
+class Cursor(BaseModel):
+
+    """Data structure for keyset pagination position, passed to clients as an opaque string."""
+
+    def encode(self) -> str:
+        """Encode cursor to an opaque url-safe string."""
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls: Type[CursorT], value: str) -> CursorT:
+        """Decode cursor from an opaque string. Raise ValueError if it is malformed."""
+        padded = value + "=" * (-len(value) % 4)
+        try:
+            return cls.model_validate_json(base64.urlsafe_b64decode(padded))
+        except ValueError as error:
+            raise ValueError("Invalid cursor.") from error
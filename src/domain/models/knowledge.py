@@ -39,6 +39,36 @@ class Repository(BaseModel):
     url: HttpUrl
 
 
+class RepositoryCatalogue(BaseModel):
+
+    """Data structure for cached repositories of GitLab instance with state of their sync.
+
+    since is the time changes are listed after until the next full listing; etag is
+    ETag of the last listing of those changes. Timestamps are unix time.
+    """
+
+    repositories: List[Repository]
+    since: datetime
+    etag: Optional[str] = None
+    listed_at: float
+    refreshed_at: float
+
+
+class RepositoryChanges(BaseModel):
+
+    """Data structure for changes pushed to repository's default branch.
+
+    Commit range is before..after. paths are added or modified files, removed_paths
+    are deleted ones; paths is None if they aren't known and all files need indexing.
+    """
+
+    repository_id: UUID
+    before: str
+    after: str
+    paths: Optional[List[str]] = None
+    removed_paths: List[str] = []
+
+
 class IndexingJob(BaseModel):
 
     """Data structure for an existing indexing job."""
@@ -4,10 +4,12 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr
 
+from src.domain.models.cursor import Cursor
+
 
 class UserRole(str, Enum):
 
-    """Data structure for user's role names."""
+    """Data structure for names of built-in roles; custom ones are created by admins."""
 
     USER = "user"
     ADMIN = "admin"
@@ -21,11 +23,23 @@ class User(BaseModel):
 
     id: UUID
     username: str
-    role: UserRole = UserRole.USER
+    role: str = UserRole.USER.value
     hashed_password: str
     email: Optional[EmailStr] = None
 
 
+class Principal(BaseModel):
+
+    """Data structure for authenticated user: user without password hash."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    username: str
+    role: str = UserRole.USER.value
+    email: Optional[EmailStr] = None
+
+
 class Role(BaseModel):
 
     """Data structure for role."""
@@ -33,5 +47,31 @@ class Role(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: UUID
-    name: UserRole
+    name: str
     permissions: List[str]
+
+
+class UserFilter(BaseModel):
+
+    """Data structure for filters of users' listing."""
+
+    role: Optional[str] = None
+    username_prefix: Optional[str] = None
+
+
+class UserCursor(Cursor):
+
+    """Data structure for keyset pagination position (username) in users' listing."""
+
+    username: str
+
+
+class UserPage(BaseModel):
+
+    """Data structure for a page of users ordered by username.
+
+    next_cursor points to the last user of the page and is None when there are no more users.
+    """
+
+    users: List[User]
+    next_cursor: Optional[str] = None
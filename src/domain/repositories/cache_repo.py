@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Awaitable, Callable, List, Optional
 from uuid import UUID
 
 from src.domain.models.chat import Message
@@ -10,16 +10,42 @@ class ICacheRepository(ABC):
     """Class sets the contract by which Application-layer connects with Infrastructure-layer."""
 
     @abstractmethod
-    def construct_cache_key(self, query: str, repository_ids: List[UUID]) -> str:
-        """Construct cache key."""
+    async def construct_cache_key(self, query: str, repository_ids: List[UUID]) -> str:
+        """Construct cache key of the current generations of given repositories."""
         raise NotImplementedError
 
     @abstractmethod
-    async def get_cached_value(self, key: str) -> Optional[Message]:
-        """Get value from cache by given key. Return None if key isn't in cache yet."""
+    async def bump_generations(self, repository_ids: List[UUID]) -> None:
+        """Start new generations of given repositories, invalidating keys of previous ones."""
         raise NotImplementedError
 
     @abstractmethod
-    async def put_cache_value(self, key: str, message: Message) -> None:
-        """Put value to key with given key."""
+    async def get_cached_value(self, key: str, query: Optional[str] = None) -> Optional[Message]:
+        """Get value from cache by given key. Return None if key isn't in cache yet.
+
+        Given query, the value of a similar query may be returned.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def put_cache_value(
+            self,
+            key: str,
+            message: Message,
+            query: Optional[str] = None
+    ) -> None:
+        """Put value to key with given key. Query the value answers is kept for lookups."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_or_generate(
+            self,
+            key: str,
+            generate: Callable[[], Awaitable[Message]],
+            query: Optional[str] = None
+    ) -> Message:
+        """Get value from cache by given key or generate and put it if key isn't in cache yet.
+
+        Concurrent calls with the same key must run generate only once.
+        """
         raise NotImplementedError
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List, Optional
 from uuid import UUID
 
-from src.domain.models.chat import Chat, Message
+from src.domain.models.chat import Chat, ChatSummary, Message, MessageCursor
 
 
 class IChatRepository(ABC):
@@ -15,8 +15,18 @@ class IChatRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_user_chats(self, user_id: UUID) -> List[Chat]:
-        """Get all user chats by user_id."""
+    async def get_user_chats(self, user_id: UUID) -> List[ChatSummary]:
+        """Get all user chats by user_id (without messages, only their count and last activity)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_chat(self, chat_id: UUID) -> Optional[Chat]:
+        """Get chat by chat_id without its messages."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_chat_owner(self, chat_id: UUID) -> Optional[UUID]:
+        """Get owner_id of the chat. Return None if the chat doesn't exist."""
         raise NotImplementedError
 
     @abstractmethod
@@ -24,6 +34,16 @@ class IChatRepository(ABC):
         """Get all chat messages by chat_id."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_chat_messages(
+            self,
+            chat_id: UUID,
+            limit: int,
+            before: Optional[MessageCursor] = None
+    ) -> List[Message]:
+        """Get up to limit latest chat messages older than the cursor, in chronological order."""
+        raise NotImplementedError
+
     @abstractmethod
     async def add_message(
             self,
@@ -34,3 +54,11 @@ class IChatRepository(ABC):
     ) -> Message:
         """Add new message to the chat."""
         raise NotImplementedError
+
+    @abstractmethod
+    async def add_messages(self, chat_id: UUID, messages: List[dict]) -> List[Message]:
+        """Add several messages to the chat at once, keeping their order.
+
+        Each message is a dict with role, content and optional sources.
+        """
+        raise NotImplementedError
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 
-from src.domain.models.user import User as DomainUser
+from src.domain.models.user import Principal, User as DomainUser, UserCursor, UserFilter
 
 
 class IUserRepository(ABC):
@@ -10,18 +10,23 @@ class IUserRepository(ABC):
     """Class sets the contract by which Application-layer connects with Infrastructure-layer."""
 
     @abstractmethod
-    async def get_all_users(self) -> List[DomainUser]:
-        """Retrieve all existing users from db."""
+    async def get_users(
+            self,
+            limit: int,
+            filters: UserFilter,
+            after: Optional[UserCursor] = None
+    ) -> List[DomainUser]:
+        """Get up to limit users matching filters with usernames after the cursor, by username."""
         raise NotImplementedError
 
     @abstractmethod
-    async def get_by_username(self, username: str) -> Optional[DomainUser]:
-        """Retrieve user from db by username."""
+    def stream_users(self, filters: UserFilter) -> AsyncIterator[DomainUser]:
+        """Stream all users matching filters by username, without loading them at once."""
         raise NotImplementedError
 
     @abstractmethod
-    async def get_by_email(self, email: str) -> Optional[DomainUser]:
-        """Retrieve user from db by email adress."""
+    async def get_by_username(self, username: str) -> Optional[DomainUser]:
+        """Retrieve user from db by username."""
         raise NotImplementedError
 
     @abstractmethod
@@ -30,8 +35,18 @@ class IUserRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def create(self, user: DomainUser) -> DomainUser:
-        """Create new user and put them in db."""
+    async def get_principal(self, user_id: UUID) -> Optional[Principal]:
+        """Retrieve user to authenticate by id, possibly cached, without password hash."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_if_unique(self, user: DomainUser) -> Optional[DomainUser]:
+        """Create new user in one round trip. Return None if username or email is taken."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_taken_field(self, username: str, email: str) -> Optional[str]:
+        """Get which of username and email is already taken: "username", "email" or None."""
         raise NotImplementedError
 
     @abstractmethod
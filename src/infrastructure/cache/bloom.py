@@ -0,0 +1,44 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+
+    """Set membership with no false negatives and a bounded rate of false positives.
+
+    Sized for capacity items at false_positive_rate; adding more raises the rate.
+    Items can't be removed, the filter is rebuilt instead.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.nbits = max(8, math.ceil(
+            -capacity * math.log(false_positive_rate) / math.log(2) ** 2
+        ))
+        self.nhashes = max(1, round(self.nbits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.nbits + 7) // 8)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[bit >> 3] & (1 << (bit & 7)) for bit in self._positions(item))
+
+    def add(self, item: str) -> None:
+        """Put item to filter."""
+        for bit in self._positions(item):
+            self._bits[bit >> 3] |= 1 << (bit & 7)
+        self.count += 1
+
+    def is_saturated(self) -> bool:
+        """Check if filter holds more items than it's sized for."""
+        return self.count > self.capacity
+
+    def _positions(self, item: str):
+        # double hashing: k positions from two independent 64-bit hashes
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.nbits for i in range(self.nhashes))
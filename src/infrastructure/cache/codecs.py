@@ -0,0 +1,132 @@
+import time
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from uuid import UUID
+
+import msgpack
+from pydantic import BaseModel, HttpUrl, ValidationError
+
+from src.domain.models.chat import Message, MessageRole, Source
+
+# sources' urls repeat across answers; urls are immutable, so they can be shared
+_url = lru_cache(maxsize=4096)(HttpUrl)
+
+
+class CacheEntry(BaseModel):
+
+    """Data structure for cached value, with the original query kept for debugging.
+
+    After fresh_until (unix time) the value is stale: still served, but due to refresh.
+    """
+
+    query: Optional[str] = None
+    message: Message
+    fresh_until: Optional[float] = None
+
+    def is_stale(self) -> bool:
+        """Check if value is due to refresh."""
+        return self.fresh_until is not None and self.fresh_until <= time.time()
+
+
+class CacheCodec(ABC):
+
+    """Serializes cache entries to bytes stored in Redis and back."""
+
+    @abstractmethod
+    def encode(self, entry: CacheEntry) -> bytes:
+        """Serialize entry."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, data: bytes) -> CacheEntry:
+        """Deserialize entry. Raise ValueError if data is malformed."""
+        raise NotImplementedError
+
+
+class JsonCodec(CacheCodec):
+
+    """Plain JSON, fully validated on decode."""
+
+    def encode(self, entry: CacheEntry) -> bytes:
+        """Serialize entry."""
+        return entry.model_dump_json().encode()
+
+    def decode(self, data: bytes) -> CacheEntry:
+        """Deserialize entry. Raise ValueError if data is malformed."""
+        try:
+            return CacheEntry.model_validate_json(data)
+        except ValidationError as error:
+            raise ValueError("Invalid JSON format from cache.") from error
+
+
+class MsgpackCodec(CacheCodec):
+
+    """Compact msgpack arrays, zlib-compressed when large, behind a version byte.
+
+    Cached entries were validated before they were put, so decoding builds models
+    without revalidating them. Values without a known version byte are decoded
+    as JSON, so entries put by JsonCodec stay readable.
+    """
+
+    RAW = 1
+    COMPRESSED = 2
+
+    def __init__(self, compress_level: int = 6, compress_min_size: int = 1024):
+        self.compress_level = compress_level
+        self.compress_min_size = compress_min_size
+        self._json = JsonCodec()
+
+    def encode(self, entry: CacheEntry) -> bytes:
+        """Serialize entry."""
+        message = entry.message
+        payload = msgpack.packb([
+            entry.query,
+            message.id.bytes,
+            message.role.value,
+            message.content,
+            message.created_at.isoformat(),
+            None if message.sources is None else [
+                [source.title, str(source.url), source.quote] for source in message.sources
+            ],
+            entry.fresh_until,
+        ])
+
+        if len(payload) >= self.compress_min_size:
+            return bytes([self.COMPRESSED]) + zlib.compress(payload, self.compress_level)
+
+        return bytes([self.RAW]) + payload
+
+    def decode(self, data: bytes) -> CacheEntry:
+        """Deserialize entry. Raise ValueError if data is malformed."""
+        if not data:
+            raise ValueError("Invalid cache value.")
+
+        version, payload = data[0], data[1:]
+
+        try:
+            if version == self.COMPRESSED:
+                payload = zlib.decompress(payload)
+            elif version != self.RAW:
+                return self._json.decode(data)
+
+            items = msgpack.unpackb(payload)
+            query, message_id, role, content, created_at, sources = items[:6]
+            # entries put before soft TTL was introduced have no fresh_until
+            fresh_until = items[6] if len(items) > 6 else None
+            message = Message.model_construct(
+                id=UUID(bytes=message_id),
+                role=MessageRole(role),
+                content=content,
+                created_at=datetime.fromisoformat(created_at),
+                sources=None if sources is None else [
+                    Source.model_construct(title=title, url=_url(url), quote=quote)
+                    for title, url, quote in sources
+                ]
+            )
+        except (zlib.error, msgpack.UnpackException, TypeError, ValueError) as error:
+            raise ValueError("Invalid cache value.") from error
+
+        return CacheEntry.model_construct(query=query, message=message, fresh_until=fresh_until)
@@ -0,0 +1,121 @@
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.infrastructure.cache.keys import generation_key
+from src.infrastructure.cache.pubsub import PubSubChannel
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationsChannel(PubSubChannel):
+
+    """Channel of repositories' new generations, as comma-separated <repository_id>=<generation>."""
+
+
+class RepositoryGenerations:
+
+    """Repositories' current generations kept in process, read from Redis on local miss.
+
+    Bumps are announced to other workers over the channel, so they switch to new
+    generations right away; local copies also expire after ttl in case an
+    announcement is lost. If Redis is unavailable, the last known generations are
+    used (0 for unknown ones), so answers cached in process are still served.
+    """
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            channel: Optional[GenerationsChannel] = None,
+            ttl: float = 0
+    ):
+        self.redis = redis_client
+        self.channel = channel
+        self.ttl = ttl
+        # repository id -> (generation, when it was read)
+        self._known: Dict[str, Tuple[int, float]] = {}
+
+    async def get(self, repository_ids: List[UUID]) -> Dict[str, int]:
+        """Get current generations of given repositories by their ids."""
+        repository_ids = sorted({str(repository_id) for repository_id in repository_ids})
+        now = time.monotonic()
+
+        missing = [
+            repository_id for repository_id in repository_ids
+            if not self._is_fresh(repository_id, now)
+        ]
+        if missing:
+            try:
+                values = await self.redis.mget(
+                    [generation_key(repository_id) for repository_id in missing]
+                )
+            except RedisError as error:
+                logger.error(f"Generations can't be read, last known are used: {error}")
+            else:
+                for repository_id, value in zip(missing, values, strict=True):
+                    self._set(repository_id, int(value) if value else 0, now)
+
+        return {
+            repository_id: self._known[repository_id][0] if repository_id in self._known else 0
+            for repository_id in repository_ids
+        }
+
+    async def bump(self, repository_ids: List[UUID]) -> None:
+        """Start new generations of given repositories here and in other workers."""
+        repository_ids = sorted({str(repository_id) for repository_id in repository_ids})
+        if not repository_ids:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for repository_id in repository_ids:
+                pipe.incr(generation_key(repository_id))
+            values = await pipe.execute()
+
+        now = time.monotonic()
+        for repository_id, value in zip(repository_ids, values, strict=True):
+            self._set(repository_id, int(value), now)
+
+        if self.channel is None:
+            return
+
+        try:
+            await self.channel.publish(",".join(
+                f"{repository_id}={value}"
+                for repository_id, value in zip(repository_ids, values, strict=True)
+            ))
+        except RedisError as error:
+            # other workers read new generations after ttl at most
+            logger.error(f"New generations can't be sent: {error}")
+
+    def on_message(self, message: str) -> None:
+        """Take new generations announced by another worker."""
+        now = time.monotonic()
+        for item in message.split(","):
+            repository_id, _, value = item.partition("=")
+            try:
+                self._set(repository_id, int(value), now)
+            except ValueError:
+                logger.error(f"Malformed generation: {item}")
+
+    def on_reset(self) -> None:
+        """Read all generations from Redis again: announcements could be missed."""
+        self._known = {
+            repository_id: (generation, float("-inf"))
+            for repository_id, (generation, _) in self._known.items()
+        }
+
+    def _is_fresh(self, repository_id: str, now: float) -> bool:
+        known = self._known.get(repository_id)
+        return known is not None and now - known[1] < self.ttl
+
+    def _set(self, repository_id: str, generation: int, read_at: float) -> None:
+        # a read that raced with a bump mustn't take an older generation back
+        known = self._known.get(repository_id)
+        if known is not None:
+            generation = max(generation, known[0])
+
+        self._known[repository_id] = (generation, read_at)
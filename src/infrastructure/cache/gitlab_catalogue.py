@@ -0,0 +1,184 @@
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import List, Optional
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.metrics import metrics
+from src.domain.models.knowledge import Repository, RepositoryCatalogue
+from src.infrastructure.cache.memory import CatalogueCache
+from src.infrastructure.cache.single_flight import SingleFlight
+from src.infrastructure.external.gitlab_client import GitLabClient, token_fingerprint
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_KEY_PREFIX = "catalogue"
+
+# activity during a full listing may be missed by it, so changes are listed from before
+SINCE_MARGIN = timedelta(minutes=5)
+
+
+def catalogue_key(base_url: str, token: str) -> str:
+    """Get key of catalogue of GitLab instance as seen with given token."""
+    url_digest = hashlib.sha256(base_url.rstrip("/").encode()).hexdigest()[:16]
+    return f"{CATALOGUE_KEY_PREFIX}:{url_digest}:{token_fingerprint(token)}"
+
+
+def refresh_lease_key(key: str) -> str:
+    """Get key held by the worker refreshing given catalogue."""
+    return f"{key}:refresh"
+
+
+class GitLabCatalogue:
+
+    """Cached catalogue of GitLab projects: in-process tier in front of Redis.
+
+    Catalogue is served as is and refreshed in background once it's older than
+    refresh_interval, by one worker at a time. A refresh lists only projects with
+    activity since the last full listing, conditionally on ETag of the previous
+    such listing, and merges them in. Deleted projects and renames without activity
+    aren't seen that way, so the full listing is repeated every full_refresh_interval.
+    Local tier's TTL is meant to be refresh_interval: once it's over, Redis is read
+    again and the catalogue refreshed if it's due.
+    """
+
+    def __init__(
+            self,
+            client: GitLabClient,
+            redis_client: Redis,
+            local: CatalogueCache,
+            single_flight: SingleFlight,
+            refresh_interval: float,
+            full_refresh_interval: float,
+            ttl: int
+    ):
+        self.client = client
+        self.redis = redis_client
+        self.local = local
+        self.single_flight = single_flight
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.ttl = ttl
+
+    async def list_projects(self, base_url: str, token: str) -> List[Repository]:
+        """Get all repositories of GitLab instance."""
+        key = catalogue_key(base_url, token)
+
+        catalogue = self.local.get(key)
+        if catalogue is None:
+            catalogue = await self.single_flight.do(key, partial(self._load, key, base_url, token))
+
+        return catalogue.repositories
+
+    async def _load(self, key: str, base_url: str, token: str) -> RepositoryCatalogue:
+        catalogue = await self._read(key)
+
+        if catalogue is None:
+            metrics.increment("gitlab_catalogue.misses")
+            catalogue = await self._list(base_url, token)
+            await self._write(key, catalogue)
+        elif time.time() - catalogue.refreshed_at >= self.refresh_interval:
+            self.single_flight.launch(
+                refresh_lease_key(key),
+                partial(self._refresh, key, base_url, token, catalogue)
+            )
+
+        self.local.set(key, catalogue)
+        return catalogue
+
+    async def _refresh(
+            self,
+            key: str,
+            base_url: str,
+            token: str,
+            catalogue: RepositoryCatalogue
+    ) -> None:
+        try:
+            if not await self.redis.set(
+                refresh_lease_key(key), 1, nx=True, ex=int(self.refresh_interval) or 1
+            ):
+                # another worker is refreshing it
+                return
+        except RedisError as error:
+            logger.error(f"GitLab catalogue cache is unavailable: {error}")
+
+        try:
+            if time.time() - catalogue.listed_at >= self.full_refresh_interval:
+                catalogue = await self._list(base_url, token)
+            else:
+                catalogue = await self._update(base_url, token, catalogue)
+        except HTTPException as error:
+            # served stale until the next try
+            logger.error(f"GitLab catalogue can't be refreshed: {error.detail}")
+            return
+
+        await self._write(key, catalogue)
+        self.local.set(key, catalogue)
+
+    async def _list(self, base_url: str, token: str) -> RepositoryCatalogue:
+        metrics.increment("gitlab_catalogue.full_listings")
+        now = time.time()
+        repositories = await self.client.list_projects(base_url, token)
+
+        return RepositoryCatalogue(
+            repositories=repositories,
+            since=datetime.fromtimestamp(now, timezone.utc) - SINCE_MARGIN,
+            listed_at=now,
+            refreshed_at=now
+        )
+
+    async def _update(
+            self,
+            base_url: str,
+            token: str,
+            catalogue: RepositoryCatalogue
+    ) -> RepositoryCatalogue:
+        now = time.time()
+        changes = await self.client.list_changed_projects(
+            base_url,
+            token,
+            since=catalogue.since,
+            etag=catalogue.etag
+        )
+
+        if changes is None:
+            metrics.increment("gitlab_catalogue.not_modified")
+            return catalogue.model_copy(update={"refreshed_at": now})
+
+        metrics.increment("gitlab_catalogue.updates")
+        # changed projects keep their place, new ones go last
+        repositories = {repository.id: repository for repository in catalogue.repositories}
+        repositories.update((repository.id, repository) for repository in changes.repositories)
+
+        return catalogue.model_copy(update={
+            "repositories": list(repositories.values()),
+            "etag": changes.etag,
+            "refreshed_at": now,
+        })
+
+    async def _read(self, key: str) -> Optional[RepositoryCatalogue]:
+        try:
+            data = await self.redis.get(key)
+        except RedisError as error:
+            logger.error(f"GitLab catalogue cache is unavailable: {error}")
+            return None
+
+        if data is None:
+            return None
+
+        try:
+            return RepositoryCatalogue.model_validate_json(data)
+        except ValidationError:
+            return None
+
+    async def _write(self, key: str, catalogue: RepositoryCatalogue) -> None:
+        try:
+            await self.redis.set(key, catalogue.model_dump_json(), ex=self.ttl)
+        except RedisError as error:
+            logger.error(f"GitLab catalogue cache is unavailable: {error}")
@@ -0,0 +1,103 @@
+import logging
+import time
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.metrics import metrics
+from src.domain.models.knowledge import GitLabConfig
+from src.infrastructure.cache.pubsub import PubSubChannel
+from src.infrastructure.security.encription import decrypt_data
+
+logger = logging.getLogger(__name__)
+
+
+class GitLabCredentials(NamedTuple):
+
+    """GitLab url with decrypted private token."""
+
+    url: str
+    token: str
+
+
+class GitLabConfigHolder:
+
+    """GitLab config kept decrypted in process instead of read and decrypted per request.
+
+    A saved config is announced to other workers over pub/sub once it's committed;
+    each drops its copy and overwrites the token's bytes with zeros. Pub/sub may lose
+    the announcement, so copies also expire after ttl.
+    Callers get the token as str, which Python can't zero: they shouldn't keep it.
+    """
+
+    def __init__(self, redis_client: Redis, channel: str, ttl: float):
+        self.ttl = ttl
+        self.channel = PubSubChannel(
+            redis_client,
+            channel,
+            on_message=lambda _: self.clear(),
+            on_reset=self.clear
+        )
+        self._url: Optional[str] = None
+        self._token = bytearray()
+        self._loaded_at = 0.0
+        # incremented on every change, so a load that raced with one isn't kept
+        self._version = 0
+
+    async def start(self) -> None:
+        """Start receiving changes of other workers."""
+        await self.channel.start()
+
+    async def stop(self) -> None:
+        """Stop receiving changes and wipe the token."""
+        await self.channel.stop()
+        self.clear()
+
+    async def get(
+            self,
+            load: Callable[[], Awaitable[Optional[GitLabConfig]]]
+    ) -> Optional[GitLabCredentials]:
+        """Get decrypted config, loading it with load if there's no fresh copy.
+
+        Return None if GitLab isn't configured.
+        """
+        if self._url is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return GitLabCredentials(url=self._url, token=self._token.decode())
+
+        version = self._version
+        config = await load()
+        if config is None:
+            return None
+
+        metrics.increment("gitlab_config.decryptions")
+        credentials = GitLabCredentials(
+            url=str(config.url),
+            token=decrypt_data(config.private_token_encrypted)
+        )
+        if version == self._version:
+            self._keep(credentials)
+
+        return credentials
+
+    async def invalidate(self) -> None:
+        """Drop the config here and in other workers, e.g. when it's replaced."""
+        self.clear()
+        try:
+            await self.channel.publish("changed")
+        except RedisError as error:
+            # other workers' copies outlive the change by ttl at most
+            logger.error(f"GitLab config change can't be sent: {error}")
+
+    def clear(self) -> None:
+        """Drop the config, overwriting the token."""
+        self._version += 1
+        self._token[:] = bytes(len(self._token))
+        self._token = bytearray()
+        self._url = None
+
+    def _keep(self, credentials: GitLabCredentials) -> None:
+        self.clear()
+        self._url = credentials.url
+        self._token = bytearray(credentials.token.encode())
+        self._loaded_at = time.monotonic()
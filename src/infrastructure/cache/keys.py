@@ -0,0 +1,57 @@
+import hashlib
+import re
+import unicodedata
+from typing import Dict, List, Optional
+from uuid import UUID
+
+ANSWER_KEY_PREFIX = "answer:v2"
+GENERATION_KEY_PREFIX = "generation"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def canonicalize_query(query: str) -> str:
+    """Bring query to canonical form so trivially different phrasings match.
+
+    Applies NFKC normalization and case folding, collapses whitespace and drops
+    trailing punctuation.
+    """
+    query = unicodedata.normalize("NFKC", query).casefold()
+    query = _WHITESPACE.sub(" ", query).strip()
+
+    end = len(query)
+    while end and unicodedata.category(query[end - 1]).startswith("P"):
+        end -= 1
+
+    return query[:end].rstrip()
+
+
+def generation_key(repository_id: UUID) -> str:
+    """Get key of repository's generation counter."""
+    return f"{GENERATION_KEY_PREFIX}:{repository_id}"
+
+
+def answer_cache_key(
+        query: str,
+        repository_ids: List[UUID],
+        generations: Optional[Dict[str, int]] = None
+) -> str:
+    """Build fixed-length cache key of the answer to query over given repositories.
+
+    Key is <prefix>:<scope>:<query> where scope is digest of repositories' ids with
+    their generations, so a new generation of any of them gives a new scope.
+    """
+    generations = generations or {}
+    scope = ";".join(
+        f"{repository_id}@{generations.get(repository_id, 0)}"
+        for repository_id in sorted({str(repository_id) for repository_id in repository_ids})
+    )
+    scope_digest = hashlib.sha256(scope.encode()).hexdigest()[:32]
+    query_digest = hashlib.sha256(canonicalize_query(query).encode()).hexdigest()
+
+    return f"{ANSWER_KEY_PREFIX}:{scope_digest}:{query_digest}"
+
+
+def scope_of_key(key: str) -> str:
+    """Get scope part of answer's cache key."""
+    return key.rpartition(":")[0]
@@ -0,0 +1,111 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from src.domain.models.chat import Message
+from src.domain.models.knowledge import RepositoryCatalogue
+from src.domain.models.user import Principal
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class InMemoryTTLCache(Generic[K, V]):
+
+    """Bounded in-process LRU cache with per-entry expiration.
+
+    Bounded by number of entries and, if maxbytes is set, by total size of values
+    estimated by sizeof. Not thread-safe: it is meant to be shared by coroutines
+    of one event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, maxbytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._data: OrderedDict[K, Tuple[float, V, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def sizeof(self, value: V) -> int:
+        """Estimate size of value in bytes."""
+        return 0
+
+    def get(self, key: K) -> Optional[V]:
+        """Get value by key. Return None if key is missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value, _ = item
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Put value by key, evicting the least recently used entries over the bounds."""
+        self.pop(key)
+
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value, size)
+        self.nbytes += size
+
+        while len(self._data) > self.maxsize or (
+            self.maxbytes is not None and self.nbytes > self.maxbytes
+        ):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.nbytes -= evicted_size
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove key from cache. Return its value if it was there."""
+        item = self._data.pop(key, None)
+        if item is None:
+            return None
+
+        self.nbytes -= item[2]
+        return item[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+        self.nbytes = 0
+
+
+class ChatOwnerCache(InMemoryTTLCache[UUID, UUID]):
+
+    """Cache of chat_id -> owner_id. Chat's owner never changes, so entries only expire."""
+
+
+class MessageCache(InMemoryTTLCache[str, Message]):
+
+    """Cache of cache key -> validated LLM answer, the local tier of answers' cache."""
+
+    ENTRY_OVERHEAD = 512
+
+    def sizeof(self, value: Message) -> int:
+        """Estimate size of Message by its text fields."""
+        size = self.ENTRY_OVERHEAD + len(value.content)
+        for source in value.sources or []:
+            size += len(source.title) + len(str(source.url)) + len(source.quote)
+
+        return size
+
+
+class UserCache(InMemoryTTLCache[UUID, Principal]):
+
+    """Cache of user_id -> principal, the in-process tier of authenticated users' cache."""
+
+
+class CatalogueCache(InMemoryTTLCache[str, RepositoryCatalogue]):
+
+    """Cache of catalogue's key -> catalogue, the in-process tier of GitLab catalogues."""
@@ -0,0 +1,100 @@
+import logging
+from typing import Optional
+from uuid import UUID
+
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.domain.models.user import Principal, User
+from src.infrastructure.cache.memory import UserCache
+from src.infrastructure.cache.pubsub import PubSubChannel
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_KEY_PREFIX = "principal"
+
+
+def principal_key(user_id: UUID) -> str:
+    """Get key of user's cached principal."""
+    return f"{PRINCIPAL_KEY_PREFIX}:{user_id}"
+
+
+class PrincipalInvalidationChannel(PubSubChannel):
+
+    """Channel of ids of users whose cached principals are outdated."""
+
+
+class PrincipalCache:
+
+    """Short-lived cache of authenticated users: in-process LRU in front of optional Redis.
+
+    Principals are users without password hash, which authentication doesn't need.
+    Invalidated ids are dropped from Redis and broadcast to other workers' LRUs.
+    Redis errors aren't fatal: lookups fall through to the database.
+    """
+
+    def __init__(
+            self,
+            local: UserCache,
+            redis_client: Optional[Redis] = None,
+            invalidation: Optional[PrincipalInvalidationChannel] = None,
+            ttl: int = 60
+    ):
+        self.local = local
+        self.redis = redis_client
+        self.invalidation = invalidation
+        self.ttl = ttl
+
+    async def get(self, user_id: UUID) -> Optional[Principal]:
+        """Get user's principal. Return None if it isn't cached."""
+        principal = self.local.get(user_id)
+        if principal is not None or self.redis is None:
+            return principal
+
+        try:
+            data = await self.redis.get(principal_key(user_id))
+        except RedisError as error:
+            logger.error(f"Principal cache is unavailable: {error}")
+            return None
+
+        if data is None:
+            return None
+
+        try:
+            principal = Principal.model_validate_json(data)
+        except ValidationError:
+            return None
+
+        self.local.set(user_id, principal)
+        return principal
+
+    async def put(self, user: User) -> Principal:
+        """Cache user's principal and return it."""
+        principal = Principal.model_validate(user, from_attributes=True)
+        self.local.set(principal.id, principal)
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(
+                    principal_key(principal.id),
+                    principal.model_dump_json(),
+                    ex=self.ttl
+                )
+            except RedisError as error:
+                logger.error(f"Principal cache is unavailable: {error}")
+
+        return principal
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop user's principal here, in Redis and in other workers."""
+        self.local.pop(user_id)
+
+        try:
+            if self.redis is not None:
+                await self.redis.delete(principal_key(user_id))
+            if self.invalidation is not None:
+                await self.invalidation.publish(str(user_id))
+        except RedisError as error:
+            # other workers' entries outlive the change by their TTL at most
+            logger.error(f"Principal cache is unavailable: {error}")
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import uuid
+from contextlib import suppress
+from typing import Callable, Optional, Union
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+class PubSubChannel:
+
+    """Broadcasts messages between workers over Redis pub/sub.
+
+    Every message published by one worker is passed to on_message of all the
+    others (a worker doesn't receive its own messages). Messages published while
+    the subscription is broken are lost, so on_reset is called after it's
+    restored: listeners should drop state that could be missed updates.
+    """
+
+    RETRY_INTERVAL = 1.0 # sec
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            channel: str,
+            on_message: Callable[[str], None],
+            on_reset: Optional[Callable[[], None]] = None
+    ):
+        self.redis = redis_client
+        self.channel = channel
+        self.on_message = on_message
+        self.on_reset = on_reset
+
+        self.origin = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, message: str) -> None:
+        """Send message to other workers."""
+        await self.redis.publish(self.channel, f"{self.origin}:{message}")
+
+    async def start(self) -> None:
+        """Start listening in background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _listen(self) -> None:
+        restored = False
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                if restored and self.on_reset is not None:
+                    self.on_reset()
+
+                async for data in pubsub.listen():
+                    if data["type"] == "message":
+                        self._handle(data["data"])
+            except RedisError as error:
+                logger.error(f"Pub/sub channel {self.channel} is broken: {error}")
+            finally:
+                await pubsub.aclose()
+
+            restored = True
+            await asyncio.sleep(self.RETRY_INTERVAL)
+
+    def _handle(self, data: Union[str, bytes]) -> None:
+        if isinstance(data, bytes):
+            data = data.decode()
+
+        origin, _, message = data.partition(":")
+        if origin != self.origin:
+            self.on_message(message)
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Set
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.metrics import metrics
+from src.domain.models.knowledge import RepositoryChanges
+
+logger = logging.getLogger(__name__)
+
+PUSH_KEY_PREFIX = "push"
+
+CHANGED = "changed"
+REMOVED = "removed"
+
+# merges a push into repository's pending changes: the first push's before, the last
+# one's after, the last state of every path; returns 1 if the caller is to flush them
+ADD_PUSH_SCRIPT = """
+redis.call("HSETNX", KEYS[1], "before", ARGV[1])
+redis.call("HSET", KEYS[1], "after", ARGV[2])
+if ARGV[3] == "1" then
+    redis.call("HSET", KEYS[1], "full", 1)
+end
+for i = 6, #ARGV, 2 do
+    redis.call("HSET", KEYS[2], ARGV[i], ARGV[i + 1])
+end
+redis.call("EXPIRE", KEYS[1], ARGV[4])
+redis.call("EXPIRE", KEYS[2], ARGV[4])
+if redis.call("SET", KEYS[3], 1, "NX", "PX", ARGV[5]) then
+    return 1
+end
+return 0
+"""
+
+# takes repository's pending changes; the next push starts a new window
+TAKE_PUSHES_SCRIPT = """
+local state = redis.call("HGETALL", KEYS[1])
+local paths = redis.call("HGETALL", KEYS[2])
+redis.call("DEL", KEYS[1], KEYS[2], KEYS[3])
+return {state, paths}
+"""
+
+
+def push_keys(repository_id: UUID) -> List[str]:
+    """Get keys of repository's pending changes: commit range, paths and flush lease."""
+    key = f"{PUSH_KEY_PREFIX}:{repository_id}"
+    return [key, f"{key}:paths", f"{key}:flush"]
+
+
+class PushDebouncer:
+
+    """Coalesces pushes to a repository within a window into one set of changes.
+
+    Pending changes are kept in Redis, so pushes received by different workers are
+    merged. The worker receiving the first push of a window flushes them when it's
+    over, or right away when it's stopped. If that worker is gone, its lease expires
+    after two windows, and the next push schedules the flush again.
+    """
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            on_flush: Callable[[RepositoryChanges], Awaitable[object]],
+            window: float,
+            ttl: int = 24 * 60 * 60
+    ):
+        self.redis = redis_client
+        self.on_flush = on_flush
+        self.window = window
+        self.ttl = ttl
+        self._add = redis_client.register_script(ADD_PUSH_SCRIPT)
+        self._take = redis_client.register_script(TAKE_PUSHES_SCRIPT)
+        self._tasks: Set[asyncio.Task] = set()
+        # flushes waiting for their windows to end
+        self._waiting: Dict[UUID, asyncio.Task] = {}
+
+    async def add(self, changes: RepositoryChanges) -> None:
+        """Merge pushed changes into the repository's pending ones."""
+        paths: Dict[str, str] = dict.fromkeys(changes.removed_paths, REMOVED)
+        paths.update(dict.fromkeys(changes.paths or [], CHANGED))
+
+        try:
+            must_flush = await self._add(
+                keys=push_keys(changes.repository_id),
+                args=[
+                    changes.before,
+                    changes.after,
+                    int(changes.paths is None),
+                    self.ttl,
+                    int(self.window * 2 * 1000),
+                    *(item for path_state in paths.items() for item in path_state),
+                ]
+            )
+        except RedisError as error:
+            # not coalesced, but not lost either
+            logger.error(f"Pushes can't be coalesced: {error}")
+            self._spawn(self._run(changes))
+            return
+
+        metrics.increment("webhook.pushes")
+        if must_flush:
+            self._waiting[changes.repository_id] = self._spawn(
+                self._flush_later(changes.repository_id)
+            )
+
+    async def flush(self, repository_id: UUID) -> None:
+        """Pass repository's pending changes to on_flush right away."""
+        try:
+            state, paths = await self._take(keys=push_keys(repository_id))
+        except RedisError as error:
+            logger.error(f"Pushes can't be flushed: {error}")
+            return
+
+        state = _to_dict(state)
+        if "after" not in state:
+            return
+
+        paths = _to_dict(paths)
+        await self._run(RepositoryChanges(
+            repository_id=repository_id,
+            before=state["before"],
+            after=state["after"],
+            paths=(
+                None if "full" in state
+                else sorted(path for path, kind in paths.items() if kind == CHANGED)
+            ),
+            removed_paths=sorted(path for path, kind in paths.items() if kind == REMOVED)
+        ))
+
+    async def stop(self) -> None:
+        """Flush changes waiting for their windows to end right away and wait for all flushes."""
+        waiting, self._waiting = self._waiting, {}
+        for task in waiting.values():
+            task.cancel()
+        await asyncio.gather(*waiting.values(), return_exceptions=True)
+
+        for repository_id in waiting:
+            self._spawn(self.flush(repository_id))
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _flush_later(self, repository_id: UUID) -> None:
+        await asyncio.sleep(self.window)
+        self._waiting.pop(repository_id, None)
+        await self.flush(repository_id)
+
+    async def _run(self, changes: RepositoryChanges) -> None:
+        metrics.increment("webhook.flushes")
+        try:
+            await self.on_flush(changes)
+        except Exception as error:
+            logger.error(f"Changes of repository {changes.repository_id} weren't indexed: {error}")
+
+    def _spawn(self, coroutine: Awaitable[None]) -> asyncio.Task:
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+
+def _to_dict(flat: List) -> Dict[str, str]:
+    # HGETALL inside Lua gives a flat list of fields and values
+    items = [item.decode() if isinstance(item, bytes) else item for item in flat]
+    return dict(zip(items[::2], items[1::2], strict=True))
@@ -0,0 +1,90 @@
+import logging
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.metrics import metrics
+from src.core.security_policy import RateLimit
+from src.infrastructure.cache.memory import InMemoryTTLCache
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit"
+
+# refills the bucket by elapsed time, then takes a token if there is one;
+# returns seconds until a token is available, 0 if one was taken
+RATE_LIMIT_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or burst
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+
+def rate_limit_key(name: str, client: str) -> str:
+    """Get key of client's bucket of given limit."""
+    return f"{RATE_LIMIT_KEY_PREFIX}:{name}:{client}"
+
+
+class RateLimiter:
+
+    """Token buckets shared by workers, kept in Redis and updated by an atomic Lua script.
+
+    A throttled client is remembered in-process until its next token is due, so
+    its requests in the meantime are rejected without going to Redis. If Redis is
+    unavailable, requests are let through.
+    """
+
+    def __init__(self, redis_client: Redis, local_size: int = 10_000):
+        self.redis = redis_client
+        self._script = redis_client.register_script(RATE_LIMIT_SCRIPT)
+        # bucket's key -> monotonic time its next token is due
+        self._throttled: InMemoryTTLCache[str, float] = InMemoryTTLCache(
+            maxsize=local_size,
+            ttl=0
+        )
+
+    async def acquire(self, name: str, client: str, limit: RateLimit) -> float:
+        """Take a token from client's bucket. Return seconds to wait if there's none, else 0."""
+        key = rate_limit_key(name, client)
+
+        retry_at = self._throttled.get(key)
+        if retry_at is not None:
+            retry_after = retry_at - time.monotonic()
+            if retry_after > 0:
+                self._count_throttled(name)
+                return retry_after
+
+        try:
+            retry_after = float(await self._script(keys=[key], args=[limit.rate, limit.burst]))
+        except RedisError as error:
+            metrics.increment("rate_limit.errors")
+            logger.error(f"Rate limiter is unavailable: {error}")
+            return 0.0
+
+        if retry_after > 0:
+            self._throttled.set(key, time.monotonic() + retry_after, ttl=retry_after)
+            self._count_throttled(name)
+
+        return retry_after
+
+    def _count_throttled(self, name: str) -> None:
+        metrics.increment("rate_limit.throttled")
+        metrics.increment(f"rate_limit.throttled.{name}")
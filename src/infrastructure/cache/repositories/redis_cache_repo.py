@@ -1,46 +1,190 @@
-import json
-from typing import List, Optional
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from functools import partial
+from typing import Awaitable, Callable, List, Optional
 from uuid import UUID
 
 from redis.asyncio import Redis
+from redis.exceptions import LockError
 
+from src.core.metrics import metrics
 from src.core.settings import settings
 from src.domain.models.chat import Message
 from src.domain.repositories.cache_repo import ICacheRepository
+from src.infrastructure.cache.codecs import CacheCodec, CacheEntry, MsgpackCodec
+from src.infrastructure.cache.generations import RepositoryGenerations
+from src.infrastructure.cache.keys import answer_cache_key
+from src.infrastructure.cache.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 
 class RedisCacheRepository(ICacheRepository):
 
     """Cache's repository realisation for Redis."""
 
-    def __init__(self, redis_client: Redis):
+    def __init__(
+            self,
+            redis_client: Redis,
+            single_flight: Optional[SingleFlight] = None,
+            codec: Optional[CacheCodec] = None,
+            generations: Optional[RepositoryGenerations] = None
+    ):
         self.redis = redis_client
+        self.single_flight = single_flight or SingleFlight()
+        self.codec = codec or MsgpackCodec()
+        self.generations = generations or RepositoryGenerations(redis_client)
+        # values refreshed in background are put through the outermost tier, so its
+        # copies (e.g. in other workers' processes) are replaced too
+        self.put_refreshed: Callable[..., Awaitable[None]] = self.put_cache_value
 
-    def construct_cache_key(self, query: str, repository_ids: List[UUID]) -> str:
-        """Construct cache key."""
-        repository_ids = [str(repository_id) for repository_id in repository_ids]
-        sorted_ids = sorted(repository_ids)
+    async def construct_cache_key(self, query: str, repository_ids: List[UUID]) -> str:
+        """Construct cache key from canonical query and repositories' current generations."""
+        return answer_cache_key(query, repository_ids, await self.generations.get(repository_ids))
 
-        return f"{';'.join(sorted_ids)}:{query}"
+    async def bump_generations(self, repository_ids: List[UUID]) -> None:
+        """Start new generations of given repositories, invalidating keys of previous ones."""
+        await self.generations.bump(repository_ids)
 
-    async def get_cached_value(self, key: str) -> Optional[Message]:
+    async def get_cached_value(self, key: str, query: Optional[str] = None) -> Optional[Message]:
         """Get value from cache by given key. Return None if key isn't in cache yet."""
+        entry = await self._get_entry(key)
+
+        return entry.message if entry else None
+
+    async def _get_entry(self, key: str) -> Optional[CacheEntry]:
         value = await self.redis.get(key)
 
         if not value:
             return None
 
-        try:
-            return Message.model_validate_json(value)
-        except json.JSONDecodeError as error:
-            raise ValueError("Invalid JSON format from cache.") from error
+        return self.codec.decode(value)
 
-    async def put_cache_value(self, key: str, message: Message) -> None:
-        """Put value to key with given key."""
-        json_data = message.model_dump_json()
+    async def put_cache_value(
+            self,
+            key: str,
+            message: Message,
+            query: Optional[str] = None
+    ) -> None:
+        """Put value to key with given key. It's fresh for soft TTL and kept for hard TTL."""
+        entry = CacheEntry(
+            query=query,
+            message=message,
+            fresh_until=time.time() + settings.CACHE_SOFT_TTL
+        )
 
         await self.redis.set(
             name=key,
-            value=json_data,
+            value=self.codec.encode(entry),
             ex=settings.CACHE_TTL
         )
+
+    async def get_or_generate(
+            self,
+            key: str,
+            generate: Callable[[], Awaitable[Message]],
+            query: Optional[str] = None
+    ) -> Message:
+        """Get value from cache by given key or generate and put it if key isn't in cache yet.
+
+        Concurrent misses of one worker share one call, and workers share it via Redis lock:
+        the worker holding the lock generates the value, the others wait for it in cache.
+        Stale value is returned right away, while one worker refreshes it in background.
+        """
+        entry = await self._get_entry(key)
+
+        if entry is not None:
+            metrics.increment("cache.exact_hits")
+            if entry.is_stale():
+                metrics.increment("cache.stale_hits")
+                self.single_flight.launch(
+                    f"refresh:{key}",
+                    partial(self._refresh, key, generate, query)
+                )
+
+            return entry.message
+
+        metrics.increment("cache.misses")
+        return await self.single_flight.do(
+            key,
+            partial(self._generate_locked, key, generate, query)
+        )
+
+    async def _generate_locked(
+            self,
+            key: str,
+            generate: Callable[[], Awaitable[Message]],
+            query: Optional[str]
+    ) -> Message:
+        lock = self._lock(key)
+        acquired = await lock.acquire(blocking=False)
+
+        try:
+            if acquired:
+                # value could be put between the miss and the lock
+                message = await self.get_cached_value(key)
+            else:
+                message = await self._wait_for_value(key, lock)
+
+            # if the lock holder failed or is too slow, generate value on our own
+            if message is None:
+                message = await generate()
+                await self.put_cache_value(key=key, message=message, query=query)
+
+            return message
+        finally:
+            if acquired:
+                # lock could expire while generating
+                with suppress(LockError):
+                    await lock.release()
+
+    async def _refresh(
+            self,
+            key: str,
+            generate: Callable[[], Awaitable[Message]],
+            query: Optional[str]
+    ) -> None:
+        lock = self._lock(key)
+        # another worker is already refreshing the value
+        if not await lock.acquire(blocking=False):
+            return
+
+        try:
+            entry = await self._get_entry(key)
+            if entry is not None and not entry.is_stale():
+                return
+
+            message = await generate()
+            await self.put_refreshed(key=key, message=message, query=query)
+            metrics.increment("cache.refreshes")
+        except Exception as error:
+            # stale value is served until its hard TTL, next hit retries
+            metrics.increment("cache.refresh_errors")
+            logger.error(f"Failed to refresh cached value {key}: {error}")
+        finally:
+            with suppress(LockError):
+                await lock.release()
+
+    def _lock(self, key: str):
+        return self.redis.lock(
+            f"lock:{key}",
+            timeout=settings.CACHE_LOCK_TIMEOUT,
+            thread_local=False
+        )
+
+    async def _wait_for_value(self, key: str, lock) -> Optional[Message]:
+        deadline = time.monotonic() + settings.CACHE_LOCK_WAIT_TIMEOUT
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+
+            message = await self.get_cached_value(key)
+            if message is not None:
+                return message
+
+            if not await lock.locked():
+                return await self.get_cached_value(key)
+
+        return None
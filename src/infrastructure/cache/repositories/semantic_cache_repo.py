@@ -0,0 +1,169 @@
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+import numpy as np
+
+from src.core.metrics import metrics
+from src.domain.models.chat import Message
+from src.domain.repositories.cache_repo import ICacheRepository
+from src.infrastructure.cache.keys import scope_of_key
+from src.infrastructure.cache.semantic import IEmbedder, SemanticIndex
+
+logger = logging.getLogger(__name__)
+
+
+class _SimilarValue(Exception):
+
+    def __init__(self, message: Message):
+        self.message = message
+
+
+class SemanticCacheRepository(ICacheRepository):
+
+    """Cache's repository realisation answering paraphrased queries from the exact one.
+
+    On exact miss the query's embedding is compared with embeddings of cached
+    queries in the same scope (repositories and their generations, taken from the
+    key); the most similar one's value is returned if its cosine similarity reaches
+    the threshold. Values of similar queries are served, never put under the
+    query's own key. Exact hits, semantic hits and misses are counted separately.
+    """
+
+    def __init__(
+            self,
+            exact: ICacheRepository,
+            index: SemanticIndex,
+            embedder: IEmbedder,
+            threshold: float
+    ):
+        self.exact = exact
+        self.index = index
+        self.embedder = embedder
+        self.threshold = threshold
+        self._embeddings: Dict[str, np.ndarray] = {}
+
+    async def construct_cache_key(self, query: str, repository_ids: List[UUID]) -> str:
+        """Construct cache key."""
+        return await self.exact.construct_cache_key(query=query, repository_ids=repository_ids)
+
+    async def bump_generations(self, repository_ids: List[UUID]) -> None:
+        """Start new generations of given repositories; their old scopes aren't searched anymore."""
+        await self.exact.bump_generations(repository_ids)
+
+    async def get_cached_value(self, key: str, query: Optional[str] = None) -> Optional[Message]:
+        """Get value from cache by given key or, on miss, value of the most similar query."""
+        message = await self.exact.get_cached_value(key)
+
+        if message is not None:
+            metrics.increment("cache.exact_hits")
+            # keep queries first cached by other workers searchable here too
+            await self._index(key, query)
+            return message
+
+        if query is not None:
+            message = await self._get_similar_value(key, query)
+
+        if message is not None:
+            metrics.increment("cache.semantic_hits")
+        else:
+            metrics.increment("cache.misses")
+
+        return message
+
+    async def put_cache_value(
+            self,
+            key: str,
+            message: Message,
+            query: Optional[str] = None
+    ) -> None:
+        """Put value to key with given key and make the query searchable."""
+        await self.exact.put_cache_value(key=key, message=message, query=query)
+        await self._index(key, query)
+
+    async def get_or_generate(
+            self,
+            key: str,
+            generate: Callable[[], Awaitable[Message]],
+            query: Optional[str] = None
+    ) -> Message:
+        """Get value from cache by given key or similar query, generate it otherwise.
+
+        Similar queries are searched only once the exact tier missed, in place of
+        generation. Similar query's value answers another question, so it's returned
+        as is: only generated values are put under the key and refreshed. Exact hits
+        and misses (answered by similar queries too) are counted by the exact tier.
+        """
+        if query is None:
+            return await self.exact.get_or_generate(key=key, generate=generate)
+
+        resolving = True
+
+        async def generate_unless_similar() -> Message:
+            # exact tier refreshes stale values after it returned: those are generated
+            if resolving:
+                message = await self._get_similar_value(key, query)
+                if message is not None:
+                    # exact tier puts what's generated, so it's passed around it
+                    raise _SimilarValue(message)
+
+            return await generate()
+
+        try:
+            message = await self.exact.get_or_generate(
+                key=key,
+                generate=generate_unless_similar,
+                query=query
+            )
+        except _SimilarValue as similar:
+            metrics.increment("cache.semantic_hits")
+            return similar.message
+        finally:
+            resolving = False
+
+        await self._index(key, query)
+
+        return message
+
+    async def _get_similar_value(self, key: str, query: str) -> Optional[Message]:
+        vector = await self._embed(query)
+        if vector is None:
+            return None
+
+        scope = scope_of_key(key)
+        # the key's own value is the exact one, it's missing or being refreshed
+        found = self.index.search(scope, vector, exclude=key)
+
+        if found is None or found[1] < self.threshold:
+            return None
+
+        similar_key, _ = found
+        message = await self.exact.get_cached_value(similar_key)
+
+        if message is None:
+            # value expired, the query isn't answerable anymore
+            self.index.discard(scope, similar_key)
+
+        return message
+
+    async def _index(self, key: str, query: Optional[str]) -> None:
+        if query is None:
+            return
+
+        vector = await self._embed(query)
+        if vector is not None:
+            self.index.add(scope_of_key(key), vector, key)
+
+    async def _embed(self, query: str) -> Optional[np.ndarray]:
+        vector = self._embeddings.get(query)
+        if vector is None:
+            try:
+                vector = await self.embedder.embed(query)
+            except Exception as error:
+                # semantic lookups are an optimisation: exact tier answers without them
+                logger.warning(f"Failed to embed query: {error}")
+                return None
+
+            self._embeddings[query] = vector
+
+        return vector
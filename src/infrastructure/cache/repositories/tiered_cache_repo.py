@@ -0,0 +1,89 @@
+from typing import Awaitable, Callable, List, Optional
+from uuid import UUID
+
+from src.core.metrics import metrics
+from src.domain.models.chat import Message
+from src.domain.repositories.cache_repo import ICacheRepository
+from src.infrastructure.cache.memory import MessageCache
+from src.infrastructure.cache.pubsub import PubSubChannel
+
+
+class CacheInvalidationChannel(PubSubChannel):
+
+    """Channel of cache keys whose values were replaced by other workers."""
+
+
+class TieredCacheRepository(ICacheRepository):
+
+    """Cache's repository realisation with in-process tier in front of the shared one.
+
+    Local tier keeps already validated Messages. When a value is put, other workers
+    drop their local copy of the key; local TTL bounds staleness if that's missed.
+    """
+
+    def __init__(
+            self,
+            remote: ICacheRepository,
+            local: MessageCache,
+            invalidation: Optional[CacheInvalidationChannel] = None
+    ):
+        self.remote = remote
+        self.local = local
+        self.invalidation = invalidation
+
+    async def construct_cache_key(self, query: str, repository_ids: List[UUID]) -> str:
+        """Construct cache key."""
+        return await self.remote.construct_cache_key(query=query, repository_ids=repository_ids)
+
+    async def bump_generations(self, repository_ids: List[UUID]) -> None:
+        """Start new generations of given repositories.
+
+        Local entries of previous generations aren't reachable by new keys and just expire.
+        """
+        await self.remote.bump_generations(repository_ids)
+
+    async def get_cached_value(self, key: str, query: Optional[str] = None) -> Optional[Message]:
+        """Get value from cache by given key. Return None if key isn't in cache yet."""
+        message = self.local.get(key)
+
+        if message is None:
+            message = await self.remote.get_cached_value(key)
+
+            if message is not None:
+                self.local.set(key, message)
+
+        return message
+
+    async def put_cache_value(
+            self,
+            key: str,
+            message: Message,
+            query: Optional[str] = None
+    ) -> None:
+        """Put value to key with given key."""
+        await self.remote.put_cache_value(key=key, message=message, query=query)
+        self.local.set(key, message)
+
+        if self.invalidation is not None:
+            await self.invalidation.publish(key)
+
+    async def get_or_generate(
+            self,
+            key: str,
+            generate: Callable[[], Awaitable[Message]],
+            query: Optional[str] = None
+    ) -> Message:
+        """Get value from cache by given key or generate and put it if key isn't in cache yet."""
+        message = self.local.get(key)
+
+        if message is not None:
+            metrics.increment("cache.exact_hits")
+        else:
+            message = await self.remote.get_or_generate(
+                key=key,
+                generate=generate,
+                query=query
+            )
+            self.local.set(key, message)
+
+        return message
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.metrics import metrics
+from src.infrastructure.cache.bloom import BloomFilter
+from src.infrastructure.cache.pubsub import PubSubChannel
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY_PREFIX = "revoked"
+
+
+def revoked_key(jti: str) -> str:
+    """Get key marking token with given id as revoked."""
+    return f"{REVOKED_KEY_PREFIX}:{jti}"
+
+
+class TokenRevocationList:
+
+    """Ids (jti) of revoked tokens: in Redis until tokens expire, mirrored in a Bloom filter.
+
+    Most tokens aren't revoked, and the filter tells so without leaving the process;
+    only its positives are checked in Redis. Revocations made by other workers come
+    over pub/sub. While the filter is rebuilt (after pub/sub was broken, when it's
+    saturated) the old one is served; until it's loaded at all, every check goes
+    to Redis. If Redis is unavailable, the filter's positives are taken as revoked,
+    and so are all tokens before the filter is loaded only if fail_closed is set.
+    """
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            channel: str,
+            capacity: int,
+            false_positive_rate: float,
+            fail_closed: bool = False
+    ):
+        self.redis = redis_client
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.fail_closed = fail_closed
+        self.bloom = self._new_bloom()
+        self.synced = False
+        # ids for the filter being rebuilt, revocations made while Redis is scanned too
+        self._pending: Optional[List[str]] = None
+        self.channel = PubSubChannel(
+            redis_client,
+            channel,
+            on_message=self._add,
+            on_reset=self.reset
+        )
+        self._load_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Fill the filter from Redis and start receiving other workers' revocations."""
+        await self.channel.start()
+        await self.load()
+
+    async def stop(self) -> None:
+        """Stop receiving revocations."""
+        await self.channel.stop()
+        if self._load_task is not None:
+            self._load_task.cancel()
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke token with given id until it expires."""
+        expires_in = int(expires_at - time.time()) + 1
+        if expires_in <= 0:
+            return
+
+        await self.redis.set(revoked_key(jti), 1, ex=expires_in)
+        self._add(jti)
+        await self.channel.publish(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """Check if token with given id is revoked."""
+        if self.synced and jti not in self.bloom:
+            return False
+
+        if not self.synced:
+            # the filter failed to load: retry
+            self.reset()
+
+        metrics.increment("revocation.lookups")
+        try:
+            return bool(await self.redis.exists(revoked_key(jti)))
+        except RedisError as error:
+            logger.error(f"Revocation list is unavailable: {error}")
+            # filter's positive may be revoked; without the filter, anything may be
+            return self.synced or self.fail_closed
+
+    async def load(self) -> None:
+        """Rebuild the filter from revoked ids in Redis; the old one is kept on failure."""
+        self._pending = []
+        try:
+            async for key in self.redis.scan_iter(match=revoked_key("*"), count=1000):
+                if isinstance(key, bytes):
+                    key = key.decode()
+                self._pending.append(key.partition(":")[2])
+        except RedisError as error:
+            logger.error(f"Revocation list is unavailable: {error}")
+            return
+        finally:
+            revoked, self._pending = self._pending, None
+
+        # room to grow, so it isn't rebuilt again right away
+        bloom = self._new_bloom(2 * len(revoked))
+        for jti in revoked:
+            bloom.add(jti)
+
+        self.bloom = bloom
+        self.synced = True
+
+    def reset(self) -> None:
+        """Rebuild the filter in background, e.g. after revocations could be missed."""
+        if self._load_task is None or self._load_task.done():
+            self._load_task = asyncio.create_task(self.load())
+
+    def _add(self, jti: str) -> None:
+        self.bloom.add(jti)
+        if self._pending is not None:
+            self._pending.append(jti)
+
+        if self.bloom.is_saturated():
+            # expired ids are dropped from Redis, so the rebuilt filter is smaller
+            self.reset()
+
+    def _new_bloom(self, capacity: int = 0) -> BloomFilter:
+        return BloomFilter(max(capacity, self.capacity), self.false_positive_rate)
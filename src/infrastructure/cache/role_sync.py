@@ -0,0 +1,100 @@
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.security_policy import RolePermissions, role_permissions
+from src.domain.models.user import Role
+from src.infrastructure.cache.pubsub import PubSubChannel
+
+logger = logging.getLogger(__name__)
+
+ROLES_VERSION_KEY = "roles:version"
+
+
+class RolePermissionsSync:
+
+    """Keeps compiled role permissions of every worker in line with roles in db.
+
+    Roles are loaded from db on start. A changed role is sent to other workers over
+    pub/sub with the next value of the shared roles' version counter, so a worker that
+    sees a gap in versions (or a broken subscription) reloads all roles.
+    """
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            channel: str,
+            load_roles: Callable[[], Awaitable[List[Role]]],
+            permissions: RolePermissions = role_permissions
+    ):
+        self.redis = redis_client
+        self.load_roles = load_roles
+        self.permissions = permissions
+        self.channel = PubSubChannel(
+            redis_client,
+            channel,
+            on_message=self._receive,
+            on_reset=self.reset
+        )
+        self._reload_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Load roles and start receiving changes."""
+        await self.reload()
+        await self.channel.start()
+
+    async def stop(self) -> None:
+        """Stop receiving changes."""
+        await self.channel.stop()
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+
+    async def reload(self) -> None:
+        """Load all roles from db."""
+        try:
+            version = int(await self.redis.get(ROLES_VERSION_KEY) or 0)
+            roles = await self.load_roles()
+        except (RedisError, SQLAlchemyError) as error:
+            logger.error(f"Roles can't be loaded: {error}")
+            return
+
+        self.permissions.load({role.name: role.permissions for role in roles}, version)
+
+    def reset(self) -> None:
+        """Reload all roles in background."""
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(self.reload())
+
+    async def publish(self, role: Role) -> None:
+        """Apply created or changed role here and in other workers."""
+        try:
+            version = await self.redis.incr(ROLES_VERSION_KEY)
+            await self.channel.publish(json.dumps({
+                "version": version,
+                "name": role.name,
+                "permissions": role.permissions,
+            }))
+        except RedisError as error:
+            # other workers get the role on their next reload
+            logger.error(f"Role change can't be sent: {error}")
+            self.permissions.set_role(role.name, role.permissions)
+            return
+
+        self._apply(version, role.name, role.permissions)
+
+    def _receive(self, message: str) -> None:
+        data = json.loads(message)
+        self._apply(data["version"], data["name"], data["permissions"])
+
+    def _apply(self, version: int, name: str, permissions: List[str]) -> None:
+        if version > self.permissions.version + 1:
+            # changes between were missed
+            self.reset()
+
+        self.permissions.set_role(name, permissions)
+        self.permissions.version = max(self.permissions.version, version)
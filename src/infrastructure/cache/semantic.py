@@ -0,0 +1,170 @@
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.infrastructure.cache.keys import canonicalize_query
+
+_WORD = re.compile(r"\w+")
+
+
+class IEmbedder(ABC):
+
+    """Embedder of queries for semantic cache.
+
+    Vectors are L2-normalized float32 of dim length, so dot product is cosine similarity.
+    """
+
+    dim: int
+
+    @abstractmethod
+    async def embed(self, text: str) -> np.ndarray:
+        """Get normalized float32 embedding of text."""
+        raise NotImplementedError
+
+
+class HashingEmbedder(IEmbedder):
+
+    """Embeds text by signed feature hashing of its canonical words and word bigrams.
+
+    Lexical stand-in for tests and benchmarks: paraphrases sharing most of their
+    words get close vectors, but so do questions differing in a single key word
+    ("run" and "skip"), so it isn't fit to answer users.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Get normalized float32 embedding of text."""
+        words = _WORD.findall(canonicalize_query(text))
+        features = words + [
+            f"{first} {second}" for first, second in zip(words, words[1:], strict=False)
+        ]
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dim] += 1.0 if value >> 63 else -1.0
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class _ScopeIndex:
+
+    def __init__(self, dim: int, maxsize: int):
+        self.maxsize = maxsize
+        self.vectors = np.zeros((min(maxsize, 64), dim), dtype=np.float32)
+        self.keys: List[Optional[str]] = []
+        self.rows: Dict[str, int] = {}
+        self.next_row = 0
+
+    def add(self, vector: np.ndarray, key: str) -> None:
+        row = self.rows.get(key)
+        if row is None:
+            row = self._allocate_row()
+            self.rows[key] = row
+
+        self.vectors[row] = vector
+        self.keys[row] = key
+
+    def _allocate_row(self) -> int:
+        if len(self.keys) < self.maxsize:
+            if len(self.keys) == len(self.vectors):
+                grown = np.zeros(
+                    (min(len(self.vectors) * 2, self.maxsize), self.vectors.shape[1]),
+                    dtype=np.float32
+                )
+                grown[:len(self.keys)] = self.vectors
+                self.vectors = grown
+
+            self.keys.append(None)
+            return len(self.keys) - 1
+
+        # full: overwrite the oldest row
+        row = self.next_row
+        self.next_row = (row + 1) % self.maxsize
+        if self.keys[row] is not None:
+            del self.rows[self.keys[row]]
+
+        return row
+
+    def discard(self, key: str) -> None:
+        row = self.rows.pop(key, None)
+        if row is not None:
+            self.vectors[row] = 0
+            self.keys[row] = None
+
+    def search(
+            self,
+            vector: np.ndarray,
+            exclude: Optional[str] = None
+    ) -> Optional[Tuple[str, float]]:
+        if not self.rows:
+            return None
+
+        scores = self.vectors[:len(self.keys)] @ vector
+        excluded_row = self.rows.get(exclude)
+        if excluded_row is not None:
+            scores[excluded_row] = -np.inf
+
+        row = int(np.argmax(scores))
+        if self.keys[row] is None or row == excluded_row:
+            return None
+
+        return self.keys[row], float(scores[row])
+
+
+class SemanticIndex:
+
+    """In-process index of cached queries' embeddings, one float32 matrix per scope.
+
+    Maps embedding of a query to the cache key of its answer. Bounded by number of
+    scopes (least recently used is dropped) and rows per scope (oldest is overwritten).
+    """
+
+    def __init__(self, dim: int, scope_size: int, max_scopes: int):
+        self.dim = dim
+        self.scope_size = scope_size
+        self.max_scopes = max_scopes
+        self._scopes: OrderedDict[str, _ScopeIndex] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._scopes)
+
+    def add(self, scope: str, vector: np.ndarray, key: str) -> None:
+        """Put embedding of the query answered by value under key."""
+        index = self._scopes.get(scope)
+        if index is None:
+            index = _ScopeIndex(self.dim, self.scope_size)
+            self._scopes[scope] = index
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+
+        self._scopes.move_to_end(scope)
+        index.add(vector, key)
+
+    def search(
+            self,
+            scope: str,
+            vector: np.ndarray,
+            exclude: Optional[str] = None
+    ) -> Optional[Tuple[str, float]]:
+        """Get key (other than exclude) of the most similar query in scope and its similarity."""
+        index = self._scopes.get(scope)
+        if index is None:
+            return None
+
+        self._scopes.move_to_end(scope)
+        return index.search(vector, exclude)
+
+    def discard(self, scope: str, key: str) -> None:
+        """Remove key from scope."""
+        index = self._scopes.get(scope)
+        if index is not None:
+            index.discard(key)
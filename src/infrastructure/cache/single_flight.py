@@ -0,0 +1,42 @@
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+
+    """Coalesces concurrent calls with the same key into one call per process.
+
+    The call runs in its own task, so a caller that goes away (e.g. client
+    disconnected) doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn or, if it's already running for the key, wait for its result."""
+        return await asyncio.shield(self.launch(key, fn))
+
+    def launch(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> asyncio.Future:
+        """Run fn in background unless it's already running for the key."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(partial(self._forget, key))
+
+        return task
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+        # mark exception as retrieved even if all callers went away
+        if not task.cancelled():
+            task.exception()
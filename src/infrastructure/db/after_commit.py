@@ -0,0 +1,32 @@
+import logging
+from typing import Awaitable, Callable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+_CALLBACKS_KEY = "after_commit"
+
+
+def call_after_commit(session: AsyncSession, callback: Callable[[], Awaitable[object]]) -> None:
+    """Await callback once session's changes are committed by commit.
+
+    Caches of changed data are dropped this way: dropped before the commit, they
+    could be filled with the old data again by concurrent readers.
+    """
+    session.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+
+
+async def commit(session: AsyncSession) -> None:
+    """Commit session, then await its after-commit callbacks.
+
+    The changes are committed already, so callbacks' errors are logged, not raised.
+    """
+    await session.commit()
+
+    callbacks: List[Callable[[], Awaitable[object]]] = session.info.pop(_CALLBACKS_KEY, [])
+    for callback in callbacks:
+        try:
+            await callback()
+        except Exception as error:
+            logger.error(f"After-commit callback failed: {error}")
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import JSON, DateTime, ForeignKey, String, Text
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -20,7 +20,8 @@ class Chat(Base):
     messages: Mapped[list["Message"]] = relationship(
         back_populates="chat",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="raise",  # load explicitly where the whole history is needed
+        order_by="[Message.created_at, Message.id]"
     )
 
     def __repr__(self) -> str:
@@ -32,6 +33,9 @@ class Message(Base):
     """ORM-model for Message."""
 
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_chat_id_created_at_id", "chat_id", "created_at", "id"),
+    )
 
     chat_id: Mapped[UUID] = mapped_column(ForeignKey("chats.id", ondelete="CASCADE"))
 
@@ -41,7 +45,10 @@ class Message(Base):
 
     sources: Mapped[list | None] = mapped_column(JSON, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # clock_timestamp() instead of now(): messages of one transaction must still be ordered
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.clock_timestamp()
+    )
 
     chat: Mapped["Chat"] = relationship(back_populates="messages")
 
@@ -1,11 +1,20 @@
+import uuid
+from datetime import timedelta
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import desc, select
+from sqlalchemy import desc, func, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from src.domain.models.chat import Chat as DomainChat, Message as DomainMessage
+from sqlalchemy.orm import selectinload
+
+from src.domain.models.chat import (
+    Chat as DomainChat,
+    ChatSummary as DomainChatSummary,
+    Message as DomainMessage,
+    MessageCursor,
+)
 from src.domain.repositories.chat_repo import IChatRepository
+from src.infrastructure.cache.memory import ChatOwnerCache
 from src.infrastructure.db.models.chat import Chat as ORMChat, Message as ORMMessage
 
 
@@ -13,8 +22,9 @@ class SqlAlchemyChatRepository(IChatRepository):
 
     """Chat's repository realisation for SQLAlchemy."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, owner_cache: Optional[ChatOwnerCache] = None):
         self.session = session
+        self.owner_cache = owner_cache
 
     async def create_chat(self, owner_id: UUID, title: str) -> DomainChat:
         """Create a new chat."""
@@ -24,19 +34,82 @@ class SqlAlchemyChatRepository(IChatRepository):
         await self.session.flush()
         await self.session.refresh(chat)
 
-        return DomainChat.model_validate(chat)
+        return DomainChat(
+            id=chat.id,
+            title=chat.title,
+            owner_id=chat.owner_id,
+            created_at=chat.created_at,
+            messages=[]
+        )
+
+    async def get_user_chats(self, user_id: UUID) -> List[DomainChatSummary]:
+        """Get all user chats by user_id.
+
+        Messages are not loaded, only their count and the time of the last one
+        are aggregated in the same query.
+        """
+        stmt = (
+            select(
+                ORMChat.id,
+                ORMChat.title,
+                ORMChat.owner_id,
+                ORMChat.created_at,
+                func.count(ORMMessage.id).label("message_count"),
+                func.coalesce(
+                    func.max(ORMMessage.created_at), ORMChat.created_at
+                ).label("last_activity_at"),
+            )
+            .outerjoin(ORMMessage, ORMMessage.chat_id == ORMChat.id)
+            .where(ORMChat.owner_id == user_id)
+            .group_by(ORMChat.id)
+            .order_by(desc(ORMChat.created_at))
+        )
+        result = await self.session.execute(stmt)
+
+        return [DomainChatSummary.model_validate(row) for row in result.all()]
+
+    async def get_chat(self, chat_id: UUID) -> Optional[DomainChat]:
+        """Get chat by chat_id without its messages."""
+        stmt = select(ORMChat).where(ORMChat.id == chat_id)
+        result = await self.session.execute(stmt)
+        chat = result.scalar_one_or_none()
+
+        if chat:
+            return DomainChat(
+                id=chat.id,
+                title=chat.title,
+                owner_id=chat.owner_id,
+                created_at=chat.created_at
+            )
+
+        return None
+
+    async def get_chat_owner(self, chat_id: UUID) -> Optional[UUID]:
+        """Get owner_id of the chat. Return None if the chat doesn't exist.
 
-    async def get_user_chats(self, user_id: UUID) -> List[DomainChat]:
-        """Get all user chats by user_id."""
-        stmt = select(ORMChat).where(ORMChat.owner_id == user_id).order_by(desc(ORMChat.created_at))
+        Owners are cached (if cache is provided), so repeated checks don't hit db.
+        """
+        if self.owner_cache is not None:
+            owner_id = self.owner_cache.get(chat_id)
+            if owner_id is not None:
+                return owner_id
+
+        stmt = select(ORMChat.owner_id).where(ORMChat.id == chat_id)
         result = await self.session.execute(stmt)
-        chats = result.scalars().all()
+        owner_id = result.scalar_one_or_none()
+
+        if owner_id is not None and self.owner_cache is not None:
+            self.owner_cache.set(chat_id, owner_id)
 
-        return [DomainChat.model_validate(chat) for chat in chats]
+        return owner_id
 
     async def get_chat_full(self, chat_id: UUID) -> Optional[DomainChat]:
         """Get all chat messages by chat_id."""
-        stmt = select(ORMChat).where(ORMChat.id == chat_id)
+        stmt = (
+            select(ORMChat)
+            .where(ORMChat.id == chat_id)
+            .options(selectinload(ORMChat.messages))
+        )
         result = await self.session.execute(stmt)
         chat = result.scalar_one_or_none()
 
@@ -45,6 +118,29 @@ class SqlAlchemyChatRepository(IChatRepository):
 
         return None
 
+    async def get_chat_messages(
+            self,
+            chat_id: UUID,
+            limit: int,
+            before: Optional[MessageCursor] = None
+    ) -> List[DomainMessage]:
+        """Get up to limit latest chat messages older than the cursor, in chronological order.
+
+        Keyset pagination over (created_at, id), backed by the composite index
+        on messages(chat_id, created_at, id).
+        """
+        stmt = select(ORMMessage).where(ORMMessage.chat_id == chat_id)
+        if before:
+            stmt = stmt.where(
+                tuple_(ORMMessage.created_at, ORMMessage.id) < tuple_(before.created_at, before.id)
+            )
+        stmt = stmt.order_by(desc(ORMMessage.created_at), desc(ORMMessage.id)).limit(limit)
+
+        result = await self.session.execute(stmt)
+        messages = result.scalars().all()
+
+        return [DomainMessage.model_validate(msg) for msg in reversed(messages)]
+
     async def add_message(
             self,
             chat_id: UUID,
@@ -71,3 +167,38 @@ class SqlAlchemyChatRepository(IChatRepository):
             created_at=msg.created_at,
             sources=msg.sources
         )
+
+    async def add_messages(self, chat_id: UUID, messages: List[dict]) -> List[DomainMessage]:
+        """Add several messages to the chat at once, keeping their order.
+
+        All rows go in one INSERT ... RETURNING, so server defaults come back
+        without extra refresh round trips.
+        """
+        if not messages:
+            return []
+
+        # shift by position: rows of one statement may get the same clock_timestamp()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "chat_id": chat_id,
+                "role": message["role"],
+                "content": message["content"],
+                "sources": message.get("sources"),
+                "created_at": func.clock_timestamp() + timedelta(microseconds=position),
+            }
+            for position, message in enumerate(messages)
+        ]
+        stmt = insert(ORMMessage).values(rows).returning(
+            ORMMessage.id,
+            ORMMessage.role,
+            ORMMessage.content,
+            ORMMessage.sources,
+            ORMMessage.created_at,
+        )
+        result = await self.session.execute(stmt)
+
+        # RETURNING order isn't guaranteed, ids are known beforehand
+        created = {row.id: row for row in result.all()}
+
+        return [DomainMessage.model_validate(created[row["id"]]) for row in rows]
@@ -5,6 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.models.knowledge import GitLabConfig as DomainGitLabConfig
 from src.domain.repositories.gitlab_repo import IGitLabRepository
+from src.infrastructure.cache.gitlab_config import GitLabConfigHolder
+from src.infrastructure.db.after_commit import call_after_commit
 from src.infrastructure.db.models.gitlab import GitLabConfig as ORMGitLabConfig
 
 
@@ -12,14 +14,16 @@ class SqlAlchemyGitLabRepository(IGitLabRepository):
 
     """GitLab's repository realisation for SQLAlchemy."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, config_holder: Optional[GitLabConfigHolder] = None):
         self.session = session
+        self.config_holder = config_holder
 
     async def save_config(self, url: str, encrypted_token: str) -> DomainGitLabConfig:
         """Save or update the configuration.
 
         Use the singletone approach with id=1.
         If config with id=1 already exists then update it, otherwise create a new one.
+        The config held decrypted is dropped once the new one is committed.
         """
         stmt = select(ORMGitLabConfig).where(ORMGitLabConfig.id == 1)
         result = await self.session.execute(stmt)
@@ -38,6 +42,9 @@ class SqlAlchemyGitLabRepository(IGitLabRepository):
         config = DomainGitLabConfig.model_validate(orm_gitlab_config)
 
         await self.session.flush()
+        if self.config_holder is not None:
+            call_after_commit(self.session, self.config_holder.invalidate)
+
         return config
 
     async def get_config(self) -> Optional[DomainGitLabConfig]:
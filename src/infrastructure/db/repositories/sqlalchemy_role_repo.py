@@ -1,3 +1,4 @@
+from functools import partial
 from typing import List, Optional
 
 from sqlalchemy import select
@@ -6,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.models.user import Role as DomainRole
 from src.domain.repositories.role_repo import IRoleRepository
+from src.infrastructure.cache.role_sync import RolePermissionsSync
+from src.infrastructure.db.after_commit import call_after_commit
 from src.infrastructure.db.models import Role as ORMRole
 
 
@@ -13,11 +16,12 @@ class SqlAlchemyRoleRepository(IRoleRepository):
 
     """Roles' repository realisation for SQLAlchemy."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, role_sync: Optional[RolePermissionsSync] = None):
         self.session = session
+        self.role_sync = role_sync
 
     async def create(self, role: DomainRole) -> Optional[DomainRole]:
-        """Create new role and put it in db."""
+        """Create new role and put it in db; it's sent to permission checks once committed."""
         orm_role = ORMRole(name=role.name, permissions=role.permissions)
         self.session.add(orm_role)
         try:
@@ -27,7 +31,11 @@ class SqlAlchemyRoleRepository(IRoleRepository):
             await self.session.rollback()
             return None
 
-        return DomainRole.model_validate(orm_role)
+        role = DomainRole.model_validate(orm_role)
+        if self.role_sync is not None:
+            call_after_commit(self.session, partial(self.role_sync.publish, role))
+
+        return role
 
     async def get_by_name(self, role_name: str) -> Optional[DomainRole]:
         """Get info about role by its name."""
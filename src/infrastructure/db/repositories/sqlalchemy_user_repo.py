@@ -1,12 +1,17 @@
-from typing import List, Optional
+from functools import partial
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.models.user import User as DomainUser
+from src.core.settings import settings
+from src.domain.models.user import Principal, User as DomainUser, UserCursor, UserFilter
 from src.domain.repositories.user_repo import IUserRepository
+from src.infrastructure.cache.principal_cache import PrincipalCache
+from src.infrastructure.db.after_commit import call_after_commit
 from src.infrastructure.db.models import User as ORMUser
 
 
@@ -14,17 +19,51 @@ class SqlAlchemyUserRepository(IUserRepository):
 
     """User's repository realisation for SQLAlchemy."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, principal_cache: Optional[PrincipalCache] = None):
         self.session = session
+        self.principal_cache = principal_cache
+
+    async def get_users(
+            self,
+            limit: int,
+            filters: UserFilter,
+            after: Optional[UserCursor] = None
+    ) -> List[DomainUser]:
+        """Get up to limit users matching filters with usernames after the cursor, by username.
+
+        Keyset pagination over the unique index on users.username.
+        """
+        stmt = self._filtered_users(filters)
+        if after:
+            stmt = stmt.where(ORMUser.username > after.username)
+        stmt = stmt.limit(limit)
 
-    async def get_all_users(self) -> List[DomainUser]:
-        """Retrieve all existing users from db."""
-        stmt = select(ORMUser)
         result = await self.session.execute(stmt)
         orm_users = result.scalars().all()
 
         return [DomainUser.model_validate(orm_user) for orm_user in orm_users]
 
+    async def stream_users(self, filters: UserFilter) -> AsyncIterator[DomainUser]:
+        """Stream all users matching filters by username through a server-side cursor."""
+        stmt = self._filtered_users(filters).execution_options(
+            yield_per=settings.USERS_EXPORT_BATCH_SIZE
+        )
+        orm_users = await self.session.stream_scalars(stmt)
+
+        async for orm_user in orm_users:
+            yield DomainUser.model_validate(orm_user)
+            # rows already converted aren't needed anymore
+            self.session.expunge(orm_user)
+
+    def _filtered_users(self, filters: UserFilter) -> Select:
+        stmt = select(ORMUser).order_by(ORMUser.username)
+        if filters.role is not None:
+            stmt = stmt.where(ORMUser.role == filters.role)
+        if filters.username_prefix:
+            stmt = stmt.where(ORMUser.username.startswith(filters.username_prefix, autoescape=True))
+
+        return stmt
+
     async def get_by_username(self, username: str) -> Optional[DomainUser]:
         """Retrieve user from db by id."""
         stmt = select(ORMUser).where(ORMUser.username == username)
@@ -35,9 +74,9 @@ class SqlAlchemyUserRepository(IUserRepository):
             return DomainUser.model_validate(orm_user)
         return None
 
-    async def get_by_email(self, email: str) -> Optional[DomainUser]:
-        """Retrieve user from db by email adress."""
-        stmt = select(ORMUser).where(ORMUser.email == email)
+    async def get_by_id(self, user_id: UUID) -> Optional[DomainUser]:
+        """Retrieve user from db by username."""
+        stmt = select(ORMUser).where(ORMUser.id == user_id)
         result = await self.session.execute(stmt)
         orm_user = result.scalar_one_or_none()
 
@@ -45,9 +84,35 @@ class SqlAlchemyUserRepository(IUserRepository):
             return DomainUser.model_validate(orm_user)
         return None
 
-    async def get_by_id(self, user_id: UUID) -> Optional[DomainUser]:
-        """Retrieve user from db by username."""
-        stmt = select(ORMUser).where(ORMUser.id == user_id)
+    async def get_principal(self, user_id: UUID) -> Optional[Principal]:
+        """Retrieve user to authenticate by id, from cache if possible."""
+        if self.principal_cache is not None:
+            principal = await self.principal_cache.get(user_id)
+            if principal is not None:
+                return principal
+
+        user = await self.get_by_id(user_id)
+        if user is None:
+            return None
+
+        if self.principal_cache is None:
+            return Principal.model_validate(user, from_attributes=True)
+
+        return await self.principal_cache.put(user)
+
+    async def create_if_unique(self, user: DomainUser) -> Optional[DomainUser]:
+        """Create new user unless username or email is taken, by one INSERT ... ON CONFLICT."""
+        stmt = (
+            insert(ORMUser)
+            .values(
+                username=user.username,
+                email=user.email,
+                role=user.role,
+                hashed_password=user.hashed_password,
+            )
+            .on_conflict_do_nothing()
+            .returning(ORMUser)
+        )
         result = await self.session.execute(stmt)
         orm_user = result.scalar_one_or_none()
 
@@ -55,27 +120,22 @@ class SqlAlchemyUserRepository(IUserRepository):
             return DomainUser.model_validate(orm_user)
         return None
 
-    async def create(self, user: DomainUser) -> DomainUser:
-        """Create new user and put them in db."""
-        db_user = ORMUser(
-            username=user.username,
-            email=user.email,
-            role=user.role,
-            hashed_password=user.hashed_password,
+    async def get_taken_field(self, username: str, email: str) -> Optional[str]:
+        """Get which of username and email is already taken: "username", "email" or None."""
+        stmt = (
+            select(ORMUser.username)
+            .where(or_(ORMUser.username == username, ORMUser.email == email))
+            .limit(2)
         )
+        result = await self.session.execute(stmt)
+        usernames = result.scalars().all()
 
-        self.session.add(db_user)
-        try:
-            await self.session.flush()
-            await self.session.refresh(db_user)
-        except IntegrityError:
-            await self.session.rollback()
+        if not usernames:
             return None
-
-        return DomainUser.model_validate(db_user)
+        return "username" if username in usernames else "email"
 
     async def update(self, user: DomainUser) -> Optional[DomainUser]:
-        """Update info about existing user."""
+        """Update info about existing user; their cached principal is dropped after commit."""
         stmt = select(ORMUser).where(ORMUser.id == user.id)
         result = await self.session.execute(stmt)
         orm_user = result.scalar_one_or_none()
@@ -91,4 +151,7 @@ class SqlAlchemyUserRepository(IUserRepository):
             await self.session.rollback()
             return None
 
+        if self.principal_cache is not None:
+            call_after_commit(self.session, partial(self.principal_cache.invalidate, user.id))
+
         return DomainUser.model_validate(orm_user)
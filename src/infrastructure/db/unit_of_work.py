@@ -0,0 +1,30 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.domain.repositories.chat_repo import IChatRepository
+from src.infrastructure.cache.memory import ChatOwnerCache
+from src.infrastructure.db.after_commit import commit
+from src.infrastructure.db.repositories.sqlalchemy_chat_repo import SqlAlchemyChatRepository
+
+
+class ChatUnitOfWork:
+
+    """Opens short sessions of chats' repository, committed on exit.
+
+    Meant for work outliving the request's own session, e.g. a streamed answer:
+    the connection is held only while the repository is used, not for the whole
+    stream, and the changes are committed before the stream reports them.
+    """
+
+    def __init__(self, engine: AsyncEngine, owner_cache: Optional[ChatOwnerCache] = None):
+        self.engine = engine
+        self.owner_cache = owner_cache
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[IChatRepository]:
+        """Open session of chats' repository; it's committed unless the block raises."""
+        async with AsyncSession(bind=self.engine, expire_on_commit=False) as session:
+            yield SqlAlchemyChatRepository(session=session, owner_cache=self.owner_cache)
+            await commit(session)
@@ -1,6 +1,8 @@
 import logging
-from typing import AsyncIterable
+from typing import AsyncIterable, Iterable, Optional
+from uuid import UUID
 
+import httpx
 from dishka import Provider, Scope, provide
 from fastapi import HTTPException, status
 from redis import ConnectionPool, Redis, asyncio as aioredis
@@ -8,7 +10,9 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 
 from src.application.services import AdminService, AuthService, ChatService, IndexService
+from src.core.security_policy import RateLimit
 from src.core.settings import Settings, settings
+from src.domain.models.knowledge import RepositoryChanges
 from src.domain.repositories import (
     IChatRepository,
     IGitLabRepository,
@@ -17,7 +21,33 @@ from src.domain.repositories import (
     IUserRepository,
 )
 from src.domain.repositories.cache_repo import ICacheRepository
+from src.infrastructure.cache.codecs import CacheCodec, JsonCodec, MsgpackCodec
+from src.infrastructure.cache.generations import GenerationsChannel, RepositoryGenerations
+from src.infrastructure.cache.gitlab_catalogue import GitLabCatalogue
+from src.infrastructure.cache.gitlab_config import GitLabConfigHolder
+from src.infrastructure.cache.memory import (
+    CatalogueCache,
+    ChatOwnerCache,
+    MessageCache,
+    UserCache,
+)
+from src.infrastructure.cache.principal_cache import (
+    PrincipalCache,
+    PrincipalInvalidationChannel,
+)
+from src.infrastructure.cache.push_debouncer import PushDebouncer
+from src.infrastructure.cache.rate_limiter import RateLimiter
 from src.infrastructure.cache.repositories.redis_cache_repo import RedisCacheRepository
+from src.infrastructure.cache.repositories.semantic_cache_repo import SemanticCacheRepository
+from src.infrastructure.cache.repositories.tiered_cache_repo import (
+    CacheInvalidationChannel,
+    TieredCacheRepository,
+)
+from src.infrastructure.cache.revocation import TokenRevocationList
+from src.infrastructure.cache.role_sync import RolePermissionsSync
+from src.infrastructure.cache.semantic import IEmbedder, SemanticIndex
+from src.infrastructure.cache.single_flight import SingleFlight
+from src.infrastructure.db.after_commit import commit
 from src.infrastructure.db.repositories import (
     SqlAlchemyChatRepository,
     SqlAlchemyGitLabRepository,
@@ -25,6 +55,12 @@ from src.infrastructure.db.repositories import (
     SqlAlchemyRoleRepository,
     SqlAlchemyUserRepository,
 )
+from src.infrastructure.db.unit_of_work import ChatUnitOfWork
+from src.infrastructure.external.embedding_client import EmbeddingClient
+from src.infrastructure.external.gitlab_client import GitLabClient
+from src.infrastructure.external.gitlab_scheduler import GitLabRequestScheduler
+from src.infrastructure.external.llm_client import LLMClient
+from src.infrastructure.security.password import PasswordHasher
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +89,7 @@ class InfrastructureProvider(Provider):
         async with AsyncSession(bind=engine, expire_on_commit=False) as session:
             try:
                 yield session
-                await session.commit()
+                await commit(session)
             except SQLAlchemyError as sql_exc:
                 await session.rollback()
                 logger.error(f"SQLAlchemy error: {sql_exc}")
@@ -73,6 +109,67 @@ class InfrastructureProvider(Provider):
                 ) from e
 
 
+    @provide(scope=Scope.APP)
+    def get_password_hasher(self, settings: Settings) -> Iterable[PasswordHasher]:
+        """Get pool hashing passwords off the event loop."""
+        password_hasher = PasswordHasher(max_workers=settings.PASSWORD_HASH_WORKERS)
+        try:
+            yield password_hasher
+        finally:
+            password_hasher.shutdown()
+
+    @provide(scope=Scope.APP)
+    async def get_gitlab_http_client(self, settings: Settings) -> AsyncIterable[httpx.AsyncClient]:
+        """Get HTTP client keeping connections to GitLab open between requests."""
+        async with httpx.AsyncClient(
+            http2=settings.GITLAB_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.GITLAB_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GITLAB_MAX_CONNECTIONS
+            ),
+            timeout=settings.GITLAB_TIMEOUT
+        ) as http_client:
+            yield http_client
+
+    @provide(scope=Scope.APP)
+    def get_gitlab_scheduler(
+        self,
+        rate_limiter: RateLimiter,
+        settings: Settings
+    ) -> GitLabRequestScheduler:
+        """Get scheduler pacing requests to GitLab under its rate limits."""
+        return GitLabRequestScheduler(
+            rate_limiter=rate_limiter,
+            limit=RateLimit(
+                rate=settings.GITLAB_RATE_LIMIT,
+                burst=settings.GITLAB_RATE_LIMIT_BURST
+            ),
+            max_retries=settings.GITLAB_MAX_RETRIES,
+            backoff_base=settings.GITLAB_BACKOFF_BASE,
+            backoff_max=settings.GITLAB_BACKOFF_MAX
+        )
+
+    @provide(scope=Scope.APP)
+    def get_gitlab_client(
+        self,
+        http_client: httpx.AsyncClient,
+        scheduler: GitLabRequestScheduler,
+        settings: Settings
+    ) -> GitLabClient:
+        """Get GitLab API client."""
+        return GitLabClient(
+            http_client=http_client,
+            max_concurrency=settings.GITLAB_PAGE_CONCURRENCY,
+            per_page=settings.GITLAB_PER_PAGE,
+            scheduler=scheduler
+        )
+
+    @provide(scope=Scope.APP)
+    def get_llm_client(self, settings: Settings) -> LLMClient:
+        """Get LLM service client."""
+        return LLMClient(base_url=settings.LLM_SERVICE_URL.get_secret_value())
+
+
 class RepositoryProvider(Provider):
 
     """Provider for Repositories."""
@@ -80,24 +177,49 @@ class RepositoryProvider(Provider):
     scope = Scope.REQUEST
 
     @provide
-    def get_user_repository(self, session: AsyncSession) -> IUserRepository:
+    def get_user_repository(
+        self,
+        session: AsyncSession,
+        principal_cache: PrincipalCache
+    ) -> IUserRepository:
         """Get user's repository."""
-        return SqlAlchemyUserRepository(session=session)
+        return SqlAlchemyUserRepository(session=session, principal_cache=principal_cache)
 
     @provide
-    def get_chat_repository(self, session: AsyncSession) -> IChatRepository:
+    def get_chat_repository(
+        self,
+        session: AsyncSession,
+        owner_cache: ChatOwnerCache
+    ) -> IChatRepository:
         """Get chat's repository."""
-        return SqlAlchemyChatRepository(session=session)
+        return SqlAlchemyChatRepository(session=session, owner_cache=owner_cache)
+
+    @provide(scope=Scope.APP)
+    def get_chat_unit_of_work(
+        self,
+        engine: AsyncEngine,
+        owner_cache: ChatOwnerCache
+    ) -> ChatUnitOfWork:
+        """Get opener of short chats' repository sessions, e.g. for streamed answers."""
+        return ChatUnitOfWork(engine=engine, owner_cache=owner_cache)
 
     @provide
-    def get_role_repository(self, session: AsyncSession) -> IRoleRepository:
+    def get_role_repository(
+        self,
+        session: AsyncSession,
+        role_sync: RolePermissionsSync
+    ) -> IRoleRepository:
         """Get roles' repository."""
-        return SqlAlchemyRoleRepository(session=session)
+        return SqlAlchemyRoleRepository(session=session, role_sync=role_sync)
 
     @provide
-    def get_gitlab_repository(self, session: AsyncSession) -> IGitLabRepository:
+    def get_gitlab_repository(
+        self,
+        session: AsyncSession,
+        config_holder: GitLabConfigHolder
+    ) -> IGitLabRepository:
         """Get GitLab's repository."""
-        return SqlAlchemyGitLabRepository(session=session)
+        return SqlAlchemyGitLabRepository(session=session, config_holder=config_holder)
 
     @provide
     def get_job_repository(self, session: AsyncSession) -> IJobRepository:
@@ -112,33 +234,62 @@ class SericeProvider(Provider):
     scope = Scope.REQUEST
 
     @provide
-    def get_auth_service(self, user_repo: IUserRepository) -> AuthService:
+    def get_auth_service(
+        self,
+        user_repo: IUserRepository,
+        password_hasher: PasswordHasher,
+        revocations: TokenRevocationList
+    ) -> AuthService:
         """Get auth service."""
-        return AuthService(user_repo=user_repo)
+        return AuthService(
+            user_repo=user_repo,
+            password_hasher=password_hasher,
+            revocations=revocations
+        )
 
     @provide
     def get_chat_service(
         self,
         chat_repo: IChatRepository,
-        cache_repo: ICacheRepository
+        cache_repo: ICacheRepository,
+        llm_client: LLMClient,
+        chat_unit_of_work: ChatUnitOfWork
     ) -> ChatService:
         """Get chat's service."""
-        return ChatService(chat_repo=chat_repo, cache_repo=cache_repo)
+        return ChatService(
+            chat_repo=chat_repo,
+            cache_repo=cache_repo,
+            llm_client=llm_client,
+            chat_unit_of_work=chat_unit_of_work
+        )
 
     @provide
     def get_index_service(
         self,
         gitlab_repo: IGitLabRepository,
-        job_repo: IJobRepository
+        job_repo: IJobRepository,
+        cache_repo: ICacheRepository,
+        gitlab_client: GitLabClient,
+        catalogue: GitLabCatalogue,
+        push_debouncer: PushDebouncer,
+        config_holder: GitLabConfigHolder
     ) -> IndexService:
         """Get index service."""
-        return IndexService(gitlab_repo=gitlab_repo, job_repo=job_repo)
+        return IndexService(
+            gitlab_repo=gitlab_repo,
+            job_repo=job_repo,
+            cache_repo=cache_repo,
+            gitlab_client=gitlab_client,
+            catalogue=catalogue,
+            push_debouncer=push_debouncer,
+            config_holder=config_holder
+        )
 
     @provide
     def get_admin_service(
         self,
         user_repo: IUserRepository,
-        role_repo: IRoleRepository,
+        role_repo: IRoleRepository
     ) -> AdminService:
         """Get admin service."""
         return AdminService(user_repo=user_repo, role_repo=role_repo)
@@ -151,10 +302,8 @@ class CacheProvider(Provider):
     @provide(scope=Scope.APP)
     def get_redis_pool(self) -> ConnectionPool:
         """Get Redis connection pool."""
-        return aioredis.ConnectionPool.from_url(
-            settings.REDIS_URL.get_secret_value(),
-            decode_responses=True
-        )
+        # cached values are binary, see get_cache_codec
+        return aioredis.ConnectionPool.from_url(settings.REDIS_URL.get_secret_value())
 
     @provide(scope=Scope.APP)
     async def get_redis_client(self, pool: ConnectionPool) -> AsyncIterable[Redis]:
@@ -165,10 +314,264 @@ class CacheProvider(Provider):
         finally:
             await client.close()
 
+    @provide(scope=Scope.APP)
+    def get_chat_owner_cache(self) -> ChatOwnerCache:
+        """Get in-process cache of chats' owners."""
+        return ChatOwnerCache(
+            maxsize=settings.CHAT_OWNER_CACHE_SIZE,
+            ttl=settings.CHAT_OWNER_CACHE_TTL
+        )
+
+    @provide(scope=Scope.APP)
+    def get_user_cache(self) -> UserCache:
+        """Get in-process tier of authenticated users' cache."""
+        return UserCache(
+            maxsize=settings.PRINCIPAL_CACHE_SIZE,
+            ttl=settings.PRINCIPAL_CACHE_TTL
+        )
+
+    @provide(scope=Scope.APP)
+    async def get_principal_invalidation_channel(
+        self,
+        client: Redis,
+        local: UserCache
+    ) -> AsyncIterable[PrincipalInvalidationChannel]:
+        """Get channel dropping users from in-process tier when other workers update them."""
+        channel = PrincipalInvalidationChannel(
+            client,
+            settings.PRINCIPAL_INVALIDATION_CHANNEL,
+            on_message=lambda user_id: local.pop(UUID(user_id)),
+            on_reset=local.clear
+        )
+        await channel.start()
+        try:
+            yield channel
+        finally:
+            await channel.stop()
+
+    @provide(scope=Scope.APP)
+    def get_principal_cache(
+        self,
+        client: Redis,
+        local: UserCache,
+        invalidation: PrincipalInvalidationChannel
+    ) -> PrincipalCache:
+        """Get cache of authenticated users."""
+        return PrincipalCache(
+            local,
+            client,
+            invalidation=invalidation,
+            ttl=settings.PRINCIPAL_CACHE_TTL
+        )
+
+    @provide(scope=Scope.APP)
+    async def get_token_revocation_list(
+        self,
+        client: Redis
+    ) -> AsyncIterable[TokenRevocationList]:
+        """Get list of revoked tokens, mirrored in-process."""
+        revocations = TokenRevocationList(
+            client,
+            settings.REVOCATION_CHANNEL,
+            capacity=settings.REVOKED_TOKENS_CAPACITY,
+            false_positive_rate=settings.REVOKED_TOKENS_FALSE_POSITIVE_RATE,
+            fail_closed=settings.REVOKED_TOKENS_FAIL_CLOSED
+        )
+        await revocations.start()
+        try:
+            yield revocations
+        finally:
+            await revocations.stop()
+
+    @provide(scope=Scope.APP)
+    async def get_role_permissions_sync(
+        self,
+        client: Redis,
+        engine: AsyncEngine
+    ) -> AsyncIterable[RolePermissionsSync]:
+        """Get synchronizer of in-process roles' permissions with db."""
+        async def load_roles():
+            async with AsyncSession(bind=engine) as session:
+                return await SqlAlchemyRoleRepository(session=session).get_all_roles()
+
+        role_sync = RolePermissionsSync(client, settings.ROLES_CHANNEL, load_roles)
+        await role_sync.start()
+        try:
+            yield role_sync
+        finally:
+            await role_sync.stop()
+
+    @provide(scope=Scope.APP)
+    def get_rate_limiter(self, client: Redis) -> RateLimiter:
+        """Get limiter of clients' request rates."""
+        return RateLimiter(client)
+
+    @provide(scope=Scope.APP)
+    def get_gitlab_catalogue(
+        self,
+        client: Redis,
+        gitlab_client: GitLabClient,
+        single_flight: SingleFlight
+    ) -> GitLabCatalogue:
+        """Get cached catalogue of GitLab projects."""
+        return GitLabCatalogue(
+            client=gitlab_client,
+            redis_client=client,
+            local=CatalogueCache(
+                maxsize=settings.GITLAB_CATALOGUE_CACHE_SIZE,
+                ttl=settings.GITLAB_CATALOGUE_REFRESH_INTERVAL
+            ),
+            single_flight=single_flight,
+            refresh_interval=settings.GITLAB_CATALOGUE_REFRESH_INTERVAL,
+            full_refresh_interval=settings.GITLAB_CATALOGUE_FULL_REFRESH_INTERVAL,
+            ttl=settings.GITLAB_CATALOGUE_TTL
+        )
+
+    @provide(scope=Scope.APP)
+    async def get_gitlab_config_holder(self, client: Redis) -> AsyncIterable[GitLabConfigHolder]:
+        """Get in-process holder of decrypted GitLab config."""
+        config_holder = GitLabConfigHolder(
+            client,
+            settings.GITLAB_CONFIG_CHANNEL,
+            ttl=settings.GITLAB_CONFIG_TTL
+        )
+        await config_holder.start()
+        try:
+            yield config_holder
+        finally:
+            await config_holder.stop()
+
+    @provide(scope=Scope.APP)
+    async def get_push_debouncer(
+        self,
+        client: Redis,
+        engine: AsyncEngine
+    ) -> AsyncIterable[PushDebouncer]:
+        """Get coalescer of pushes into incremental indexing jobs."""
+        async def trigger_indexing(changes: RepositoryChanges) -> None:
+            async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+                service = IndexService(
+                    gitlab_repo=SqlAlchemyGitLabRepository(session=session),
+                    job_repo=SqlAlchemyJobRepository(session=session)
+                )
+                await service.trigger_incremental_indexing(changes)
+                await commit(session)
+
+        push_debouncer = PushDebouncer(
+            client,
+            on_flush=trigger_indexing,
+            window=settings.GITLAB_WEBHOOK_DEBOUNCE
+        )
+        try:
+            yield push_debouncer
+        finally:
+            await push_debouncer.stop()
+
+    @provide(scope=Scope.APP)
+    def get_single_flight(self) -> SingleFlight:
+        """Get in-process registry of running cache generations."""
+        return SingleFlight()
+
+    @provide(scope=Scope.APP)
+    def get_cache_codec(self) -> CacheCodec:
+        """Get serializer of cached values."""
+        if settings.CACHE_CODEC == "json":
+            return JsonCodec()
+
+        return MsgpackCodec(compress_min_size=settings.CACHE_COMPRESS_MIN_SIZE)
+
+    @provide(scope=Scope.APP)
+    def get_message_cache(self) -> MessageCache:
+        """Get in-process tier of answers' cache."""
+        return MessageCache(
+            maxsize=settings.LOCAL_CACHE_SIZE,
+            ttl=settings.LOCAL_CACHE_TTL,
+            maxbytes=settings.LOCAL_CACHE_MAX_BYTES
+        )
+
+    @provide(scope=Scope.APP)
+    async def get_cache_invalidation_channel(
+        self,
+        client: Redis,
+        local: MessageCache
+    ) -> AsyncIterable[CacheInvalidationChannel]:
+        """Get channel dropping keys from in-process tier when other workers put them."""
+        channel = CacheInvalidationChannel(
+            client,
+            settings.CACHE_INVALIDATION_CHANNEL,
+            on_message=local.pop,
+            on_reset=local.clear
+        )
+        await channel.start()
+        try:
+            yield channel
+        finally:
+            await channel.stop()
+
+    @provide(scope=Scope.APP)
+    async def get_repository_generations(
+        self,
+        client: Redis
+    ) -> AsyncIterable[RepositoryGenerations]:
+        """Get repositories' generations kept in process and updated by other workers' bumps."""
+        generations = RepositoryGenerations(client, ttl=settings.CACHE_GENERATIONS_TTL)
+        generations.channel = GenerationsChannel(
+            client,
+            settings.CACHE_GENERATIONS_CHANNEL,
+            on_message=generations.on_message,
+            on_reset=generations.on_reset
+        )
+        await generations.channel.start()
+        try:
+            yield generations
+        finally:
+            await generations.channel.stop()
+
+    @provide(scope=Scope.APP)
+    def get_semantic_index(self) -> SemanticIndex:
+        """Get in-process index of cached queries' embeddings."""
+        return SemanticIndex(
+            dim=settings.SEMANTIC_CACHE_DIM,
+            scope_size=settings.SEMANTIC_CACHE_SCOPE_SIZE,
+            max_scopes=settings.SEMANTIC_CACHE_MAX_SCOPES
+        )
+
+    @provide(scope=Scope.APP)
+    async def get_embedder(self) -> AsyncIterable[Optional[IEmbedder]]:
+        """Get embedder of queries for semantic cache, if its model is configured."""
+        if settings.SEMANTIC_CACHE_EMBEDDING_URL is None:
+            yield None
+            return
+
+        async with httpx.AsyncClient(
+            base_url=settings.SEMANTIC_CACHE_EMBEDDING_URL.get_secret_value(),
+            timeout=settings.SEMANTIC_CACHE_EMBEDDING_TIMEOUT
+        ) as http_client:
+            yield EmbeddingClient(http_client=http_client, dim=settings.SEMANTIC_CACHE_DIM)
+
     @provide(scope=Scope.REQUEST)
     async def get_cache_repository(
         self,
-        client: Redis
+        client: Redis,
+        single_flight: SingleFlight,
+        codec: CacheCodec,
+        local: MessageCache,
+        invalidation: CacheInvalidationChannel,
+        generations: RepositoryGenerations,
+        index: SemanticIndex,
+        embedder: Optional[IEmbedder]
     ) -> ICacheRepository:
-        """Get Redis cache repository."""
-        return RedisCacheRepository(client)
+        """Get cache repository: semantic lookup over in-process LRU in front of Redis."""
+        remote = RedisCacheRepository(client, single_flight, codec, generations)
+        cache_repo = TieredCacheRepository(remote=remote, local=local, invalidation=invalidation)
+        remote.put_refreshed = cache_repo.put_cache_value
+
+        if embedder is None:
+            return cache_repo
+
+        return SemanticCacheRepository(
+            exact=cache_repo,
+            index=index,
+            embedder=embedder,
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD
+        )
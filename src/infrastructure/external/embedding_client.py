@@ -0,0 +1,25 @@
+import httpx
+import numpy as np
+
+from src.infrastructure.cache.semantic import IEmbedder
+
+
+class EmbeddingClient(IEmbedder):
+
+    """Embedding model service client."""
+
+    def __init__(self, http_client: httpx.AsyncClient, dim: int):
+        self.http_client = http_client
+        self.dim = dim
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Make a request and get normalized float32 embedding of text."""
+        response = await self.http_client.post("/embeddings", json={"input": text})
+        response.raise_for_status()
+
+        vector = np.asarray(response.json()["embedding"], dtype=np.float32)
+        if vector.shape != (self.dim,):
+            raise ValueError(f"Expected embedding of {self.dim} dimensions, got {vector.shape}")
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -1,20 +1,235 @@
+import asyncio
+import hashlib
+import logging
 import uuid
-from typing import List
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, NamedTuple, Optional
+
+import httpx
+from fastapi import HTTPException, status
+from pydantic import BaseModel, HttpUrl, TypeAdapter, ValidationError
 
 from src.domain.models.knowledge import Repository
+from src.infrastructure.external.gitlab_scheduler import GitLabRequestScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def repository_id(base_url: str, project_id: int) -> uuid.UUID:
+    """Get stable id of GitLab project: the same for the same instance and project."""
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"{base_url.rstrip('/')}/projects/{project_id}")
+
+
+def token_fingerprint(token: str) -> str:
+    """Get short digest identifying token without revealing it."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+class GitLabProject(BaseModel):
+
+    """Data structure for fields of GitLab's project a repository is made of."""
+
+    id: int
+    name: str
+    path_with_namespace: str
+    web_url: HttpUrl
+
+
+_PROJECTS_PAGE = TypeAdapter(List[GitLabProject])
+
+
+class ProjectListing(NamedTuple):
+
+    """Projects of a listing with ETag of its first page."""
+
+    repositories: List[Repository]
+    etag: Optional[str]
 
 
 class GitLabClient:
 
-    """GitLab client (yet just a mock)."""
+    """GitLab REST API client over a shared connection pool.
+
+    Projects are listed page by page: the first page tells the number of pages
+    (X-Total-Pages), the rest are fetched concurrently, at most max_concurrency
+    at once. GitLab omits the total for very large result sets; then pages are
+    followed one by one by X-Next-Page. Given a scheduler, requests are paced under
+    GitLab's rate limit of the token and retried when throttled.
+    """
+
+    def __init__(
+            self,
+            http_client: httpx.AsyncClient,
+            max_concurrency: int,
+            per_page: int = 100,
+            scheduler: Optional[GitLabRequestScheduler] = None
+    ):
+        self.http_client = http_client
+        self.max_concurrency = max_concurrency
+        self.per_page = per_page
+        self.scheduler = scheduler
 
     async def list_projects(self, base_url: str, token: str) -> List[Repository]:
-        """Make a request and get all gitlab repositories."""
-        return [
-            Repository(
-                id=str(uuid.uuid4()),
-                name="Mock",
-                path_with_namespace="iter1/mock",
-                url="https://www.gitlab.com/mock_repo"
+        """Make requests and get all gitlab repositories."""
+        listing = await self._list(base_url, token, {"order_by": "id", "sort": "asc"})
+        return listing.repositories
+
+    async def list_changed_projects(
+            self,
+            base_url: str,
+            token: str,
+            since: datetime,
+            etag: Optional[str] = None
+    ) -> Optional[ProjectListing]:
+        """Get repositories with activity after since, most recent first.
+
+        Given ETag of the previous such listing, return None if it hasn't changed:
+        a project with new activity moves to the first page, so its ETag covers all.
+        """
+        return await self._list(
+            base_url,
+            token,
+            {
+                "order_by": "last_activity_at",
+                "sort": "desc",
+                "last_activity_after": since.isoformat(),
+            },
+            etag
+        )
+
+    async def _list(
+            self,
+            base_url: str,
+            token: str,
+            params: Dict[str, str],
+            etag: Optional[str] = None
+    ) -> Optional[ProjectListing]:
+        base_url = base_url.rstrip("/")
+        response = await self._get_page(base_url, token, params, page=1, etag=etag)
+        if response.status_code == status.HTTP_304_NOT_MODIFIED:
+            return None
+
+        pages = [_projects(response)]
+
+        total_pages = _int_header(response, "X-Total-Pages")
+        if total_pages is not None:
+            pages.extend(
+                await self._get_pages(base_url, token, params, range(2, total_pages + 1))
+            )
+        else:
+            next_page = _int_header(response, "X-Next-Page")
+            while next_page is not None:
+                next_response = await self._get_page(base_url, token, params, page=next_page)
+                pages.append(_projects(next_response))
+                next_page = _int_header(next_response, "X-Next-Page")
+
+        return ProjectListing(
+            repositories=[
+                _to_repository(base_url, project) for page in pages for project in page
+            ],
+            etag=response.headers.get("ETag")
+        )
+
+    async def _get_pages(
+            self,
+            base_url: str,
+            token: str,
+            params: Dict[str, str],
+            numbers: range
+    ) -> List[List[GitLabProject]]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def get_page(page: int) -> List[GitLabProject]:
+            async with semaphore:
+                response = await self._get_page(base_url, token, params, page)
+                return _projects(response)
+
+        # a failed page cancels the rest; its error is raised as is, not as a group
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(get_page(page)) for page in numbers]
+        except* HTTPException as errors:
+            raise errors.exceptions[0] from None
+
+        return [task.result() for task in tasks]
+
+    async def _get_page(
+            self,
+            base_url: str,
+            token: str,
+            params: Dict[str, str],
+            page: int,
+            etag: Optional[str] = None
+    ) -> httpx.Response:
+        headers = {"PRIVATE-TOKEN": token}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+
+        request = partial(
+            self.http_client.get,
+            f"{base_url}/api/v4/projects",
+            params={
+                **params,
+                "simple": "true",
+                "archived": "false",
+                "per_page": self.per_page,
+                "page": page,
+            },
+            headers=headers,
+        )
+
+        try:
+            if self.scheduler is not None:
+                response = await self.scheduler.send(token_fingerprint(token), request)
+            else:
+                response = await request()
+        except httpx.HTTPError as error:
+            logger.error(f"GitLab is unavailable: {error}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="GitLab is unavailable."
+            ) from error
+
+        if response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="GitLab rejected the configured token."
+            )
+        if response.is_error:
+            logger.error(f"GitLab responded with {response.status_code} to page {page}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="GitLab request failed."
             )
-        ]
+
+        return response
+
+
+def _int_header(response: httpx.Response, name: str) -> Optional[int]:
+    # e.g. proxies may mangle headers: a malformed one is as good as a missing one
+    try:
+        return int(response.headers.get(name, ""))
+    except ValueError:
+        return None
+
+
+def _projects(response: httpx.Response) -> List[GitLabProject]:
+    try:
+        return _PROJECTS_PAGE.validate_json(response.content)
+    except ValidationError as error:
+        logger.error(f"GitLab responded with malformed projects: {error}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="GitLab responded with malformed projects."
+        ) from error
+
+
+def _to_repository(base_url: str, project: GitLabProject) -> Repository:
+    # fields are validated already
+    return Repository.model_construct(
+        id=repository_id(base_url, project.id),
+        name=project.name,
+        path_with_namespace=project.path_with_namespace,
+        url=project.web_url
+    )
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from src.core.metrics import metrics
+from src.core.security_policy import RateLimit
+from src.infrastructure.cache.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+GITLAB_RATE_LIMIT_NAME = "gitlab"
+
+RETRIED_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class GitLabRequestScheduler:
+
+    """Paces requests to GitLab under its per-token rate limit and retries throttled ones.
+
+    Requests take tokens from a bucket per token, shared by workers in Redis. Its
+    rate follows GitLab's RateLimit-Remaining and RateLimit-Reset headers: what's
+    left of the limit is spread until it's reset, so requests go as fast as allowed
+    and no faster. 429 and 5xx responses and connection errors are retried with
+    jittered exponential backoff, 429 not before its Retry-After.
+    """
+
+    def __init__(
+            self,
+            rate_limiter: RateLimiter,
+            limit: RateLimit,
+            max_retries: int = 5,
+            backoff_base: float = 0.5,
+            backoff_max: float = 30
+    ):
+        self.rate_limiter = rate_limiter
+        self.limit = limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # client -> limit learned from GitLab's headers
+        self._limits: Dict[str, RateLimit] = {}
+
+    def limit_of(self, client: str) -> RateLimit:
+        """Get current limit of client's requests."""
+        return self._limits.get(client, self.limit)
+
+    async def send(
+            self,
+            client: str,
+            request: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Send request on behalf of client (e.g. token's fingerprint) when it's allowed.
+
+        Response of the last attempt is returned as is; a connection error of the
+        last attempt is raised.
+        """
+        attempt = 0
+        while True:
+            await self._wait_turn(client)
+
+            try:
+                response = await request()
+            except httpx.TransportError as error:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"GitLab request failed, retrying: {error}")
+                delay = self._backoff(attempt)
+            else:
+                self._observe(client, response)
+                if response.status_code not in RETRIED_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = self._backoff(attempt)
+                if response.status_code == 429:
+                    metrics.increment("gitlab.throttled")
+                    delay = max(delay, _float_header(response, "Retry-After") or 0)
+
+            metrics.increment("gitlab.retries")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _wait_turn(self, client: str) -> None:
+        while True:
+            retry_after = await self.rate_limiter.acquire(
+                GITLAB_RATE_LIMIT_NAME,
+                client,
+                self.limit_of(client)
+            )
+            if retry_after <= 0:
+                return
+            metrics.increment("gitlab.paced")
+            await asyncio.sleep(retry_after)
+
+    def _observe(self, client: str, response: httpx.Response) -> None:
+        remaining = _float_header(response, "RateLimit-Remaining")
+        reset_at = _float_header(response, "RateLimit-Reset")
+        if remaining is None or reset_at is None:
+            return
+
+        # at least a request a window, so the bucket refills once the limit is reset
+        reset_in = max(1.0, reset_at - time.time())
+        self._limits[client] = RateLimit(
+            rate=max(1.0, remaining) / reset_in,
+            burst=self.limit.burst
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: workers retrying at once spread over the whole window
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)) # noqa: S311
+
+
+def _float_header(response: httpx.Response, name: str) -> Optional[float]:
+    value = response.headers.get(name)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,49 @@
+import re
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List
+
+from src.domain.models.chat import AnswerChunk, Message, MessageRole, Source
+
+
+class LLMClient:
+
+    """LLM service client (yet just a mock)."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    async def ask(self, question: str, repo_ids: List[uuid.UUID]) -> Message:
+        """Make a request and get the whole answer."""
+        content = []
+        sources = []
+        async for chunk in self.stream(question, repo_ids):
+            content.append(chunk.content)
+            sources.extend(chunk.sources or [])
+
+        return Message(
+            id=uuid.uuid4(),
+            role=MessageRole.ASSISTANT,
+            content="".join(content),
+            created_at=datetime.now(),
+            sources=sources
+        )
+
+    async def stream(
+        self,
+        question: str,
+        repo_ids: List[uuid.UUID]
+    ) -> AsyncIterator[AnswerChunk]:
+        """Make a request and get the answer chunk by chunk. The last chunk carries sources."""
+        for token in re.split(r"(?<=\s)", "Will be a real llm call later :)"):
+            yield AnswerChunk(content=token)
+
+        yield AnswerChunk(
+            sources=[
+                Source(
+                    title="README.md",
+                    url="https://gitlab/mock_project/readme/",
+                    quote="Mock quote"
+                )
+            ]
+        )
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from src.domain.models.knowledge import IndexingJob
+from src.domain.models.knowledge import IndexingJob, RepositoryChanges
 
 
 class MLOpsClient:
@@ -25,3 +25,23 @@ class MLOpsClient:
             created_at=datetime.now(),
             details=f"Mock triggered for repos {repo_ids}"
         )
+
+    async def trigger_incremental_indexing(
+        self,
+        changes: RepositoryChanges,
+        gitlab_url: str,
+        gitlab_token: str
+    ) -> IndexingJob:
+        """Make a request to reindex only changed files of a repository."""
+        scope = "all files" if changes.paths is None else f"{len(changes.paths)} files"
+        return IndexingJob(
+            id=uuid.uuid4(),
+            status="RUNNING",
+            repository_ids=[changes.repository_id],
+            created_at=datetime.now(),
+            details=(
+                f"Mock triggered incremental indexing of repo {changes.repository_id} "
+                f"{changes.before}..{changes.after}: {scope}, "
+                f"{len(changes.removed_paths)} removed"
+            )
+        )
@@ -1,13 +1,23 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 from jose import jwt
 
 from src.core.settings import settings
+from src.infrastructure.cache.memory import InMemoryTTLCache
+
+# verified payloads by token's digest, each expiring with its token
+_payload_cache: InMemoryTTLCache[bytes, Dict[str, Any]] = InMemoryTTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
-    """Create JWT token."""
+    """Create JWT token with unique id (jti), by which it can be revoked."""
     to_encode = data.copy()
 
     if expires_delta:
@@ -17,7 +27,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
 
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY.get_secret_value(), algorithm=settings.ALGORITHM
@@ -26,11 +36,30 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
 
 
 def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
-    """Decode JWT token."""
+    """Decode JWT token.
+
+    Payloads of verified tokens are cached until the tokens expire, so repeated
+    requests with the same token skip parsing and signature verification.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = _payload_cache.get(digest)
+    if payload is not None:
+        return dict(payload)
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY.get_secret_value(), algorithms=[settings.ALGORITHM]
         )
-        return payload
     except Exception:
         return None
+
+    expires_in = payload.get("exp", 0) - time.time()
+    if expires_in > 0:
+        _payload_cache.set(digest, payload, ttl=expires_in)
+
+    return dict(payload)
+
+
+def clear_token_cache() -> None:
+    """Forget all verified payloads, e.g. after the signing key has changed."""
+    _payload_cache.clear()
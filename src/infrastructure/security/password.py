@@ -1,5 +1,14 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
 from passlib.context import CryptContext
 
+from src.core.metrics import metrics
+
+T = TypeVar("T")
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -11,3 +20,50 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     """Hash the password."""
     return pwd_context.hash(password)
+
+
+class PasswordHasher:
+
+    """Runs bcrypt hashing and verification in a bounded thread pool, off the event loop.
+
+    bcrypt releases the GIL, so threads hash in parallel while the loop serves other
+    requests. At most max_workers calls run at once, the rest wait in line; the
+    password_hashing.queued and password_hashing.running gauges show both.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hasher"
+        )
+        self._semaphore = asyncio.Semaphore(max_workers)
+
+    async def hash(self, password: str) -> str:
+        """Hash the password."""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Check does the password equal to the hash."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop worker threads once running calls are done."""
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        queued_at = time.perf_counter()
+        metrics.increment("password_hashing.queued")
+        try:
+            await self._semaphore.acquire()
+        finally:
+            metrics.increment("password_hashing.queued", -1)
+
+        metrics.increment("password_hashing.wait_seconds", time.perf_counter() - queued_at)
+        metrics.increment("password_hashing.running")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            metrics.increment("password_hashing.running", -1)
+            metrics.increment("password_hashing.calls")
+            self._semaphore.release()
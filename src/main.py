@@ -1,8 +1,11 @@
+from contextlib import asynccontextmanager
+
 from dishka import make_async_container
 from dishka.integrations.fastapi import setup_dishka
 from fastapi import FastAPI
 
 from api.routers import admin, auth, chat, indexing, repository
+from src.infrastructure.cache.role_sync import RolePermissionsSync
 from src.infrastructure.di.providers import (
     CacheProvider,
     InfrastructureProvider,
@@ -10,11 +13,6 @@ from src.infrastructure.di.providers import (
     SericeProvider,
 )
 
-app = FastAPI(
-    title="Автономная LLM-система верифицируемого знания",
-    version="0.1.0",
-)
-
 container = make_async_container(
     InfrastructureProvider(),
     RepositoryProvider(),
@@ -22,6 +20,21 @@ container = make_async_container(
     CacheProvider()
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load roles' permissions before serving requests, release resources on shutdown."""
+    await container.get(RolePermissionsSync)
+    yield
+    await container.close()
+
+
+app = FastAPI(
+    title="Автономная LLM-система верифицируемого знания",
+    version="0.1.0",
+    lifespan=lifespan,
+)
+
 setup_dishka(container, app)
 
 app.include_router(auth.router, prefix="/v1/auth")
@@ -1,4 +1,5 @@
-from unittest.mock import AsyncMock
+import json
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
@@ -10,7 +11,14 @@ from httpx import ASGITransport, AsyncClient
 
 from src.api.dependencies import get_current_user
 from src.application.services.admin_service import AdminService
-from src.domain.models.user import Role as DomainRole, User as DomainUser, UserRole
+from src.core.settings import settings
+from src.domain.models.user import (
+    Role as DomainRole,
+    User as DomainUser,
+    UserFilter,
+    UserPage,
+    UserRole,
+)
 
 BASE_URL = "/v1/admin"
 
@@ -78,33 +86,97 @@ async def test_get_all_users_not_empty(ac, mock_admin_service):
             hashed_password=".."
         ),
     ]
-    mock_admin_service.get_all_users.return_value = mock_users_list
+    mock_admin_service.get_users_page.return_value = UserPage(
+        users=mock_users_list,
+        next_cursor="next"
+    )
 
     response = await ac.get(f"{BASE_URL}/users")
 
-    mock_admin_service.get_all_users.assert_called_once()
+    mock_admin_service.get_users_page.assert_called_once_with(
+        filters=UserFilter(),
+        limit=settings.USERS_PAGE_SIZE,
+        after=None
+    )
     assert response.status_code == 200
 
     data = response.json()
-    assert len(data) == 2
-    assert data[0]["username"] == "user1"
-    assert data[0]["role"] == "user"
-    assert data[1]["username"] == "user2"
-    assert data[1]["role"] == "user"
+    users = data["users"]
+    assert len(users) == 2
+    assert users[0]["username"] == "user1"
+    assert users[0]["role"] == "user"
+    assert users[1]["username"] == "user2"
+    assert users[1]["role"] == "user"
+    assert "hashed_password" not in users[0]
+    assert data["next_cursor"] == "next"
 
 
 @pytest.mark.asyncio
 async def test_get_all_users_empty(ac, mock_admin_service):
     """Test that endpoint returns an empty list when there is no data."""
-    mock_admin_service.get_all_users.return_value = []
+    mock_admin_service.get_users_page.return_value = UserPage(users=[])
 
     response = await ac.get(f"{BASE_URL}/users")
 
-    mock_admin_service.get_all_users.assert_called_once()
+    mock_admin_service.get_users_page.assert_called_once()
     assert response.status_code == 200
 
     data = response.json()
-    assert data == []
+    assert data == {"users": [], "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_get_users_filters_and_cursor(ac, mock_admin_service):
+    """Test that filters, page size and cursor are passed to service."""
+    mock_admin_service.get_users_page.return_value = UserPage(users=[])
+
+    response = await ac.get(
+        f"{BASE_URL}/users",
+        params={"role": "admin", "username_prefix": "jo", "limit": 10, "after": "cursor"}
+    )
+
+    assert response.status_code == 200
+    mock_admin_service.get_users_page.assert_called_once_with(
+        filters=UserFilter(role="admin", username_prefix="jo"),
+        limit=10,
+        after="cursor"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_users_limit_too_big(ac, mock_admin_service):
+    """Test that page size is bounded."""
+    response = await ac.get(
+        f"{BASE_URL}/users",
+        params={"limit": settings.USERS_MAX_PAGE_SIZE + 1}
+    )
+
+    assert response.status_code == 422
+    mock_admin_service.get_users_page.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_export_users(ac, mock_admin_service):
+    """Test that users are streamed as NDJSON."""
+    users = [
+        DomainUser(id=uuid4(), username=f"user{i}", email=f"u{i}@t.com", hashed_password="..")
+        for i in range(3)
+    ]
+
+    async def stream_users():
+        for user in users:
+            yield user
+
+    mock_admin_service.export_users = MagicMock(return_value=stream_users())
+
+    response = await ac.get(f"{BASE_URL}/users/export", params={"role": "user"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["username"] for line in lines] == ["user0", "user1", "user2"]
+    assert "hashed_password" not in lines[0]
+    mock_admin_service.export_users.assert_called_once_with(UserFilter(role="user"))
 
 
 @pytest.mark.asyncio
@@ -244,3 +316,17 @@ async def test_create_new_role_already_exists(ac, mock_admin_service):
     assert response.status_code == 400
 
     mock_admin_service.create_new_role.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_metrics(ac, mocker):
+    """Test that worker's counters are returned."""
+    mocker.patch(
+        "src.api.routers.admin.metrics.snapshot",
+        return_value={"cache.exact_hits": 2, "cache.semantic_hits": 1}
+    )
+
+    response = await ac.get(f"{BASE_URL}/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"cache.exact_hits": 2, "cache.semantic_hits": 1}
@@ -13,6 +13,7 @@ from src.api.dependencies import (
 )
 from src.application.services.auth_service import AuthService
 from src.domain.models.user import User as DomainUser
+from src.infrastructure.cache.rate_limiter import RateLimiter
 
 BASE_URL = "/v1/auth"
 
@@ -24,8 +25,16 @@ def mock_auth_service():
     return service
 
 
+@pytest.fixture
+def mock_rate_limiter():
+    """Create mock for RateLimiter letting every request through."""
+    limiter = AsyncMock(spec=RateLimiter)
+    limiter.acquire.return_value = 0.0
+    return limiter
+
+
 @pytest_asyncio.fixture(scope="function")
-async def dishka_app(app_fixture, mock_auth_service):
+async def dishka_app(app_fixture, mock_auth_service, mock_rate_limiter):
     """Fixture for Dishka integration."""
     provider = Provider()
 
@@ -34,6 +43,11 @@ async def dishka_app(app_fixture, mock_auth_service):
         scope=Scope.APP,
         provides=AuthService
     )
+    provider.provide(
+        lambda: mock_rate_limiter,
+        scope=Scope.APP,
+        provides=RateLimiter
+    )
 
     container = make_async_container(provider)
     app_fixture.middleware_stack = None
@@ -118,6 +132,46 @@ async def test_login_for_access_token_success(ac, mock_auth_service):
     assert data["token_type"] == "bearer"
 
 
+@pytest.mark.asyncio
+async def test_login_rate_limited(ac, mock_auth_service, mock_rate_limiter):
+    """Test that endpoint returns 429 with Retry-After when logins from IP are too often."""
+    mock_rate_limiter.acquire.return_value = 12.1
+
+    response = await ac.post(
+        f"{BASE_URL}/token",
+        data={"username": "test_username", "password": "test_password"}
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "13"
+    assert mock_rate_limiter.acquire.call_args.args[1].startswith("ip:")
+    mock_auth_service.authenticate_user.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("hops, client", [(0, "127.0.0.1"), (1, "10.0.0.2"), (2, "10.0.0.1")])
+async def test_login_rate_limited_by_forwarded_address(
+        ac,
+        mock_auth_service,
+        mock_rate_limiter,
+        mocker,
+        hops,
+        client
+):
+    """Test that only addresses appended to X-Forwarded-For by trusted proxies are used."""
+    mocker.patch("src.api.dependencies.settings.TRUSTED_PROXY_HOPS", hops)
+    mock_rate_limiter.acquire.return_value = 0
+    mock_auth_service.authenticate_user.return_value = {"access_token": "test_jwt_token"}
+
+    await ac.post(
+        f"{BASE_URL}/token",
+        data={"username": "test_username", "password": "test_password"},
+        headers={"X-Forwarded-For": "10.0.0.1, 10.0.0.2"}
+    )
+
+    assert mock_rate_limiter.acquire.call_args.args[1] == f"ip:{client}"
+
+
 @pytest.mark.asyncio
 async def test_login_for_access_token_not_all_fields(ac, mock_auth_service):
     """Test that endpoint raises error when not all login data fields provided."""
@@ -171,3 +225,24 @@ async def test_read_users_me_success(ac):
 
     assert data["username"] == "username" # from override fixture
     assert data["email"] == "user@test.com"
+
+
+@pytest.mark.asyncio
+async def test_logout_success(ac, mock_auth_service):
+    """Test that bearer token is revoked on logout."""
+    response = await ac.post(
+        f"{BASE_URL}/logout",
+        headers={"Authorization": "Bearer test_jwt_token"}
+    )
+
+    assert response.status_code == 204
+    mock_auth_service.revoke_token.assert_called_once_with("test_jwt_token")
+
+
+@pytest.mark.asyncio
+async def test_logout_without_token(ac, mock_auth_service):
+    """Test that logout requires bearer token."""
+    response = await ac.post(f"{BASE_URL}/logout")
+
+    assert response.status_code == 401
+    mock_auth_service.revoke_token.assert_not_called()
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from unittest.mock import AsyncMock
 from uuid import uuid4
@@ -12,9 +13,19 @@ from httpx import ASGITransport, AsyncClient
 from src.api.dependencies import (
     get_current_user,
 )
+from src.api.schemas.chat import MessageResponse
 from src.application.services.chat_service import ChatService
-from src.domain.models.chat import Chat as DomainChat, Message as DomainMessage
+from src.core.security_policy import RATE_LIMITS, Action
+from src.domain.models.chat import (
+    AnswerChunk,
+    Chat as DomainChat,
+    ChatHistory as DomainChatHistory,
+    ChatSummary as DomainChatSummary,
+    Message as DomainMessage,
+    Source as DomainSource,
+)
 from src.domain.models.user import User as DomainUser
+from src.infrastructure.cache.rate_limiter import RateLimiter
 
 BASE_URL = "/v1/chat"
 
@@ -38,8 +49,16 @@ def mock_user():
     )
 
 
+@pytest.fixture
+def mock_rate_limiter():
+    """Create mock for RateLimiter letting every request through."""
+    limiter = AsyncMock(spec=RateLimiter)
+    limiter.acquire.return_value = 0.0
+    return limiter
+
+
 @pytest_asyncio.fixture(scope="function")
-async def dishka_app(app_fixture, mock_chat_service):
+async def dishka_app(app_fixture, mock_chat_service, mock_rate_limiter):
     """Fixture for Dishka integration."""
     provider = Provider()
 
@@ -48,6 +67,11 @@ async def dishka_app(app_fixture, mock_chat_service):
         scope=Scope.APP,
         provides=ChatService
     )
+    provider.provide(
+        lambda: mock_rate_limiter,
+        scope=Scope.APP,
+        provides=RateLimiter
+    )
 
     container = make_async_container(provider)
     app_fixture.middleware_stack = None
@@ -140,6 +164,31 @@ async def test_get_user_chats_success(ac, mock_chat_service, mock_user):
     assert data[1]["title"] == "test_title2"
 
 
+@pytest.mark.asyncio
+async def test_get_user_chats_summary(ac, mock_chat_service, mock_user):
+    """Test that endpoint returns message aggregates and doesn't return messages."""
+    last_activity = datetime.now()
+    mock_chat_service.get_user_chats.return_value = [
+        DomainChatSummary(
+            id=uuid4(),
+            title="test_title",
+            owner_id=mock_user.id,
+            created_at=datetime.now(),
+            message_count=4,
+            last_activity_at=last_activity
+        )
+    ]
+
+    response = await ac.get(f"{BASE_URL}/")
+
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data[0]["message_count"] == 4
+    assert data[0]["last_activity_at"] == last_activity.isoformat()
+    assert "messages" not in data[0]
+
+
 @pytest.mark.asyncio
 async def test_get_user_chats_empty(ac, mock_chat_service, mock_user):
     """Test that endpoint returns empty list when there is no user's Chats."""
@@ -179,7 +228,7 @@ async def test_get_chat_history_success(ac, mock_chat_service, mock_user):
 
     assert response.status_code == 200
     mock_chat_service.get_chat_history.assert_called_once_with(
-        user_id=mock_user.id, chat_id=chat_id
+        user_id=mock_user.id, chat_id=chat_id, limit=50, before=None
     )
 
     data = response.json()
@@ -188,6 +237,41 @@ async def test_get_chat_history_success(ac, mock_chat_service, mock_user):
     assert data["messages"][0]["content"] == "test_content"
 
 
+@pytest.mark.asyncio
+async def test_get_chat_history_next_page(ac, mock_chat_service, mock_user):
+    """Test that endpoint passes page parameters and returns the cursor of the next page."""
+    chat_id = uuid4()
+
+    mock_chat_service.get_chat_history.return_value = DomainChatHistory(
+        id=chat_id,
+        title="test_title1",
+        owner_id=mock_user.id,
+        created_at=datetime.now(),
+        messages=[],
+        next_cursor="test_next_cursor"
+    )
+
+    response = await ac.get(
+        f"{BASE_URL}/{chat_id}", params={"limit": 10, "before": "test_cursor"}
+    )
+
+    assert response.status_code == 200
+    mock_chat_service.get_chat_history.assert_called_once_with(
+        user_id=mock_user.id, chat_id=chat_id, limit=10, before="test_cursor"
+    )
+    assert response.json()["next_cursor"] == "test_next_cursor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [0, 201])
+async def test_get_chat_history_limit_out_of_bounds(ac, mock_chat_service, limit):
+    """Test that endpoint rejects page sizes out of bounds."""
+    response = await ac.get(f"{BASE_URL}/{uuid4()}", params={"limit": limit})
+
+    assert response.status_code == 422
+    mock_chat_service.get_chat_history.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_chat_history_not_found(ac, mock_chat_service):
     """Test that endpoint raises error when chat is not found."""
@@ -240,3 +324,93 @@ async def test_send_message_success(ac, mock_chat_service, mock_user):
     assert data["role"] == "assistant"
     assert data["content"] == "test_answer"
 
+
+@pytest.mark.asyncio
+async def test_send_message_rate_limited(ac, mock_chat_service, mock_rate_limiter, mock_user):
+    """Test that endpoint returns 429 with Retry-After when user sends messages too often."""
+    mock_rate_limiter.acquire.return_value = 2.5
+    payload = {"repo_ids": [str(uuid4())], "message": {"content": "test_question"}}
+
+    response = await ac.post(f"{BASE_URL}/{uuid4()}/message", json=payload)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    mock_rate_limiter.acquire.assert_called_once_with(
+        "chat:write",
+        f"user:{mock_user.id}",
+        RATE_LIMITS[Action.CHAT_WRITE]
+    )
+    mock_chat_service.ask_question.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_send_message_stream_success(ac, mock_chat_service, mock_user):
+    """Test that endpoint streams answer tokens, then sources, then the saved message."""
+    chat_id = uuid4()
+    repo_id = uuid4()
+    saved_answer = DomainMessage(
+        id=uuid4(),
+        role="assistant",
+        content="test answer",
+        created_at=datetime.now()
+    )
+    sources = [DomainSource(title="README.md", url="https://test.com/readme", quote="quote")]
+
+    async def events():
+        yield AnswerChunk(content="test ")
+        yield AnswerChunk(content="answer")
+        yield AnswerChunk(sources=sources)
+        yield saved_answer
+
+    mock_chat_service.stream_question.return_value = events()
+
+    payload = {
+        "repo_ids": [str(repo_id)],
+        "message": {
+            "content": "test_question"
+        }
+    }
+    response = await ac.post(f"{BASE_URL}/{chat_id}/message/stream", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    mock_chat_service.stream_question.assert_called_once_with(
+        user_id=mock_user.id,
+        chat_id=chat_id,
+        repo_ids=[repo_id],
+        question="test_question"
+    )
+
+    events = [
+        (block.split("\n")[0], json.loads(block.split("\n")[1].removeprefix("data: ")))
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert events == [
+        ("event: token", {"content": "test "}),
+        ("event: token", {"content": "answer"}),
+        ("event: sources", [
+            {"title": "README.md", "url": "https://test.com/readme", "quote": "quote"}
+        ]),
+        ("event: message", json.loads(
+            MessageResponse.model_validate(saved_answer).model_dump_json()
+        )),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_message_stream_no_access(ac, mock_chat_service):
+    """Test that endpoint returns an error instead of a stream when access is denied."""
+    mock_chat_service.stream_question.side_effect = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Chat not found"
+    )
+
+    payload = {
+        "repo_ids": [str(uuid4())],
+        "message": {
+            "content": "test_question"
+        }
+    }
+    response = await ac.post(f"{BASE_URL}/{uuid4()}/message/stream", json=payload)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -6,6 +6,7 @@ import pytest_asyncio
 from dishka import Provider, Scope, make_async_container
 from dishka.integrations.fastapi import setup_dishka
 from httpx import ASGITransport, AsyncClient
+from pydantic import SecretStr
 
 from src.api.dependencies import get_current_user
 from src.application.services.index_service import IndexService
@@ -126,3 +127,69 @@ async def test_list_gitlab_repositories_empty(ac, mock_index_service):
 
     assert response.status_code == 200
     assert response.json() == []
+
+
+@pytest.fixture
+def webhook_secret(mocker):
+    """Set webhook's secret token."""
+    mocker.patch(
+        "src.api.dependencies.settings.GITLAB_WEBHOOK_SECRET",
+        SecretStr("hook-secret")
+    )
+
+
+@pytest.mark.asyncio
+async def test_receive_gitlab_webhook(ac, mock_index_service, webhook_secret):
+    """Test that endpoint passes verified event to service."""
+    mock_index_service.receive_webhook.return_value = {
+        "status": "ok",
+        "message": "Push is queued for indexing."
+    }
+    payload = {
+        "object_kind": "push",
+        "ref": "refs/heads/main",
+        "before": "1" * 40,
+        "after": "2" * 40,
+        "project": {"id": 42, "default_branch": "main"},
+        "commits": [{"added": [], "modified": ["src/a.py"], "removed": []}],
+        "total_commits_count": 1
+    }
+
+    response = await ac.post(
+        f"{BASE_URL}/webhook",
+        json=payload,
+        headers={"X-Gitlab-Token": "hook-secret", "X-Gitlab-Event": "Push Hook"}
+    )
+
+    assert response.status_code == 202
+    event = mock_index_service.receive_webhook.await_args.kwargs["event"]
+    assert event.project.id == 42
+    assert event.commits[0].modified == ["src/a.py"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [{}, {"X-Gitlab-Token": "wrong"}])
+async def test_receive_gitlab_webhook_invalid_token(
+        ac,
+        mock_index_service,
+        webhook_secret,
+        headers
+):
+    """Test that event with invalid secret token is rejected before its body is validated."""
+    response = await ac.post(f"{BASE_URL}/webhook", content=b"not an event", headers=headers)
+
+    assert response.status_code == 401
+    mock_index_service.receive_webhook.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_receive_gitlab_webhook_invalid_event(ac, mock_index_service, webhook_secret):
+    """Test that verified but malformed event is rejected with validation errors."""
+    response = await ac.post(
+        f"{BASE_URL}/webhook",
+        json={"object_kind": "push"},
+        headers={"X-Gitlab-Token": "hook-secret"}
+    )
+
+    assert response.status_code == 422
+    mock_index_service.receive_webhook.assert_not_awaited()
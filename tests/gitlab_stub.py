@@ -0,0 +1,60 @@
+"""Stub of GitLab's projects listing, shared by tests and benchmarks."""
+import asyncio
+from typing import List, Optional
+
+import httpx
+
+BASE_URL = "https://gitlab.example.com"
+TOKEN = "glpat-secret" # noqa: S105
+
+
+def make_transport(
+        total: int,
+        with_total: bool = True,
+        latency: float = 0,
+        status_code: int = 200,
+        requested: Optional[List[int]] = None,
+        in_flight: Optional[List[int]] = None,
+        failed_page: Optional[int] = None,
+        total_header: Optional[str] = None
+) -> httpx.MockTransport:
+    """Create transport answering like GitLab's projects listing of total projects."""
+    current = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal current
+        if request.headers.get("PRIVATE-TOKEN") != TOKEN:
+            return httpx.Response(401)
+        if status_code != 200:
+            return httpx.Response(status_code)
+
+        page = int(request.url.params["page"])
+        if page == failed_page:
+            return httpx.Response(500)
+        if requested is not None:
+            requested.append(page)
+
+        current += 1
+        if in_flight is not None:
+            in_flight.append(current)
+        await asyncio.sleep(latency)
+        current -= 1
+
+        per_page = int(request.url.params["per_page"])
+        pages = (total + per_page - 1) // per_page
+        start = (page - 1) * per_page
+        projects = [
+            {
+                "id": i,
+                "name": f"project-{i}",
+                "path_with_namespace": f"group/project-{i}",
+                "web_url": f"{BASE_URL}/group/project-{i}",
+            }
+            for i in range(start + 1, min(start + per_page, total) + 1)
+        ]
+        headers = {"X-Next-Page": str(page + 1) if page < pages else ""}
+        if with_total:
+            headers["X-Total-Pages"] = total_header or str(pages)
+        return httpx.Response(200, json=projects, headers=headers)
+
+    return httpx.MockTransport(handler)
@@ -3,11 +3,14 @@ from uuid import uuid4
 import pytest
 import pytest_asyncio
 from pydantic import UUID4
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.models.chat import Chat as DomainChat
+from src.domain.models.chat import Chat as DomainChat, MessageCursor
 from src.domain.models.user import User as DomainUser
+from src.infrastructure.cache.memory import ChatOwnerCache
 from src.infrastructure.db.repositories.sqlalchemy_chat_repo import SqlAlchemyChatRepository
 from src.infrastructure.db.repositories.sqlalchemy_user_repo import SqlAlchemyUserRepository
+from src.infrastructure.db.unit_of_work import ChatUnitOfWork
 
 
 @pytest.fixture(scope="function")
@@ -51,7 +54,7 @@ async def user_factory(user_repo):
             hashed_password=hashed_password
         )
 
-        return await user_repo.create(new_user_data)
+        return await user_repo.create_if_unique(new_user_data)
 
     return _create_user
 
@@ -121,6 +124,24 @@ async def test_get_user_chats_success(chat_factory, chat_repo, test_user, n_chat
         assert all_chats[ind].title == f"test_title_{n_chats}"
 
 
+@pytest.mark.asyncio
+async def test_get_user_chats_message_aggregates(chat_repo, chat_factory, test_user):
+    """Test that User's Chats are returned with message count and last activity time."""
+    empty_chat = await chat_factory(owner_id=test_user.id)
+    chat = await chat_factory(owner_id=test_user.id)
+
+    await chat_repo.add_message(chat.id, "user", "question1")
+    last_message = await chat_repo.add_message(chat.id, "assistant", "answer1")
+
+    all_chats = {item.id: item for item in await chat_repo.get_user_chats(test_user.id)}
+
+    assert all_chats[chat.id].message_count == 2
+    assert all_chats[chat.id].last_activity_at == last_message.created_at
+    assert all_chats[empty_chat.id].message_count == 0
+    assert all_chats[empty_chat.id].last_activity_at == empty_chat.created_at
+    assert not hasattr(all_chats[chat.id], "messages")
+
+
 @pytest.mark.asyncio
 async def test_get_user_chats_empty_chat_list(chat_repo, test_user):
     """Test that an empty list will be returned when there is no Chats."""
@@ -150,6 +171,42 @@ async def test_add_message_success(chat_repo, chat_factory, test_user):
     assert message.sources == []
 
 
+@pytest.mark.asyncio
+async def test_add_messages_success(chat_repo, chat_factory, test_user):
+    """Test that several Messages are added at once and returned in the given order."""
+    chat = await chat_factory(owner_id=test_user.id)
+    sources = [{"title": "README.md", "url": "https://test.com/readme", "quote": "test_quote"}]
+
+    question, answer = await chat_repo.add_messages(
+        chat_id=chat.id,
+        messages=[
+            {"role": "user", "content": "question1"},
+            {"role": "assistant", "content": "answer1", "sources": sources},
+        ]
+    )
+
+    assert question.id is not None
+    assert question.role == "user"
+    assert question.content == "question1"
+    assert question.sources is None
+    assert answer.role == "assistant"
+    assert answer.content == "answer1"
+    assert str(answer.sources[0].url) == "https://test.com/readme"
+    assert answer.created_at > question.created_at
+
+    full_chat = await chat_repo.get_chat_full(chat.id)
+
+    assert [msg.id for msg in full_chat.messages] == [question.id, answer.id]
+
+
+@pytest.mark.asyncio
+async def test_add_messages_empty(chat_repo, chat_factory, test_user):
+    """Test that nothing is added when there are no Messages."""
+    chat = await chat_factory(owner_id=test_user.id)
+
+    assert await chat_repo.add_messages(chat.id, []) == []
+
+
 @pytest.mark.asyncio
 async def test_get_chat_full_success(chat_repo, chat_factory, test_user):
     """Test that Message is added and can be extracted from Chat history."""
@@ -171,9 +228,105 @@ async def test_get_chat_full_success(chat_repo, chat_factory, test_user):
     assert full_chat.messages[1].content == "answer1"
 
 
+@pytest.mark.asyncio
+async def test_get_chat_without_messages(chat_repo, chat_factory, test_user):
+    """Test that Chat is extracted without its Messages."""
+    chat = await chat_factory(owner_id=test_user.id)
+    await chat_repo.add_message(chat.id, "user", "question1")
+
+    result = await chat_repo.get_chat(chat.id)
+
+    assert result.id == chat.id
+    assert result.owner_id == test_user.id
+    assert result.messages is None
+
+
+@pytest.mark.asyncio
+async def test_get_chat_messages_pages(chat_repo, chat_factory, test_user):
+    """Test that Chat history can be walked from the latest page to the oldest one."""
+    chat = await chat_factory(owner_id=test_user.id)
+    for ind in range(5):
+        await chat_repo.add_message(chat.id, "user", f"message{ind}")
+
+    latest = await chat_repo.get_chat_messages(chat.id, limit=2)
+
+    assert [msg.content for msg in latest] == ["message3", "message4"]
+
+    cursor = MessageCursor(created_at=latest[0].created_at, id=latest[0].id)
+    older = await chat_repo.get_chat_messages(chat.id, limit=2, before=cursor)
+
+    assert [msg.content for msg in older] == ["message1", "message2"]
+
+    cursor = MessageCursor(created_at=older[0].created_at, id=older[0].id)
+    oldest = await chat_repo.get_chat_messages(chat.id, limit=2, before=cursor)
+
+    assert [msg.content for msg in oldest] == ["message0"]
+
+
+@pytest.mark.asyncio
+async def test_get_chat_messages_other_chat(chat_repo, chat_factory, test_user):
+    """Test that Messages of other Chats are not returned."""
+    chat = await chat_factory(owner_id=test_user.id)
+    other_chat = await chat_factory(owner_id=test_user.id)
+    await chat_repo.add_message(other_chat.id, "user", "question1")
+
+    result = await chat_repo.get_chat_messages(chat.id, limit=10)
+
+    assert result == []
+
+
+@pytest.mark.asyncio
+async def test_get_chat_owner_success(chat_repo, chat_factory, test_user):
+    """Test that owner of an existing Chat is returned."""
+    chat = await chat_factory(owner_id=test_user.id)
+
+    assert await chat_repo.get_chat_owner(chat.id) == test_user.id
+
+
+@pytest.mark.asyncio
+async def test_get_chat_owner_chat_not_found(chat_repo):
+    """Test that None is returned for an unexisting Chat."""
+    assert await chat_repo.get_chat_owner(uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_get_chat_owner_cached(session, chat_factory, test_user):
+    """Test that owner is cached after the first check and served from cache later."""
+    owner_cache = ChatOwnerCache(maxsize=10, ttl=60)
+    chat_repo = SqlAlchemyChatRepository(session, owner_cache=owner_cache)
+    chat = await chat_factory(owner_id=test_user.id)
+
+    assert await chat_repo.get_chat_owner(chat.id) == test_user.id
+    assert owner_cache.get(chat.id) == test_user.id
+
+    cached_owner_id = uuid4()
+    owner_cache.set(chat.id, cached_owner_id)
+
+    assert await chat_repo.get_chat_owner(chat.id) == cached_owner_id
+
+
 @pytest.mark.asyncio
 async def test_get_chat_full_chat_not_found(chat_repo):
     """Test that nothing can be extracted from an unexisting Chat."""
     result = await chat_repo.get_chat_full(uuid4())
 
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_chat_unit_of_work_commits(db_engine, session, chat_factory, test_user):
+    """Test that Messages added in a unit of work are committed on its exit."""
+    chat = await chat_factory(owner_id=test_user.id)
+    await session.commit()
+    chat_unit_of_work = ChatUnitOfWork(engine=db_engine)
+
+    async with chat_unit_of_work() as chat_repo:
+        await chat_repo.add_messages(
+            chat_id=chat.id,
+            messages=[{"role": "user", "content": "question1"}]
+        )
+
+    async with AsyncSession(bind=db_engine) as other_session:
+        full_chat = await SqlAlchemyChatRepository(other_session).get_chat_full(chat.id)
+
+    assert [msg.content for msg in full_chat.messages] == ["question1"]
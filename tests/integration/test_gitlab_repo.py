@@ -1,6 +1,9 @@
 
+from unittest.mock import AsyncMock
+
 import pytest
 
+from src.infrastructure.db.after_commit import commit
 from src.infrastructure.db.repositories.sqlalchemy_gitlab_repo import SqlAlchemyGitLabRepository
 
 
@@ -64,3 +67,16 @@ async def test_get_config_not_found(gitlab_repo):
     """Test that service returns None if config isn't configured yet."""
     result = await gitlab_repo.get_config()
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_save_config_invalidates_holder_after_commit(session):
+    """Test that config held decrypted is dropped only once the new one is committed."""
+    mock_holder = AsyncMock()
+    gitlab_repo = SqlAlchemyGitLabRepository(session, config_holder=mock_holder)
+
+    await gitlab_repo.save_config("https://gitlab.com/", "encrypted_token_123")
+    mock_holder.invalidate.assert_not_awaited()
+
+    await commit(session)
+    mock_holder.invalidate.assert_awaited_once()
@@ -1,8 +1,10 @@
+from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
 
 from src.domain.models.user import Role as DomainRole
+from src.infrastructure.db.after_commit import commit
 from src.infrastructure.db.repositories.sqlalchemy_role_repo import SqlAlchemyRoleRepository
 
 
@@ -99,3 +101,18 @@ async def test_get_all_roles_empty(role_repo):
     all_roles = await role_repo.get_all_roles()
 
     assert all_roles == []
+
+
+@pytest.mark.asyncio
+async def test_create_role_published_after_commit(session):
+    """Test that created Role is sent to permission checks only once it's committed."""
+    mock_role_sync = AsyncMock()
+    role_repo = SqlAlchemyRoleRepository(session, role_sync=mock_role_sync)
+
+    created_role = await role_repo.create(
+        DomainRole(id=uuid4(), name="auditor", permissions=["chat:read"])
+    )
+    mock_role_sync.publish.assert_not_awaited()
+
+    await commit(session)
+    mock_role_sync.publish.assert_awaited_once_with(created_role)
@@ -3,7 +3,10 @@ from uuid import uuid4
 import pytest
 import pytest_asyncio
 
-from src.domain.models.user import User as DomainUser
+from src.domain.models.user import User as DomainUser, UserCursor, UserFilter
+from src.infrastructure.cache.memory import UserCache
+from src.infrastructure.cache.principal_cache import PrincipalCache
+from src.infrastructure.db.after_commit import commit
 from src.infrastructure.db.repositories.sqlalchemy_user_repo import SqlAlchemyUserRepository
 
 
@@ -42,7 +45,7 @@ async def user_factory(repo):
             hashed_password=hashed_password
         )
 
-        return await repo.create(new_user_data)
+        return await repo.create_if_unique(new_user_data)
 
     return _create_user
 
@@ -93,30 +96,6 @@ async def test_create_the_same_username_twice(repo, user_factory):
     assert second_user is None
 
 
-@pytest.mark.asyncio
-async def test_create_and_get_user_by_email_success(repo, user_factory):
-    """Test that existing User can be extracted by email."""
-    created_user = await user_factory(email="integ@test.com")
-
-    assert created_user.id is not None
-
-    fetched_user = await repo.get_by_email("integ@test.com")
-
-    assert fetched_user == created_user
-
-
-@pytest.mark.asyncio
-async def test_create_and_get_user_by_email_not_found(repo, user_factory):
-    """Test that User cannot be extracted by email if it doesnt exist."""
-    created_user = await user_factory()
-
-    assert created_user.id is not None
-
-    fetched_user = await repo.get_by_email("ghost@test.com")
-
-    assert fetched_user is None
-
-
 @pytest.mark.asyncio
 async def test_create_and_get_user_by_username_success(repo, user_factory):
     """Test that existing User can be extracted by username."""
@@ -167,7 +146,7 @@ async def test_create_and_get_user_by_id_not_found(repo, user_factory):
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize("n_users", [1, 2, 3])
-async def test_create_and_get_all_users_success(repo, user_factory, n_users):
+async def test_create_and_stream_all_users_success(repo, user_factory, n_users):
     """Test that all existing Users can be extracted."""
     created_users = []
     for _ in range(n_users):
@@ -175,15 +154,15 @@ async def test_create_and_get_all_users_success(repo, user_factory, n_users):
             await user_factory()
         )
 
-    result = await repo.get_all_users()
+    result = [user async for user in repo.stream_users(UserFilter())]
 
-    assert result == created_users
+    assert result == sorted(created_users, key=lambda user: user.username)
 
 
 @pytest.mark.asyncio
-async def test_create_and_get_all_users_empty(repo):
-    """Test that an empty list is returned if there are no Users."""
-    result = await repo.get_all_users()
+async def test_create_and_stream_all_users_empty(repo):
+    """Test that nothing is streamed if there are no Users."""
+    result = [user async for user in repo.stream_users(UserFilter())]
 
     assert result == []
 
@@ -246,3 +225,120 @@ async def test_update_user_value_already_used(repo, user_factory):
     updated_user = await repo.update(update_data)
 
     assert updated_user is None
+
+
+@pytest.mark.asyncio
+async def test_get_principal_cached(session, user_factory):
+    """Test that principal is cached without password hash after the first lookup."""
+    principal_cache = PrincipalCache(UserCache(maxsize=10, ttl=60))
+    cached_repo = SqlAlchemyUserRepository(session, principal_cache=principal_cache)
+    created_user = await user_factory()
+
+    principal = await cached_repo.get_principal(created_user.id)
+
+    assert principal.username == created_user.username
+    assert not hasattr(principal, "hashed_password")
+    assert await principal_cache.get(created_user.id) == principal
+
+
+@pytest.mark.asyncio
+async def test_update_user_invalidates_principal(session, user_factory):
+    """Test that updating user drops their cached principal."""
+    principal_cache = PrincipalCache(UserCache(maxsize=10, ttl=60))
+    cached_repo = SqlAlchemyUserRepository(session, principal_cache=principal_cache)
+    created_user = await user_factory()
+    await cached_repo.get_principal(created_user.id)
+
+    await cached_repo.update(created_user.model_copy(update={"role": "admin"}))
+    assert await principal_cache.get(created_user.id) is not None
+
+    await commit(session)
+
+    assert await principal_cache.get(created_user.id) is None
+    assert (await cached_repo.get_principal(created_user.id)).role == "admin"
+
+
+@pytest.mark.asyncio
+async def test_create_if_unique_success(repo):
+    """Test that User is created by one statement if username and email are free."""
+    new_user = DomainUser(
+        id=uuid4(),
+        username="unique_username",
+        email="unique@test.com",
+        role="user",
+        hashed_password="hash"
+    )
+
+    created_user = await repo.create_if_unique(new_user)
+
+    assert created_user.username == new_user.username
+    assert await repo.get_by_id(created_user.id) == created_user
+
+
+@pytest.mark.asyncio
+async def test_create_if_unique_conflict(repo, user_factory):
+    """Test that User isn't created if username or email is taken, and which one is told."""
+    existing_user = await user_factory()
+
+    same_username = DomainUser(
+        id=uuid4(),
+        username=existing_user.username,
+        email="other@test.com",
+        hashed_password="hash"
+    )
+    same_email = DomainUser(
+        id=uuid4(),
+        username="other_username",
+        email=existing_user.email,
+        hashed_password="hash"
+    )
+
+    assert await repo.create_if_unique(same_username) is None
+    assert await repo.create_if_unique(same_email) is None
+    assert await repo.get_taken_field(same_username.username, same_username.email) == "username"
+    assert await repo.get_taken_field(same_email.username, same_email.email) == "email"
+    assert await repo.get_taken_field("free_username", "free@test.com") is None
+
+
+@pytest.mark.asyncio
+async def test_get_users_keyset_pages(repo, user_factory):
+    """Test that pages follow each other by username without gaps or repeats."""
+    for name in ["carol", "alice", "bob", "dave"]:
+        await user_factory(username=name, email=f"{name}@test.com")
+
+    first_page = await repo.get_users(limit=2, filters=UserFilter())
+    second_page = await repo.get_users(
+        limit=2,
+        filters=UserFilter(),
+        after=UserCursor(username=first_page[-1].username)
+    )
+
+    assert [user.username for user in first_page] == ["alice", "bob"]
+    assert [user.username for user in second_page] == ["carol", "dave"]
+
+
+@pytest.mark.asyncio
+async def test_get_users_filters(repo, user_factory):
+    """Test that users are filtered by role and username prefix, with wildcards escaped."""
+    await user_factory(username="admin_anna", email="anna@test.com", role="admin")
+    await user_factory(username="admin_bob", email="bob@test.com", role="user")
+    await user_factory(username="adminXcarl", email="carl@test.com", role="admin")
+
+    admins = await repo.get_users(limit=10, filters=UserFilter(role="admin"))
+    prefixed = await repo.get_users(limit=10, filters=UserFilter(username_prefix="admin_"))
+
+    assert [user.username for user in admins] == ["admin_anna", "adminXcarl"]
+    assert [user.username for user in prefixed] == ["admin_anna", "admin_bob"]
+
+
+@pytest.mark.asyncio
+async def test_stream_users(repo, user_factory):
+    """Test that all matching users are streamed by username."""
+    for name in ["carol", "alice", "bob"]:
+        await user_factory(username=name, email=f"{name}@test.com")
+
+    streamed = [user async for user in repo.stream_users(UserFilter(username_prefix="b"))]
+    all_streamed = [user async for user in repo.stream_users(UserFilter())]
+
+    assert [user.username for user in streamed] == ["bob"]
+    assert [user.username for user in all_streamed] == ["alice", "bob", "carol"]
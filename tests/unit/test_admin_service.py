@@ -6,7 +6,7 @@ from fastapi import HTTPException
 
 from src.api.schemas.admin import RoleCreate
 from src.application.services.admin_service import AdminService
-from src.domain.models.user import Role as DomainRole, User as DomainUser
+from src.domain.models.user import Role as DomainRole, User as DomainUser, UserCursor, UserFilter
 
 
 @pytest.fixture(scope="function")
@@ -21,49 +21,6 @@ def mock_role_repo():
     return AsyncMock()
 
 
-@pytest.mark.asyncio
-async def test_get_all_users_not_empty(mock_user_repo, mock_role_repo):
-    """Test that service returns list of Users when db contains valid data."""
-    existing_users = [
-        DomainUser(
-            id=uuid4(),
-            username="test1",
-            email="test1@test.com",
-            role="user",
-            hashed_password="..."
-        ),
-        DomainUser(
-            id=uuid4(),
-            username="test2",
-            email="test2@test.com",
-            role="user",
-            hashed_password="..."
-        )
-    ]
-
-    mock_user_repo.get_all_users.return_value = existing_users
-    service = AdminService(user_repo=mock_user_repo, role_repo=mock_role_repo)
-
-    result = await service.get_all_users()
-
-    mock_user_repo.get_all_users.assert_called_once()
-    assert result == existing_users
-
-
-@pytest.mark.asyncio
-async def test_get_all_users_empty(mock_user_repo, mock_role_repo):
-    """Test that service returns empty list when db is empty."""
-    mock_user_repo.get_all_users.return_value = []
-
-    mock_user_repo.get_all_users.return_value = []
-    service = AdminService(user_repo=mock_user_repo, role_repo=mock_role_repo)
-
-    result = await service.get_all_users()
-
-    mock_user_repo.get_all_users.assert_called_once()
-    assert result == []
-
-
 @pytest.mark.asyncio
 async def test_get_all_roles_not_empty(mock_user_repo, mock_role_repo):
     """Test that service returns list of Roles when db contains valid data."""
@@ -107,9 +64,9 @@ async def test_update_user_role_success(mock_user_repo, mock_role_repo):
     )
     mock_user_repo.get_by_id.return_value = existing_user
 
-    role_name = "admin"
+    role_name = "auditor"
     mock_role_repo.get_by_name.return_value = DomainRole(
-        id=uuid4(), name="admin", permissions=[]
+        id=uuid4(), name="auditor", permissions=[]
     )
 
     existing_user = existing_user.model_copy(update={"role": role_name})
@@ -127,6 +84,27 @@ async def test_update_user_role_success(mock_user_repo, mock_role_repo):
     assert result.role == role_name
 
 
+@pytest.mark.asyncio
+async def test_update_user_role_built_in(mock_user_repo, mock_role_repo):
+    """Test that built-in Role is given without looking it up in db."""
+    existing_user = DomainUser(
+        id=uuid4(),
+        username="test",
+        email="test@test.com",
+        role="user",
+        hashed_password="..."
+    )
+    mock_user_repo.get_by_id.return_value = existing_user
+    mock_user_repo.update.side_effect = lambda user: user
+
+    service = AdminService(user_repo=mock_user_repo, role_repo=mock_role_repo)
+
+    result = await service.update_user_role(existing_user.id, "admin")
+
+    mock_role_repo.get_by_name.assert_not_called()
+    assert result.role == "admin"
+
+
 @pytest.mark.asyncio
 async def test_update_user_role_user_doesnt_exist(mock_user_repo, mock_role_repo):
     """Test that service doesn't update Role when User doesn't exist."""
@@ -161,7 +139,7 @@ async def test_update_user_role_role_doesnt_exist(mock_user_repo, mock_role_repo
 
     service = AdminService(user_repo=mock_user_repo, role_repo=mock_role_repo)
 
-    role_name = "admin"
+    role_name = "auditor"
     with pytest.raises(HTTPException) as exc:
         await service.update_user_role(user_id, role_name)
 
@@ -180,7 +158,7 @@ async def test_create_new_role_success(
     mocker
 ):
     """Test that new Role is created when there is valid data."""
-    role_name = "admin"
+    role_name = "auditor"
     permissions = ["read:repo:project_x", "chat:use"]
     fixed_uuid = uuid4()
     new_role = DomainRole(
@@ -214,7 +192,7 @@ async def test_create_new_role_role_already_exists(
     mock_role_repo
 ):
     """Test that new Role isn't created when the same Role already exists."""
-    role_name = "admin"
+    role_name = "auditor"
     permissions = ["read:repo:project_x", "chat:use"]
 
     mock_role_repo.get_by_name.return_value = DomainRole(
@@ -239,13 +217,26 @@ async def test_create_new_role_role_already_exists(
     assert "Role already exists" in exc.value.detail
 
 
+@pytest.mark.asyncio
+async def test_create_new_role_built_in(mock_user_repo, mock_role_repo):
+    """Test that Role named as a built-in one isn't created."""
+    service = AdminService(user_repo=mock_user_repo, role_repo=mock_role_repo)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.create_new_role(RoleCreate(name="user", permissions=["admin:access"]))
+
+    mock_role_repo.create.assert_not_called()
+    assert exc.value.status_code == 400
+    assert "Built-in role" in exc.value.detail
+
+
 @pytest.mark.asyncio
 async def test_create_new_role_error(
     mock_user_repo,
     mock_role_repo
 ):
     """Test that new Role isn't created when there is an error."""
-    role_name = "admin"
+    role_name = "auditor"
     permissions = ["read:repo:project_x", "chat:use"]
 
     mock_role_repo.get_by_name.return_value = None
@@ -266,3 +257,56 @@ async def test_create_new_role_error(
     mock_role_repo.create.assert_called_once()
     assert exc.value.status_code == 400
     assert "Error creating a new role" in exc.value.detail
+
+
+def make_users(count):
+    """Create Users with ordered usernames."""
+    return [
+        DomainUser(
+            id=uuid4(),
+            username=f"user{i:02}",
+            email=f"user{i}@test.com",
+            hashed_password="..."
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_users_page_with_next(mock_user_repo, mock_role_repo):
+    """Test that full page has cursor after its last user."""
+    mock_user_repo.get_users.return_value = make_users(3)
+    filters = UserFilter(role="user")
+    service = AdminService(user_repo=mock_user_repo, role_repo=mock_role_repo)
+
+    page = await service.get_users_page(filters=filters, limit=2)
+
+    mock_user_repo.get_users.assert_called_once_with(limit=3, filters=filters, after=None)
+    assert [user.username for user in page.users] == ["user00", "user01"]
+    assert UserCursor.decode(page.next_cursor).username == "user01"
+
+
+@pytest.mark.asyncio
+async def test_get_users_page_last(mock_user_repo, mock_role_repo):
+    """Test that the last page has no cursor and cursor is passed to repository."""
+    mock_user_repo.get_users.return_value = make_users(1)
+    after = UserCursor(username="user00").encode()
+    service = AdminService(user_repo=mock_user_repo, role_repo=mock_role_repo)
+
+    page = await service.get_users_page(filters=UserFilter(), limit=2, after=after)
+
+    assert mock_user_repo.get_users.call_args.kwargs["after"] == UserCursor(username="user00")
+    assert len(page.users) == 1
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_users_page_invalid_cursor(mock_user_repo, mock_role_repo):
+    """Test that malformed cursor is rejected."""
+    service = AdminService(user_repo=mock_user_repo, role_repo=mock_role_repo)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.get_users_page(filters=UserFilter(), after="not-a-cursor")
+
+    assert exc.value.status_code == 400
+    mock_user_repo.get_users.assert_not_called()
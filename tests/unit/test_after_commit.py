@@ -0,0 +1,43 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.infrastructure.db.after_commit import call_after_commit, commit
+
+
+@pytest.fixture(scope="function")
+def mock_session():
+    """Create mock for session recording the order of commit and callbacks."""
+    session = MagicMock()
+    session.info = {}
+    session.calls = []
+    session.commit = AsyncMock(side_effect=lambda: session.calls.append("commit"))
+    return session
+
+
+@pytest.mark.asyncio
+async def test_callbacks_run_after_commit(mock_session):
+    """Test that callbacks are awaited once, after the changes are committed."""
+    async def callback():
+        mock_session.calls.append("callback")
+
+    call_after_commit(mock_session, callback)
+    assert mock_session.calls == []
+
+    await commit(mock_session)
+    await commit(mock_session)
+
+    assert mock_session.calls == ["commit", "callback", "commit"]
+
+
+@pytest.mark.asyncio
+async def test_failed_callback_is_logged(mock_session):
+    """Test that failed callback neither fails the commit nor stops other callbacks."""
+    failing, other = AsyncMock(side_effect=RuntimeError("down")), AsyncMock()
+    call_after_commit(mock_session, failing)
+    call_after_commit(mock_session, other)
+
+    await commit(mock_session)
+
+    failing.assert_awaited_once()
+    other.assert_awaited_once()
@@ -7,6 +7,8 @@ from fastapi import HTTPException
 from src.api.schemas.auth import UserRegistration
 from src.application.services.auth_service import AuthService
 from src.domain.models.user import User as DomainUser
+from src.infrastructure.security.jwt import create_access_token, decode_access_token
+from src.infrastructure.security.password import PasswordHasher
 
 
 @pytest.fixture(scope="function")
@@ -15,16 +17,28 @@ def mock_user_repo():
     return AsyncMock()
 
 
+@pytest.fixture(scope="function")
+def mock_revocations():
+    """Create AsyncMock for revocation list."""
+    return AsyncMock()
+
+
+@pytest.fixture(scope="function")
+def password_hasher():
+    """Create PasswordHasher with one worker."""
+    password_hasher = PasswordHasher(max_workers=1)
+    yield password_hasher
+    password_hasher.shutdown()
+
+
 @pytest.mark.asyncio
-async def test_register_new_user_success(mock_user_repo, mocker):
+async def test_register_new_user_success(mock_user_repo, password_hasher, mock_revocations, mocker):
     """Test that new service returns created User if username and email are unique."""
     fixed_uuid = str(uuid4())
     hashed_password = "test_hash"
     mocker.patch("passlib.context.CryptContext.hash", return_value=hashed_password)
     mocker.patch("src.infrastructure.db.models.base.uuid.uuid4", return_value=fixed_uuid)
 
-    mock_user_repo.get_by_username.return_value = None
-    mock_user_repo.get_by_email.return_value = None
     new_user = UserRegistration(
         username="test_username",
         email="test@test.com",
@@ -37,19 +51,21 @@ async def test_register_new_user_success(mock_user_repo, mocker):
         role="user",
         hashed_password=hashed_password
     )
-    mock_user_repo.create.return_value = created_user
+    mock_user_repo.get_taken_field.return_value = None
+    mock_user_repo.create_if_unique.return_value = created_user
 
-    service = AuthService(mock_user_repo)
+    service = AuthService(mock_user_repo, password_hasher, mock_revocations)
 
     result = await service.register_new_user(new_user)
 
-    mock_user_repo.get_by_username.assert_called_once_with("test_username")
-    mock_user_repo.get_by_email.assert_called_once_with("test@test.com")
+    mock_user_repo.create_if_unique.assert_called_once()
+    assert mock_user_repo.create_if_unique.call_args.args[0].hashed_password == hashed_password
+    mock_user_repo.get_taken_field.assert_called_once()
     assert result == created_user
 
 
 @pytest.mark.asyncio
-async def test_resgister_new_user_username_already_exist(mock_user_repo):
+async def test_resgister_new_user_username_already_exist(mock_user_repo, mock_revocations):
     """Test that new service raises error when user with the same username already exists."""
     new_user = UserRegistration(
         username="test_username",
@@ -57,27 +73,32 @@ async def test_resgister_new_user_username_already_exist(mock_user_repo):
         password="test_password"
     )
 
-    mock_user_repo.get_by_username.return_value = DomainUser(
-        id=str(uuid4()),
-        username="test_username",
-        email="different@test.com",
-        role="user",
-        hashed_password="test_hash"
-    )
+    mock_user_repo.get_taken_field.return_value = "username"
+    password_hasher = AsyncMock()
 
-    service = AuthService(mock_user_repo)
+    service = AuthService(mock_user_repo, password_hasher, mock_revocations)
 
     with pytest.raises(HTTPException) as exc:
         await service.register_new_user(new_user)
 
-    mock_user_repo.get_by_email.assert_not_called()
+    mock_user_repo.get_taken_field.assert_called_once_with(
+        username="test_username",
+        email="test@test.com"
+    )
+    # taken username is told without hashing the password
+    password_hasher.hash.assert_not_called()
+    mock_user_repo.create_if_unique.assert_not_called()
 
     assert exc.value.status_code == 400
     assert "Username is already registered" in exc.value.detail
 
 
 @pytest.mark.asyncio
-async def test_resgister_new_user_email_already_exist(mock_user_repo):
+async def test_resgister_new_user_email_already_exist(
+    mock_user_repo,
+    password_hasher,
+    mock_revocations
+):
     """Test that new service raises error when user with the same email already exists."""
     new_user = UserRegistration(
         username="test_username",
@@ -85,16 +106,11 @@ async def test_resgister_new_user_email_already_exist(mock_user_repo):
         password="test_password"
     )
 
-    mock_user_repo.get_by_username.return_value = None
-    mock_user_repo.get_by_email.return_value = DomainUser(
-        id=str(uuid4()),
-        username="different_username",
-        email="test@test.com",
-        role="user",
-        hashed_password="test_hash"
-    )
+    mock_user_repo.create_if_unique.return_value = None
+    # registered between the check and the insert
+    mock_user_repo.get_taken_field.side_effect = [None, "email"]
 
-    service = AuthService(mock_user_repo)
+    service = AuthService(mock_user_repo, password_hasher, mock_revocations)
 
     with pytest.raises(HTTPException) as exc:
         await service.register_new_user(new_user)
@@ -105,7 +121,7 @@ async def test_resgister_new_user_email_already_exist(mock_user_repo):
 
 
 @pytest.mark.asyncio
-async def test_resgister_new_user_error_create(mock_user_repo):
+async def test_resgister_new_user_error_create(mock_user_repo, password_hasher, mock_revocations):
     """Test that new service raises error when registration fails."""
     new_user = UserRegistration(
         username="test_username",
@@ -113,11 +129,10 @@ async def test_resgister_new_user_error_create(mock_user_repo):
         password="test_password"
     )
 
-    mock_user_repo.get_by_username.return_value = None
-    mock_user_repo.get_by_email.return_value = None
-    mock_user_repo.create.return_value = None
+    mock_user_repo.create_if_unique.return_value = None
+    mock_user_repo.get_taken_field.return_value = None
 
-    service = AuthService(mock_user_repo)
+    service = AuthService(mock_user_repo, password_hasher, mock_revocations)
 
     with pytest.raises(HTTPException) as exc:
         await service.register_new_user(new_user)
@@ -128,7 +143,7 @@ async def test_resgister_new_user_error_create(mock_user_repo):
 
 
 @pytest.mark.asyncio
-async def test_authenticate_user_success(mock_user_repo, mocker):
+async def test_authenticate_user_success(mock_user_repo, password_hasher, mock_revocations, mocker):
     """Test that new service returns token and its type when username and password are valid."""
     username = "test_username"
     password = "test_password"
@@ -144,7 +159,7 @@ async def test_authenticate_user_success(mock_user_repo, mocker):
     )
     mock_user_repo.get_by_username.return_value = user_in_db
 
-    service = AuthService(mock_user_repo)
+    service = AuthService(mock_user_repo, password_hasher, mock_revocations)
 
     result = await service.authenticate_user(
         username=username,
@@ -158,11 +173,11 @@ async def test_authenticate_user_success(mock_user_repo, mocker):
 
 
 @pytest.mark.asyncio
-async def test_authenticate_user_user_not_found(mock_user_repo):
+async def test_authenticate_user_user_not_found(mock_user_repo, password_hasher, mock_revocations):
     """Test that service raises error when User is not found."""
     mock_user_repo.get_by_username.return_value = None
 
-    service = AuthService(mock_user_repo)
+    service = AuthService(mock_user_repo, password_hasher, mock_revocations)
 
     with pytest.raises(HTTPException) as exc:
         await service.authenticate_user(
@@ -177,7 +192,12 @@ async def test_authenticate_user_user_not_found(mock_user_repo):
 
 
 @pytest.mark.asyncio
-async def test_authenticate_user_incorrect_password(mock_user_repo, mocker):
+async def test_authenticate_user_incorrect_password(
+    mock_user_repo,
+    password_hasher,
+    mock_revocations,
+    mocker
+):
     """Test that service raises error when password is not correct."""
     username = "test_username"
     password = "test_password"
@@ -193,7 +213,7 @@ async def test_authenticate_user_incorrect_password(mock_user_repo, mocker):
     )
     mock_user_repo.get_by_username.return_value = user_in_db
 
-    service = AuthService(mock_user_repo)
+    service = AuthService(mock_user_repo, password_hasher, mock_revocations)
 
     with pytest.raises(HTTPException) as exc:
         await service.authenticate_user(
@@ -205,3 +225,28 @@ async def test_authenticate_user_incorrect_password(mock_user_repo, mocker):
 
     assert exc.value.status_code == 401
     assert "Incorrect username or password" in exc.value.detail
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_success(mock_user_repo, password_hasher, mock_revocations):
+    """Test that token is revoked by its id until it expires."""
+    token = create_access_token({"sub": str(uuid4())})
+    payload = decode_access_token(token)
+
+    service = AuthService(mock_user_repo, password_hasher, mock_revocations)
+
+    await service.revoke_token(token)
+
+    mock_revocations.revoke.assert_awaited_once_with(payload["jti"], expires_at=payload["exp"])
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_invalid(mock_user_repo, password_hasher, mock_revocations):
+    """Test that invalid token can't be revoked."""
+    service = AuthService(mock_user_repo, password_hasher, mock_revocations)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.revoke_token("not a token")
+
+    assert exc.value.status_code == 401
+    mock_revocations.revoke.assert_not_called()
@@ -0,0 +1,37 @@
+from src.infrastructure.cache.bloom import BloomFilter
+
+
+def test_added_items_are_found():
+    """Test that filter has no false negatives."""
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    items = [f"item_{i}" for i in range(1000)]
+
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    assert len(bloom) == 1000
+
+
+def test_false_positive_rate():
+    """Test that false positive rate at capacity is close to the configured one."""
+    bloom = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"item_{i}")
+
+    false_positives = sum(f"other_{i}" in bloom for i in range(10_000))
+
+    assert false_positives < 200
+
+
+def test_saturation():
+    """Test that filter is saturated past its capacity."""
+    bloom = BloomFilter(capacity=2, false_positive_rate=0.01)
+    bloom.add("a")
+    bloom.add("b")
+
+    assert not bloom.is_saturated()
+
+    bloom.add("c")
+
+    assert bloom.is_saturated()
@@ -0,0 +1,94 @@
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import msgpack
+import pytest
+
+from src.domain.models.chat import Message, Source
+from src.infrastructure.cache.codecs import CacheEntry, JsonCodec, MsgpackCodec
+
+
+def make_entry(content="answer", sources=None, fresh_until=None):
+    """Create cache entry with assistant's Message."""
+    return CacheEntry(
+        query="How to run tests?",
+        fresh_until=fresh_until,
+        message=Message(
+            id=uuid4(),
+            role="assistant",
+            content=content,
+            created_at=datetime.now(timezone.utc),
+            sources=sources
+        )
+    )
+
+
+SOURCES = [
+    Source(title="README.md", url="https://gitlab.example.com/project/readme", quote="q" * 2000),
+    Source(title="main.py", url="https://gitlab.example.com/project/main.py", quote="run()"),
+]
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), MsgpackCodec()])
+@pytest.mark.parametrize("sources", [None, [], SOURCES])
+@pytest.mark.parametrize("fresh_until", [None, 1700000000.5])
+def test_round_trip(codec, sources, fresh_until):
+    """Test that decoded entry equals the encoded one."""
+    entry = make_entry(sources=sources, fresh_until=fresh_until)
+
+    decoded = codec.decode(codec.encode(entry))
+
+    assert decoded == entry
+    assert decoded.model_dump(mode="json") == entry.model_dump(mode="json")
+
+
+def test_msgpack_version_byte_and_compression():
+    """Test that small entries are stored raw and large ones compressed."""
+    codec = MsgpackCodec(compress_min_size=1024)
+
+    small = codec.encode(make_entry())
+    large = codec.encode(make_entry(content="a" * 10_000, sources=SOURCES))
+
+    assert small[0] == MsgpackCodec.RAW
+    assert large[0] == MsgpackCodec.COMPRESSED
+    assert len(large) < len(JsonCodec().encode(make_entry(content="a" * 10_000, sources=SOURCES)))
+
+
+def test_msgpack_reads_json_entries():
+    """Test that entries put by JSON codec stay readable."""
+    entry = make_entry(sources=SOURCES)
+
+    assert MsgpackCodec().decode(JsonCodec().encode(entry)) == entry
+
+
+@pytest.mark.parametrize("data", [b"", b"\x01garbage", b"\x02garbage", b'{"content": 1}'])
+def test_malformed_value(data):
+    """Test that malformed value raises ValueError."""
+    with pytest.raises(ValueError):
+        MsgpackCodec().decode(data)
+
+
+def test_msgpack_reads_entries_without_fresh_until():
+    """Test that entries put before soft TTL was introduced are read as never stale."""
+    entry = make_entry()
+    message = entry.message
+    payload = msgpack.packb([
+        entry.query,
+        message.id.bytes,
+        message.role.value,
+        message.content,
+        message.created_at.isoformat(),
+        None,
+    ])
+
+    decoded = MsgpackCodec().decode(bytes([MsgpackCodec.RAW]) + payload)
+
+    assert decoded == entry
+    assert not decoded.is_stale()
+
+
+def test_is_stale():
+    """Test that entry is stale after fresh_until."""
+    assert make_entry(fresh_until=time.time() - 1).is_stale()
+    assert not make_entry(fresh_until=time.time() + 60).is_stale()
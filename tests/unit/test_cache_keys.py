@@ -0,0 +1,62 @@
+from uuid import uuid4
+
+import pytest
+
+from src.infrastructure.cache.keys import (
+    ANSWER_KEY_PREFIX,
+    answer_cache_key,
+    canonicalize_query,
+    scope_of_key,
+)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("How to run tests?", "how to run tests"),
+        ("  How   to\trun\ntests  ", "how to run tests"),
+        ("HOW TO RUN TESTS?!", "how to run tests"),
+        ("Straße", "strasse"),
+        ("ｆｕｌｌ ｗｉｄｔｈ", "full width"),
+        ("what is `main.py`?", "what is `main.py`"),
+        ("...", ""),
+    ]
+)
+def test_canonicalize_query(query, expected):
+    """Test that trivially different phrasings are brought to one form."""
+    assert canonicalize_query(query) == expected
+
+
+def test_answer_cache_key_matches_phrasings():
+    """Test that equivalent phrasings and repositories' order give the same key."""
+    repo_ids = [uuid4(), uuid4()]
+
+    key = answer_cache_key("How to run tests?", repo_ids)
+
+    assert key == answer_cache_key("how to run   tests", list(reversed(repo_ids)))
+    assert key.startswith(f"{ANSWER_KEY_PREFIX}:")
+    assert len(key) == len(ANSWER_KEY_PREFIX) + 1 + 32 + 1 + 64
+
+
+def test_answer_cache_key_differs():
+    """Test that different queries or repositories give different keys."""
+    repo_ids = [uuid4()]
+
+    key = answer_cache_key("How to run tests?", repo_ids)
+
+    assert key != answer_cache_key("How to run linters?", repo_ids)
+    assert key != answer_cache_key("How to run tests?", [uuid4()])
+    assert len(answer_cache_key("x" * 10_000, repo_ids)) == len(key)
+
+
+def test_answer_cache_key_generations():
+    """Test that a new generation of any repository changes the key's scope."""
+    repo_ids = [uuid4(), uuid4()]
+
+    key = answer_cache_key("How to run tests?", repo_ids)
+    same = answer_cache_key("How to run tests?", repo_ids, {str(repo_ids[0]): 0})
+    reindexed = answer_cache_key("How to run tests?", repo_ids, {str(repo_ids[1]): 1})
+
+    assert key == same
+    assert scope_of_key(key) != scope_of_key(reindexed)
+    assert scope_of_key(key) == scope_of_key(answer_cache_key("Other?", repo_ids))
@@ -1,4 +1,6 @@
-from datetime import datetime
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 from unittest.mock import AsyncMock
 from uuid import uuid4
 
@@ -6,7 +8,14 @@ import pytest
 from fastapi import HTTPException
 
 from src.application.services.chat_service import ChatService
-from src.domain.models.chat import Chat as DomainChat, Message as DomainMessage
+from src.domain.models.chat import (
+    AnswerChunk,
+    Chat as DomainChat,
+    Message as DomainMessage,
+    MessageCursor,
+)
+from src.infrastructure.cache.single_flight import SingleFlight
+from src.infrastructure.external.llm_client import LLMClient
 
 
 @pytest.fixture(scope="function")
@@ -21,8 +30,14 @@ def mock_cache_repo():
     return AsyncMock()
 
 
+@pytest.fixture(scope="function")
+def llm_client():
+    """Create LLM service client."""
+    return LLMClient(base_url="http://llm")
+
+
 @pytest.mark.asyncio
-async def test_create_chat_success(mock_chat_repo, mock_cache_repo):
+async def test_create_chat_success(mock_chat_repo, mock_cache_repo, llm_client):
     """Test that Chat is created."""
     owner_id = uuid4()
     title = "test_title"
@@ -34,7 +49,7 @@ async def test_create_chat_success(mock_chat_repo, mock_cache_repo):
         created_at=create_time
     )
 
-    service = ChatService(mock_chat_repo, mock_cache_repo)
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
 
     result = await service.create_chat(owner_id, title)
 
@@ -48,7 +63,7 @@ async def test_create_chat_success(mock_chat_repo, mock_cache_repo):
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize("n_chats", [0, 1, 2])
-async def test_user_chats_success(mock_chat_repo, mock_cache_repo, n_chats):
+async def test_user_chats_success(mock_chat_repo, mock_cache_repo, n_chats, llm_client):
     """Test that all User's Chats are returned."""
     user_id = str(uuid4())
     mock_chat_repo.get_user_chats.return_value = [
@@ -60,7 +75,7 @@ async def test_user_chats_success(mock_chat_repo, mock_cache_repo, n_chats):
         )
     ] * n_chats
 
-    service = ChatService(mock_chat_repo, mock_cache_repo)
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
 
     result = await service.get_user_chats(user_id)
 
@@ -69,37 +84,120 @@ async def test_user_chats_success(mock_chat_repo, mock_cache_repo, n_chats):
     assert len(result) == n_chats
 
 
+def make_messages(n_messages):
+    """Create Messages in chronological order."""
+    start = datetime.now()
+    return [
+        DomainMessage(
+            id=uuid4(),
+            role="user",
+            content=f"test_content_{ind}",
+            created_at=start + timedelta(seconds=ind)
+        )
+        for ind in range(n_messages)
+    ]
+
+
 @pytest.mark.asyncio
-async def test_get_chat_history_success(mock_chat_repo, mock_cache_repo):
-    """Test that all Chat history is returned."""
+async def test_get_chat_history_success(mock_chat_repo, mock_cache_repo, llm_client):
+    """Test that the latest page of Chat history is returned."""
     user_id = uuid4()
     chat_id = uuid4()
     create_time = datetime.now()
-    mock_chat_repo.get_chat_full.return_value = DomainChat(
+    mock_chat_repo.get_chat.return_value = DomainChat(
         id=chat_id,
         title="test_title",
         owner_id=user_id,
         created_at=create_time
     )
+    messages = make_messages(2)
+    mock_chat_repo.get_chat_messages.return_value = messages
 
-    service = ChatService(mock_chat_repo, mock_cache_repo)
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
 
-    result = await service.get_chat_history(user_id=user_id, chat_id=chat_id)
+    result = await service.get_chat_history(user_id=user_id, chat_id=chat_id, limit=2)
 
-    mock_chat_repo.get_chat_full.assert_called_once_with(chat_id)
+    mock_chat_repo.get_chat.assert_called_once_with(chat_id)
+    mock_chat_repo.get_chat_messages.assert_called_once_with(
+        chat_id=chat_id, limit=3, before=None
+    )
+    mock_chat_repo.get_chat_full.assert_not_called()
 
     assert result.title == "test_title"
     assert result.owner_id == user_id
     assert result.created_at == create_time
-    assert result.messages is None
+    assert result.messages == messages
+    assert result.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_chat_history_has_older_page(mock_chat_repo, mock_cache_repo, llm_client):
+    """Test that the cursor to the oldest returned Message is set when there are older ones."""
+    user_id = uuid4()
+    chat_id = uuid4()
+    mock_chat_repo.get_chat.return_value = DomainChat(
+        id=chat_id,
+        title="test_title",
+        owner_id=user_id,
+        created_at=datetime.now()
+    )
+    messages = make_messages(3)
+    mock_chat_repo.get_chat_messages.return_value = messages
+
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
+
+    result = await service.get_chat_history(user_id=user_id, chat_id=chat_id, limit=2)
+
+    assert result.messages == messages[1:]
+    cursor = MessageCursor.decode(result.next_cursor)
+    assert cursor.id == messages[1].id
+    assert cursor.created_at == messages[1].created_at
+
+
+@pytest.mark.asyncio
+async def test_get_chat_history_with_cursor(mock_chat_repo, mock_cache_repo, llm_client):
+    """Test that the decoded cursor is passed to the repository."""
+    user_id = uuid4()
+    chat_id = uuid4()
+    mock_chat_repo.get_chat.return_value = DomainChat(
+        id=chat_id,
+        title="test_title",
+        owner_id=user_id,
+        created_at=datetime.now()
+    )
+    mock_chat_repo.get_chat_messages.return_value = []
+    cursor = MessageCursor(created_at=datetime.now(), id=uuid4())
+
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
+
+    await service.get_chat_history(
+        user_id=user_id, chat_id=chat_id, limit=10, before=cursor.encode()
+    )
+
+    mock_chat_repo.get_chat_messages.assert_called_once_with(
+        chat_id=chat_id, limit=11, before=cursor
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_chat_history_invalid_cursor(mock_chat_repo, mock_cache_repo, llm_client):
+    """Test that error is raised when the cursor is malformed."""
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.get_chat_history(user_id=uuid4(), chat_id=uuid4(), before="not-a-cursor")
+
+    mock_chat_repo.get_chat.assert_not_called()
+    assert exc.value.status_code == 400
+    assert "Invalid cursor" in exc.value.detail
 
 
 @pytest.mark.asyncio
-async def test_get_chat_history_chat_not_found(mock_chat_repo, mock_cache_repo):
+async def test_get_chat_history_chat_not_found(mock_chat_repo, mock_cache_repo, llm_client):
     """Test that error is raised when there is no Chat with specified chat_id."""
-    mock_chat_repo.get_chat_full.return_value = None
+    mock_chat_repo.get_chat.return_value = None
 
-    service = ChatService(mock_chat_repo, mock_cache_repo)
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
 
     with pytest.raises(HTTPException) as exc:
         await service.get_chat_history(user_id=uuid4(), chat_id=uuid4())
@@ -109,18 +207,18 @@ async def test_get_chat_history_chat_not_found(mock_chat_repo, mock_cache_repo):
 
 
 @pytest.mark.asyncio
-async def test_get_chat_history_user_is_not_chat_owner(mock_chat_repo, mock_cache_repo):
+async def test_get_chat_history_user_is_not_chat_owner(mock_chat_repo, mock_cache_repo, llm_client):
     """Test that error is raised when User doesn't own the exact Chat."""
     user_id = uuid4()
     chat_id = uuid4()
-    mock_chat_repo.get_chat_full.return_value = DomainChat(
+    mock_chat_repo.get_chat.return_value = DomainChat(
         id=chat_id,
         title="test_title",
         owner_id=user_id,
         created_at=datetime.now()
     )
 
-    service = ChatService(mock_chat_repo, mock_cache_repo)
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
 
     with pytest.raises(HTTPException) as exc:
         await service.get_chat_history(user_id=uuid4(), chat_id=chat_id)
@@ -130,20 +228,15 @@ async def test_get_chat_history_user_is_not_chat_owner(mock_chat_repo, mock_cach
 
 
 @pytest.mark.asyncio
-async def test_get_ask_question_success(mock_chat_repo, mock_cache_repo):
+async def test_get_ask_question_success(mock_chat_repo, mock_cache_repo, llm_client):
     """Test that new Messages are returned after QnA iteration."""
     user_id = uuid4()
     chat_id = uuid4()
-    mock_chat_repo.get_chat_full.return_value = DomainChat(
-        id=chat_id,
-        title="test_title",
-        owner_id=user_id,
-        created_at=datetime.now()
-    )
+    mock_chat_repo.get_chat_owner.return_value = user_id
 
     question = "test_question"
     answer = "test_llm_answer"
-    mock_chat_repo.add_message.side_effect = [
+    mock_chat_repo.add_messages.return_value = [
         DomainMessage(
             id=uuid4(),
             role="user",
@@ -157,7 +250,7 @@ async def test_get_ask_question_success(mock_chat_repo, mock_cache_repo):
             created_at=datetime.now()
         )
     ]
-    service = ChatService(mock_chat_repo, mock_cache_repo)
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
 
     result = await service.ask_question(
         user_id=user_id,
@@ -166,19 +259,67 @@ async def test_get_ask_question_success(mock_chat_repo, mock_cache_repo):
         question=question
     )
 
-    assert mock_chat_repo.add_message.call_count == 2
+    mock_chat_repo.get_chat_owner.assert_called_once_with(chat_id)
+    mock_chat_repo.get_chat_full.assert_not_called()
+    mock_chat_repo.add_message.assert_not_called()
+    mock_chat_repo.add_messages.assert_called_once()
+    saved_messages = mock_chat_repo.add_messages.call_args.kwargs["messages"]
+    assert [message["role"] for message in saved_messages] == ["user", "assistant"]
+    assert saved_messages[0]["content"] == question
     assert result.content == answer
     assert result.role == "assistant"
 
 
 @pytest.mark.asyncio
-async def test_get_ask_question_chat_not_found(mock_chat_repo, mock_cache_repo):
+async def test_ask_question_generates_answer_once(mock_chat_repo, mock_cache_repo):
+    """Test that answer is generated by LLM through cache's single-flight."""
+    user_id = uuid4()
+    repo_ids = [uuid4()]
+    mock_chat_repo.get_chat_owner.return_value = user_id
+    mock_chat_repo.add_messages.return_value = [None, None]
+    mock_cache_repo.construct_cache_key.return_value = "key"
+
+    async def get_or_generate(key, generate, query):
+        return await generate()
+
+    mock_cache_repo.get_or_generate.side_effect = get_or_generate
+
+    llm_client = AsyncMock()
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
+    service.llm_client.ask.return_value = DomainMessage(
+        id=uuid4(),
+        role="assistant",
+        content="test_llm_answer",
+        created_at=datetime.now()
+    )
+
+    await service.ask_question(
+        user_id=user_id,
+        chat_id=uuid4(),
+        repo_ids=repo_ids,
+        question="test_question"
+    )
+
+    mock_cache_repo.construct_cache_key.assert_awaited_once_with(
+        query="test_question",
+        repository_ids=repo_ids
+    )
+    mock_cache_repo.get_or_generate.assert_awaited_once()
+    assert mock_cache_repo.get_or_generate.call_args.kwargs["key"] == "key"
+    assert mock_cache_repo.get_or_generate.call_args.kwargs["query"] == "test_question"
+    service.llm_client.ask.assert_awaited_once_with("test_question", repo_ids)
+    saved_messages = mock_chat_repo.add_messages.call_args.kwargs["messages"]
+    assert saved_messages[1]["content"] == "test_llm_answer"
+
+
+@pytest.mark.asyncio
+async def test_get_ask_question_chat_not_found(mock_chat_repo, mock_cache_repo, llm_client):
     """Test that error is raised when there is no Chat with specified chat_id."""
     user_id = uuid4()
     chat_id = uuid4()
-    mock_chat_repo.get_chat_full.return_value = None
+    mock_chat_repo.get_chat_owner.return_value = None
 
-    service = ChatService(mock_chat_repo, mock_cache_repo)
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
 
     with pytest.raises(HTTPException) as exc:
         await service.ask_question(
@@ -193,18 +334,13 @@ async def test_get_ask_question_chat_not_found(mock_chat_repo, mock_cache_repo):
 
 
 @pytest.mark.asyncio
-async def test_get_ask_question_user_is_not_chat_owner(mock_chat_repo, mock_cache_repo):
+async def test_get_ask_question_user_is_not_chat_owner(mock_chat_repo, mock_cache_repo, llm_client):
     """Test that error is raised when User doesn't own the exact Chat."""
     user_id = uuid4()
     chat_id = uuid4()
-    mock_chat_repo.get_chat_full.return_value = DomainChat(
-        id=chat_id,
-        title="test_title",
-        owner_id=user_id,
-        created_at=datetime.now()
-    )
+    mock_chat_repo.get_chat_owner.return_value = user_id
 
-    service = ChatService(mock_chat_repo, mock_cache_repo)
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
 
     with pytest.raises(HTTPException) as exc:
         await service.ask_question(
@@ -216,3 +352,208 @@ async def test_get_ask_question_user_is_not_chat_owner(mock_chat_repo, mock_cach
 
     assert exc.value.status_code == 400
     assert "doesn't have access to the chat" in exc.value.detail
+
+
+async def collect(stream):
+    """Read the whole stream."""
+    return [item async for item in stream]
+
+
+@pytest.fixture(scope="function")
+def cache_generating(mock_cache_repo):
+    """Make cache_repo's get_or_generate miss and share generation of the same key."""
+    single_flight = SingleFlight()
+
+    async def get_or_generate(key, generate, query):
+        return await single_flight.do(key, generate)
+
+    mock_cache_repo.construct_cache_key.return_value = "key"
+    mock_cache_repo.get_or_generate.side_effect = get_or_generate
+    return mock_cache_repo
+
+
+@pytest.mark.asyncio
+async def test_stream_question_success(mock_chat_repo, cache_generating, llm_client):
+    """Test that answer chunks, then sources, then the saved Message are streamed."""
+    user_id = uuid4()
+    chat_id = uuid4()
+    mock_chat_repo.get_chat_owner.return_value = user_id
+    saved_answer = DomainMessage(
+        id=uuid4(),
+        role="assistant",
+        content="test_llm_answer",
+        created_at=datetime.now()
+    )
+    mock_chat_repo.add_messages.return_value = [None, saved_answer]
+
+    service = ChatService(mock_chat_repo, cache_generating, llm_client)
+
+    stream = await service.stream_question(
+        user_id=user_id,
+        chat_id=chat_id,
+        repo_ids=[uuid4()],
+        question="test_question"
+    )
+    events = await collect(stream)
+
+    *chunks, sources_chunk, message = events
+    content = "".join(chunk.content for chunk in chunks)
+    assert content
+    assert all(chunk.sources is None for chunk in chunks)
+    assert len(sources_chunk.sources) == 1
+    assert message == saved_answer
+
+    cache_generating.get_or_generate.assert_awaited_once()
+    assert cache_generating.get_or_generate.call_args.kwargs["query"] == "test_question"
+    saved_messages = mock_chat_repo.add_messages.call_args.kwargs["messages"]
+    assert saved_messages[0]["content"] == "test_question"
+    assert saved_messages[1]["content"] == content
+
+
+@pytest.mark.asyncio
+async def test_stream_question_uses_short_sessions(
+        mock_chat_repo,
+        cache_generating,
+        llm_client
+):
+    """Test that stream checks owner and saves answer in short sessions, committed in time."""
+    user_id = uuid4()
+    stream_chat_repo = AsyncMock()
+    stream_chat_repo.get_chat_owner.return_value = user_id
+    stream_chat_repo.add_messages.return_value = [None, None]
+    committed = []
+
+    @asynccontextmanager
+    async def chat_unit_of_work():
+        yield stream_chat_repo
+        committed.append(stream_chat_repo.add_messages.await_count)
+
+    service = ChatService(mock_chat_repo, cache_generating, llm_client, chat_unit_of_work)
+
+    stream = await service.stream_question(
+        user_id=user_id,
+        chat_id=uuid4(),
+        repo_ids=[uuid4()],
+        question="test_question"
+    )
+    assert committed == [0]
+
+    *_, message = await collect(stream)
+
+    assert committed == [0, 1]
+    assert message is None
+    mock_chat_repo.get_chat_owner.assert_not_called()
+    mock_chat_repo.add_messages.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_question_cached(mock_chat_repo, mock_cache_repo):
+    """Test that cached answer is streamed as one chunk without LLM call."""
+    user_id = uuid4()
+    mock_chat_repo.get_chat_owner.return_value = user_id
+    mock_cache_repo.get_or_generate.return_value = DomainMessage(
+        id=uuid4(),
+        role="assistant",
+        content="test_cached_answer",
+        created_at=datetime.now(),
+        sources=[]
+    )
+    mock_chat_repo.add_messages.return_value = [None, None]
+
+    llm_client = AsyncMock()
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
+
+    stream = await service.stream_question(
+        user_id=user_id,
+        chat_id=uuid4(),
+        repo_ids=[uuid4()],
+        question="test_question"
+    )
+    events = await collect(stream)
+
+    assert events[0].content == "test_cached_answer"
+    assert events[1].sources == []
+    llm_client.stream.assert_not_called()
+    mock_chat_repo.add_messages.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_question_closed_early(mock_chat_repo, cache_generating, llm_client):
+    """Test that nothing is saved when client goes away, but the answer is still generated."""
+    user_id = uuid4()
+    mock_chat_repo.get_chat_owner.return_value = user_id
+    upstream_finished = asyncio.Event()
+
+    async def llm_stream(question, repo_ids):
+        yield AnswerChunk(content="first ")
+        yield AnswerChunk(content="second")
+        upstream_finished.set()
+
+    llm_client.stream = llm_stream
+    service = ChatService(mock_chat_repo, cache_generating, llm_client)
+
+    stream = await service.stream_question(
+        user_id=user_id,
+        chat_id=uuid4(),
+        repo_ids=[uuid4()],
+        question="test_question"
+    )
+    first_chunk = await anext(stream)
+    await stream.aclose()
+    await asyncio.wait_for(upstream_finished.wait(), timeout=1)
+
+    assert first_chunk.content == "first "
+    mock_chat_repo.add_messages.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_identical_streams_share_generation(mock_chat_repo, cache_generating, llm_client):
+    """Test that concurrent identical streams get the answer of one LLM stream."""
+    user_id = uuid4()
+    mock_chat_repo.get_chat_owner.return_value = user_id
+    mock_chat_repo.add_messages.return_value = [None, None]
+    calls = 0
+
+    async def llm_stream(question, repo_ids):
+        nonlocal calls
+        calls += 1
+        for content in ("first ", "second"):
+            await asyncio.sleep(0.01)
+            yield AnswerChunk(content=content)
+
+    llm_client.stream = llm_stream
+    service = ChatService(mock_chat_repo, cache_generating, llm_client)
+
+    streams = [
+        await service.stream_question(
+            user_id=user_id,
+            chat_id=uuid4(),
+            repo_ids=[uuid4()],
+            question="test_question"
+        )
+        for _ in range(2)
+    ]
+    leader, follower = await asyncio.gather(*(collect(stream) for stream in streams))
+
+    assert calls == 1
+    assert [event.content for event in leader[:2]] == ["first ", "second"]
+    assert follower[0].content == "first second"
+    assert mock_chat_repo.add_messages.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_question_user_is_not_chat_owner(mock_chat_repo, mock_cache_repo, llm_client):
+    """Test that error is raised before streaming when User doesn't own the exact Chat."""
+    mock_chat_repo.get_chat_owner.return_value = uuid4()
+
+    service = ChatService(mock_chat_repo, mock_cache_repo, llm_client)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.stream_question(
+            user_id=uuid4(),
+            chat_id=uuid4(),
+            repo_ids=[uuid4()],
+            question="test_question"
+        )
+
+    assert exc.value.status_code == 400
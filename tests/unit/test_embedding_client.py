@@ -0,0 +1,43 @@
+import json
+
+import httpx
+import numpy as np
+import pytest
+
+from src.infrastructure.external.embedding_client import EmbeddingClient
+
+
+def make_client(embedding):
+    """Create EmbeddingClient over a stub service answering with embedding."""
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"embedding": embedding})
+
+    http_client = httpx.AsyncClient(
+        base_url="http://embedder",
+        transport=httpx.MockTransport(handler)
+    )
+    return EmbeddingClient(http_client=http_client, dim=2), requests
+
+
+@pytest.mark.asyncio
+async def test_embed_normalizes():
+    """Test that the model's embedding is returned as a unit float32 vector."""
+    client, requests = make_client([3, 4])
+
+    vector = await client.embed("How do I run the tests?")
+
+    assert requests == [{"input": "How do I run the tests?"}]
+    assert vector.dtype == np.float32
+    assert np.allclose(vector, [0.6, 0.8])
+
+
+@pytest.mark.asyncio
+async def test_embed_wrong_size():
+    """Test that embedding of other size than the index's is rejected."""
+    client, _ = make_client([1, 2, 3])
+
+    with pytest.raises(ValueError):
+        await client.embed("How do I run the tests?")
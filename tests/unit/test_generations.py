@@ -0,0 +1,82 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.infrastructure.cache.generations import RepositoryGenerations
+
+REPOSITORY_ID = uuid4()
+
+
+@pytest.fixture(scope="function")
+def mock_redis():
+    """Create mock for Redis client knowing generation 3 of the repository."""
+    redis = MagicMock()
+    redis.mget = AsyncMock(return_value=[b"3"])
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[4])
+    redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=None)
+    return redis
+
+
+@pytest.fixture(scope="function")
+def generations(mock_redis):
+    """Create generations kept in process for a minute."""
+    return RepositoryGenerations(mock_redis, channel=AsyncMock(), ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_get_reads_redis_once(generations, mock_redis):
+    """Test that generations are read from Redis on local miss only."""
+    assert await generations.get([REPOSITORY_ID]) == {str(REPOSITORY_ID): 3}
+    assert await generations.get([REPOSITORY_ID, REPOSITORY_ID]) == {str(REPOSITORY_ID): 3}
+
+    mock_redis.mget.assert_awaited_once()
+    assert await generations.get([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_get_without_redis_uses_last_known(mock_redis):
+    """Test that last known generations (or 0) are used when Redis is unavailable."""
+    generations = RepositoryGenerations(mock_redis, ttl=0)
+    await generations.get([REPOSITORY_ID])
+    mock_redis.mget.side_effect = RedisError("down")
+    other_id = uuid4()
+
+    result = await generations.get([REPOSITORY_ID, other_id])
+
+    assert result == {str(REPOSITORY_ID): 3, str(other_id): 0}
+
+
+@pytest.mark.asyncio
+async def test_bump_is_kept_and_announced(generations, mock_redis):
+    """Test that bumped generation is used here right away and sent to other workers."""
+    await generations.get([REPOSITORY_ID])
+
+    await generations.bump([REPOSITORY_ID])
+
+    assert await generations.get([REPOSITORY_ID]) == {str(REPOSITORY_ID): 4}
+    generations.channel.publish.assert_awaited_once_with(f"{REPOSITORY_ID}=4")
+
+
+@pytest.mark.asyncio
+async def test_bump_of_other_worker(generations, mock_redis):
+    """Test that announced generations are taken, but never older ones."""
+    generations.on_message(f"{REPOSITORY_ID}=7,malformed")
+    generations.on_message(f"{REPOSITORY_ID}=5")
+
+    assert await generations.get([REPOSITORY_ID]) == {str(REPOSITORY_ID): 7}
+    mock_redis.mget.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reset_reads_redis_again(generations, mock_redis):
+    """Test that generations are read again after the channel was broken."""
+    await generations.get([REPOSITORY_ID])
+    mock_redis.mget.return_value = [b"9"]
+
+    generations.on_reset()
+
+    assert await generations.get([REPOSITORY_ID]) == {str(REPOSITORY_ID): 9}
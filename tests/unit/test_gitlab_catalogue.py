@@ -0,0 +1,236 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+
+from src.domain.models.knowledge import Repository, RepositoryCatalogue
+from src.infrastructure.cache.gitlab_catalogue import (
+    GitLabCatalogue,
+    catalogue_key,
+    refresh_lease_key,
+)
+from src.infrastructure.cache.memory import CatalogueCache
+from src.infrastructure.cache.single_flight import SingleFlight
+from src.infrastructure.external.gitlab_client import ProjectListing
+
+BASE_URL = "https://gitlab.example.com"
+TOKEN = "glpat-secret" # noqa: S105
+KEY = catalogue_key(BASE_URL, TOKEN)
+
+
+def make_repository(name: str) -> Repository:
+    """Create repository with given name."""
+    return Repository(
+        id=uuid.uuid5(uuid.NAMESPACE_URL, name),
+        name=name,
+        path_with_namespace=f"group/{name}",
+        url=f"{BASE_URL}/group/{name}"
+    )
+
+
+def make_catalogue(names, age: float = 0, listed_age: float = 0, etag=None):
+    """Create catalogue refreshed age seconds ago and fully listed listed_age seconds ago."""
+    now = time.time()
+    return RepositoryCatalogue(
+        repositories=[make_repository(name) for name in names],
+        since=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        etag=etag,
+        listed_at=now - max(age, listed_age),
+        refreshed_at=now - age
+    )
+
+
+async def settle(single_flight: SingleFlight) -> None:
+    """Wait for background refreshes to finish."""
+    while len(single_flight):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture(scope="function")
+def store():
+    """Create dict backing the mocked Redis."""
+    return {}
+
+
+@pytest.fixture(scope="function")
+def mock_redis(store):
+    """Create AsyncMock for Redis client over a dict."""
+    async def get(key):
+        return store.get(key)
+
+    async def set_(key, value, ex=None, nx=False):
+        if nx and key in store:
+            return None
+        store[key] = value
+        return True
+
+    redis = AsyncMock()
+    redis.get.side_effect = get
+    redis.set.side_effect = set_
+    return redis
+
+
+@pytest.fixture(scope="function")
+def mock_client():
+    """Create AsyncMock for GitLab client."""
+    client = AsyncMock()
+    client.list_projects.return_value = [make_repository("a"), make_repository("b")]
+    client.list_changed_projects.return_value = None
+    return client
+
+
+@pytest.fixture(scope="function")
+def single_flight():
+    """Create SingleFlight."""
+    return SingleFlight()
+
+
+@pytest.fixture(scope="function")
+def catalogue(mock_client, mock_redis, single_flight):
+    """Create GitLab catalogue over mocked client and Redis."""
+    return GitLabCatalogue(
+        client=mock_client,
+        redis_client=mock_redis,
+        local=CatalogueCache(maxsize=4, ttl=60),
+        single_flight=single_flight,
+        refresh_interval=60,
+        full_refresh_interval=3600,
+        ttl=86400
+    )
+
+
+def test_catalogue_key_depends_on_url_and_token():
+    """Test that catalogue key changes with token and ignores trailing slash."""
+    assert catalogue_key(BASE_URL + "/", TOKEN) == KEY
+    assert catalogue_key(BASE_URL, "other") != KEY
+    assert TOKEN not in KEY
+
+
+@pytest.mark.asyncio
+async def test_miss_lists_all_and_serves_locally(catalogue, mock_client, mock_redis, store):
+    """Test that missing catalogue is listed fully once, then served from process."""
+    first = await catalogue.list_projects(BASE_URL, TOKEN)
+    second = await catalogue.list_projects(BASE_URL, TOKEN)
+
+    assert [repo.name for repo in first] == ["a", "b"]
+    assert second == first
+    mock_client.list_projects.assert_awaited_once_with(BASE_URL, TOKEN)
+    assert RepositoryCatalogue.model_validate_json(store[KEY]).repositories == first
+    mock_redis.get.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_local_copy_expires(catalogue, mock_client, mock_redis):
+    """Test that catalogue is read from Redis again once the local tier's TTL is over."""
+    catalogue.local = CatalogueCache(maxsize=4, ttl=0.01)
+    await catalogue.list_projects(BASE_URL, TOKEN)
+
+    await asyncio.sleep(0.02)
+    await catalogue.list_projects(BASE_URL, TOKEN)
+
+    assert mock_redis.get.await_count == 2
+    mock_client.list_projects.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_list_once(catalogue, mock_client):
+    """Test that concurrent misses of one catalogue make one listing."""
+    await asyncio.gather(*(catalogue.list_projects(BASE_URL, TOKEN) for _ in range(5)))
+
+    mock_client.list_projects.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fresh_shared_catalogue_is_not_refreshed(catalogue, mock_client, store):
+    """Test that catalogue fresh in Redis is served without going to GitLab."""
+    store[KEY] = make_catalogue(["a"], age=10).model_dump_json()
+
+    repositories = await catalogue.list_projects(BASE_URL, TOKEN)
+
+    assert [repo.name for repo in repositories] == ["a"]
+    mock_client.list_projects.assert_not_awaited()
+    mock_client.list_changed_projects.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stale_catalogue_not_modified(catalogue, mock_client, store, single_flight):
+    """Test that stale catalogue is served and conditionally refreshed in background."""
+    stale = make_catalogue(["a"], age=120, etag='W/"1"')
+    store[KEY] = stale.model_dump_json()
+
+    repositories = await catalogue.list_projects(BASE_URL, TOKEN)
+    await settle(single_flight)
+
+    assert [repo.name for repo in repositories] == ["a"]
+    mock_client.list_changed_projects.assert_awaited_once_with(
+        BASE_URL, TOKEN, since=stale.since, etag='W/"1"'
+    )
+    refreshed = RepositoryCatalogue.model_validate_json(store[KEY])
+    assert refreshed.refreshed_at > stale.refreshed_at
+    assert refreshed.etag == 'W/"1"'
+    assert refresh_lease_key(KEY) in store
+
+
+@pytest.mark.asyncio
+async def test_stale_catalogue_merges_changes(catalogue, mock_client, store, single_flight):
+    """Test that changed projects replace their old versions and new ones are added."""
+    store[KEY] = make_catalogue(["a", "b"], age=120).model_dump_json()
+    changed = make_repository("b").model_copy(update={"path_with_namespace": "moved/b"})
+    mock_client.list_changed_projects.return_value = ProjectListing(
+        repositories=[make_repository("c"), changed],
+        etag='W/"2"'
+    )
+
+    await catalogue.list_projects(BASE_URL, TOKEN)
+    await settle(single_flight)
+
+    refreshed = RepositoryCatalogue.model_validate_json(store[KEY])
+    assert [repo.name for repo in refreshed.repositories] == ["a", "b", "c"]
+    assert refreshed.repositories[1].path_with_namespace == "moved/b"
+    assert refreshed.etag == 'W/"2"'
+    assert await catalogue.list_projects(BASE_URL, TOKEN) == refreshed.repositories
+
+
+@pytest.mark.asyncio
+async def test_old_catalogue_is_listed_fully(catalogue, mock_client, store, single_flight):
+    """Test that catalogue is listed fully again after full_refresh_interval."""
+    store[KEY] = make_catalogue(["gone"], age=120, listed_age=7200, etag='W/"1"').model_dump_json()
+
+    await catalogue.list_projects(BASE_URL, TOKEN)
+    await settle(single_flight)
+
+    mock_client.list_projects.assert_awaited_once()
+    mock_client.list_changed_projects.assert_not_awaited()
+    refreshed = RepositoryCatalogue.model_validate_json(store[KEY])
+    assert [repo.name for repo in refreshed.repositories] == ["a", "b"]
+    assert refreshed.etag is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_leased_by_other_worker(catalogue, mock_client, store, single_flight):
+    """Test that only the worker holding the lease refreshes the catalogue."""
+    store[KEY] = make_catalogue(["a"], age=120).model_dump_json()
+    store[refresh_lease_key(KEY)] = 1
+
+    await catalogue.list_projects(BASE_URL, TOKEN)
+    await settle(single_flight)
+
+    mock_client.list_changed_projects.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale(catalogue, mock_client, store, single_flight):
+    """Test that catalogue is served stale if GitLab fails to refresh it."""
+    stale = make_catalogue(["a"], age=120)
+    store[KEY] = stale.model_dump_json()
+    mock_client.list_changed_projects.side_effect = HTTPException(status_code=502)
+
+    repositories = await catalogue.list_projects(BASE_URL, TOKEN)
+    await settle(single_flight)
+
+    assert [repo.name for repo in repositories] == ["a"]
+    assert RepositoryCatalogue.model_validate_json(store[KEY]) == stale
@@ -0,0 +1,199 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.infrastructure.external.gitlab_client import (
+    GitLabClient,
+    repository_id,
+    token_fingerprint,
+)
+from tests.gitlab_stub import BASE_URL, TOKEN, make_transport
+
+
+@pytest.mark.asyncio
+async def test_list_projects_fetches_all_pages():
+    """Test that pages after the first are fetched by X-Total-Pages, in order."""
+    requested = []
+    transport = make_transport(total=25, requested=requested)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4, per_page=10)
+
+        repositories = await client.list_projects(BASE_URL + "/", TOKEN)
+
+    assert sorted(requested) == [1, 2, 3]
+    assert [repo.name for repo in repositories] == [f"project-{i}" for i in range(1, 26)]
+    assert repositories[0].id == repository_id(BASE_URL, 1)
+    assert str(repositories[0].url) == f"{BASE_URL}/group/project-1"
+
+
+@pytest.mark.asyncio
+async def test_list_projects_bounds_concurrent_pages():
+    """Test that no more than max_concurrency pages are requested at once."""
+    in_flight = []
+    transport = make_transport(total=100, latency=0.01, in_flight=in_flight)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = GitLabClient(http_client, max_concurrency=3, per_page=5)
+
+        repositories = await client.list_projects(BASE_URL, TOKEN)
+
+    assert len(repositories) == 100
+    assert max(in_flight) == 3
+
+
+@pytest.mark.asyncio
+async def test_list_projects_follows_next_page_without_total():
+    """Test that pages are followed by X-Next-Page when GitLab omits the total."""
+    requested = []
+    transport = make_transport(total=25, with_total=False, requested=requested)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4, per_page=10)
+
+        repositories = await client.list_projects(BASE_URL, TOKEN)
+
+    assert requested == [1, 2, 3]
+    assert len(repositories) == 25
+
+
+@pytest.mark.asyncio
+async def test_list_projects_malformed_total():
+    """Test that pages are followed by X-Next-Page when X-Total-Pages isn't a number."""
+    requested = []
+    transport = make_transport(total=25, requested=requested, total_header="many")
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4, per_page=10)
+
+        repositories = await client.list_projects(BASE_URL, TOKEN)
+
+    assert requested == [1, 2, 3]
+    assert len(repositories) == 25
+
+
+def test_repository_id_is_stable():
+    """Test that repository id depends on instance and project only."""
+    assert repository_id(BASE_URL, 7) == repository_id(BASE_URL + "/", 7)
+    assert repository_id(BASE_URL, 7) != repository_id("https://other.example.com", 7)
+
+
+@pytest.mark.asyncio
+async def test_list_projects_rejected_token():
+    """Test that rejected token is reported as bad config (400)."""
+    transport = make_transport(total=1)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4)
+
+        with pytest.raises(HTTPException) as exc:
+            await client.list_projects(BASE_URL, "wrong")
+
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_projects_gitlab_error():
+    """Test that GitLab error is reported as bad gateway (502)."""
+    transport = make_transport(total=1, status_code=500)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4)
+
+        with pytest.raises(HTTPException) as exc:
+            await client.list_projects(BASE_URL, TOKEN)
+
+    assert exc.value.status_code == 502
+
+
+@pytest.mark.asyncio
+async def test_list_projects_later_page_error():
+    """Test that error of a concurrently fetched page is reported as bad gateway (502)."""
+    transport = make_transport(total=50, failed_page=3)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4, per_page=10)
+
+        with pytest.raises(HTTPException) as exc:
+            await client.list_projects(BASE_URL, TOKEN)
+
+    assert exc.value.status_code == 502
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page", [
+    [{"id": 1, "name": "project-1", "path_with_namespace": "group/project-1"}],
+    [{"id": "one", "name": "p", "path_with_namespace": "g/p", "web_url": f"{BASE_URL}/g/p"}],
+    {"message": "not a list"},
+])
+async def test_list_projects_malformed_page(page):
+    """Test that malformed projects of a concurrently fetched page are reported as 502."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["page"] == "1":
+            return httpx.Response(200, json=[], headers={"X-Total-Pages": "2"})
+        return httpx.Response(200, json=page, headers={"X-Total-Pages": "2"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4)
+
+        with pytest.raises(HTTPException) as exc:
+            await client.list_projects(BASE_URL, TOKEN)
+
+    assert exc.value.status_code == 502
+
+
+@pytest.mark.asyncio
+async def test_list_projects_gitlab_unavailable():
+    """Test that connection error is reported as bad gateway (502)."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4)
+
+        with pytest.raises(HTTPException) as exc:
+            await client.list_projects(BASE_URL, TOKEN)
+
+    assert exc.value.status_code == 502
+
+
+@pytest.mark.asyncio
+async def test_list_changed_projects_not_modified():
+    """Test that changes are listed conditionally and None is returned on 304."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == 'W/"1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[], headers={"ETag": 'W/"1"', "X-Total-Pages": "1"})
+
+    since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4)
+
+        listing = await client.list_changed_projects(BASE_URL, TOKEN, since=since)
+        unchanged = await client.list_changed_projects(
+            BASE_URL, TOKEN, since=since, etag=listing.etag
+        )
+
+    assert listing.repositories == []
+    assert listing.etag == 'W/"1"'
+    assert unchanged is None
+    assert requests[0].url.params["last_activity_after"] == since.isoformat()
+    assert requests[0].url.params["order_by"] == "last_activity_at"
+
+
+@pytest.mark.asyncio
+async def test_list_projects_through_scheduler():
+    """Test that requests go through scheduler on behalf of the token's fingerprint."""
+    async def send(client, request):
+        return await request()
+
+    scheduler = AsyncMock()
+    scheduler.send.side_effect = send
+    transport = make_transport(total=15)
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        client = GitLabClient(http_client, max_concurrency=4, per_page=10, scheduler=scheduler)
+
+        repositories = await client.list_projects(BASE_URL, TOKEN)
+
+    assert len(repositories) == 15
+    assert scheduler.send.await_count == 2
+    assert {call.args[0] for call in scheduler.send.await_args_list} == {token_fingerprint(TOKEN)}
@@ -0,0 +1,125 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.core.metrics import metrics
+from src.domain.models.knowledge import GitLabConfig
+from src.infrastructure.cache.gitlab_config import GitLabConfigHolder, GitLabCredentials
+from src.infrastructure.security.encription import encrypt_data
+
+
+@pytest.fixture(scope="function")
+def mock_redis():
+    """Create AsyncMock for Redis client."""
+    return AsyncMock()
+
+
+@pytest.fixture(scope="function")
+def holder(mock_redis):
+    """Create config holder over mocked Redis."""
+    metrics.reset()
+    return GitLabConfigHolder(mock_redis, "gitlab:config", ttl=60)
+
+
+@pytest.fixture(scope="function")
+def mock_load():
+    """Create AsyncMock loading config with an encrypted token."""
+    return AsyncMock(return_value=GitLabConfig(
+        id=1,
+        url="https://gitlab.example.com",
+        private_token_encrypted=encrypt_data("glpat-secret")
+    ))
+
+
+@pytest.mark.asyncio
+async def test_get_decrypts_once(holder, mock_load):
+    """Test that config is loaded and decrypted once, then served from process."""
+    first = await holder.get(mock_load)
+    second = await holder.get(mock_load)
+
+    assert first == second == GitLabCredentials(
+        url="https://gitlab.example.com/",
+        token="glpat-secret" # noqa: S106
+    )
+    mock_load.assert_awaited_once()
+    assert metrics.get("gitlab_config.decryptions") == 1
+
+
+@pytest.mark.asyncio
+async def test_get_not_configured(holder):
+    """Test that None is returned and nothing kept when GitLab isn't configured."""
+    load = AsyncMock(return_value=None)
+
+    assert await holder.get(load) is None
+    assert await holder.get(load) is None
+    assert load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_wipes_token(holder, mock_load, mock_redis):
+    """Test that invalidated token is overwritten, announced and loaded again."""
+    await holder.get(mock_load)
+    kept = holder._token
+
+    await holder.invalidate()
+
+    assert kept == bytearray(len(b"glpat-secret"))
+    mock_redis.publish.assert_awaited_once()
+    await holder.get(mock_load)
+    assert mock_load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_without_redis(holder, mock_load, mock_redis):
+    """Test that config is dropped here even if other workers can't be told."""
+    await holder.get(mock_load)
+    mock_redis.publish.side_effect = RedisError("down")
+
+    await holder.invalidate()
+    await holder.get(mock_load)
+
+    assert mock_load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_change_from_other_worker(holder, mock_load):
+    """Test that config changed by other worker is dropped."""
+    await holder.get(mock_load)
+
+    holder.channel.on_message("changed")
+    await holder.get(mock_load)
+
+    assert mock_load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_load_racing_change_isnt_kept(holder, mock_load):
+    """Test that config loaded while it was changed is returned but not kept."""
+    release = asyncio.Event()
+    config = mock_load.return_value
+
+    async def slow_load():
+        await release.wait()
+        return config
+
+    task = asyncio.create_task(holder.get(slow_load))
+    await asyncio.sleep(0)
+    holder.clear()
+    release.set()
+
+    assert (await task).token == "glpat-secret"
+    await holder.get(mock_load)
+    mock_load.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_expired_config_is_loaded_again(mock_redis, mock_load):
+    """Test that config is loaded again after ttl."""
+    holder = GitLabConfigHolder(mock_redis, "gitlab:config", ttl=0)
+
+    await holder.get(mock_load)
+    await holder.get(mock_load)
+
+    assert mock_load.await_count == 2
@@ -0,0 +1,158 @@
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from src.core.metrics import metrics
+from src.core.security_policy import RateLimit
+from src.infrastructure.external.gitlab_scheduler import (
+    GITLAB_RATE_LIMIT_NAME,
+    GitLabRequestScheduler,
+)
+
+LIMIT = RateLimit(rate=10, burst=5)
+
+
+@pytest.fixture(scope="function")
+def mock_rate_limiter():
+    """Create AsyncMock for rate limiter, allowing by default."""
+    rate_limiter = AsyncMock()
+    rate_limiter.acquire.return_value = 0.0
+    return rate_limiter
+
+
+@pytest.fixture(scope="function")
+def mock_sleep(mocker):
+    """Patch sleeping of scheduler, recording delays."""
+    return mocker.patch(
+        "src.infrastructure.external.gitlab_scheduler.asyncio.sleep",
+        new_callable=AsyncMock
+    )
+
+
+@pytest.fixture(scope="function")
+def scheduler(mock_rate_limiter):
+    """Create scheduler over mocked rate limiter."""
+    metrics.reset()
+    return GitLabRequestScheduler(
+        mock_rate_limiter,
+        LIMIT,
+        max_retries=3,
+        backoff_base=0.5,
+        backoff_max=30
+    )
+
+
+def responses(*responses):
+    """Create AsyncMock sending given responses (or raising given errors) in turn."""
+    return AsyncMock(side_effect=list(responses))
+
+
+@pytest.mark.asyncio
+async def test_send_allowed(scheduler, mock_rate_limiter, mock_sleep):
+    """Test that allowed request is sent once with a token taken from client's bucket."""
+    request = responses(httpx.Response(200))
+
+    response = await scheduler.send("client", request)
+
+    assert response.status_code == 200
+    request.assert_awaited_once()
+    mock_rate_limiter.acquire.assert_awaited_once_with(GITLAB_RATE_LIMIT_NAME, "client", LIMIT)
+    mock_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_send_waits_for_token(scheduler, mock_rate_limiter, mock_sleep):
+    """Test that request waits while client's bucket is empty."""
+    mock_rate_limiter.acquire.side_effect = [0.25, 0.0]
+
+    await scheduler.send("client", responses(httpx.Response(200)))
+
+    mock_sleep.assert_awaited_once_with(0.25)
+    assert metrics.get("gitlab.paced") == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_follows_gitlab_headers(scheduler, mock_rate_limiter, mock_sleep):
+    """Test that what's left of GitLab's limit is spread until it's reset."""
+    reset_at = int(time.time()) + 30
+    request = responses(httpx.Response(
+        200,
+        headers={"RateLimit-Remaining": "600", "RateLimit-Reset": str(reset_at)}
+    ))
+
+    await scheduler.send("client", request)
+
+    limit = scheduler.limit_of("client")
+    assert limit.rate == pytest.approx(600 / (reset_at - time.time()), rel=0.1)
+    assert limit.burst == LIMIT.burst
+    assert scheduler.limit_of("other") == LIMIT
+
+
+@pytest.mark.asyncio
+async def test_exhausted_limit_paces_until_reset(scheduler, mock_sleep):
+    """Test that exhausted limit leaves about a request until it's reset."""
+    reset_at = int(time.time()) + 60
+    request = responses(httpx.Response(
+        200,
+        headers={"RateLimit-Remaining": "0", "RateLimit-Reset": str(reset_at)}
+    ))
+
+    await scheduler.send("client", request)
+
+    assert scheduler.limit_of("client").rate == pytest.approx(1 / 60, rel=0.1)
+
+
+@pytest.mark.asyncio
+async def test_throttled_request_retried_after_retry_after(scheduler, mock_sleep):
+    """Test that 429 is retried not before its Retry-After."""
+    request = responses(
+        httpx.Response(429, headers={"Retry-After": "45"}),
+        httpx.Response(200)
+    )
+
+    response = await scheduler.send("client", request)
+
+    assert response.status_code == 200
+    assert request.await_count == 2
+    assert mock_sleep.await_args.args[0] >= 45
+    assert metrics.get("gitlab.throttled") == 1
+    assert metrics.get("gitlab.retries") == 1
+
+
+@pytest.mark.asyncio
+async def test_server_error_retried_with_backoff(scheduler, mock_sleep):
+    """Test that 5xx is retried with delays within growing backoff and returned at last."""
+    request = responses(*(httpx.Response(503) for _ in range(4)))
+
+    response = await scheduler.send("client", request)
+
+    assert response.status_code == 503
+    assert request.await_count == 4
+    delays = [call.args[0] for call in mock_sleep.await_args_list]
+    assert len(delays) == 3
+    assert all(0 <= delay <= 0.5 * 2 ** attempt for attempt, delay in enumerate(delays))
+
+
+@pytest.mark.asyncio
+async def test_client_error_not_retried(scheduler, mock_sleep):
+    """Test that other errors are returned right away."""
+    request = responses(httpx.Response(404))
+
+    response = await scheduler.send("client", request)
+
+    assert response.status_code == 404
+    request.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_connection_error_retried_then_raised(scheduler, mock_sleep):
+    """Test that connection error is retried and raised when retries are over."""
+    error = httpx.ConnectError("refused")
+    request = responses(error, error, error, error)
+
+    with pytest.raises(httpx.ConnectError):
+        await scheduler.send("client", request)
+
+    assert request.await_count == 4
@@ -5,14 +5,17 @@ from uuid import uuid4
 import pytest
 from fastapi import HTTPException
 
-from src.api.schemas.repository import JobStatusUpdate
+from src.api.schemas.repository import GitLabWebhookEvent, JobStatusUpdate
 from src.application.services.index_service import IndexService
 from src.domain.models.knowledge import (
     GitLabConfig as DomainGitLabConfig,
     IndexingJob,
     JobStatus,
     Repository,
+    RepositoryChanges,
 )
+from src.infrastructure.cache.gitlab_config import GitLabCredentials
+from src.infrastructure.external.gitlab_client import repository_id
 
 
 @pytest.fixture(scope="function")
@@ -107,6 +110,40 @@ async def test_list_repositories_success(
     assert result == [repository]
 
 
+@pytest.mark.asyncio
+async def test_list_repositories_from_catalogue(
+        mock_gitlab_repo,
+        mock_job_repo,
+        gitlab_config,
+        repository,
+        mocker
+):
+    """Test that repositories are taken from catalogue's cache when service has one."""
+    mock_gitlab_repo.get_config.return_value = gitlab_config
+    mocker.patch(
+        "src.application.services.index_service.decrypt_data",
+        side_effect=lambda x: f"decrypted_{x}"
+    )
+    mock_client = AsyncMock()
+    mock_catalogue = AsyncMock()
+    mock_catalogue.list_projects.return_value = [repository]
+    service = IndexService(
+        mock_gitlab_repo,
+        mock_job_repo,
+        gitlab_client=mock_client,
+        catalogue=mock_catalogue
+    )
+
+    result = await service.list_repositories()
+
+    mock_catalogue.list_projects.assert_awaited_once_with(
+        base_url="https://test.com/",
+        token="decrypted_encrypted_test_token"
+    )
+    mock_client.list_projects.assert_not_awaited()
+    assert result == [repository]
+
+
 @pytest.mark.asyncio
 async def test_list_repositories_success_empty_repository_list(
         mock_gitlab_repo,
@@ -191,7 +228,7 @@ async def test_trigger_indexing_success(
     mock_gitlab_repo.get_config.assert_called_once()
     mock_client.trigger_indexing.assert_called_once_with(
         repo_ids=[repository.id],
-        gitlab_url=gitlab_config.url,
+        gitlab_url=str(gitlab_config.url),
         gitlab_token="decrypted_encrypted_test_token"
     )
     mock_job_repo.create_job.assert_called_once_with(
@@ -310,3 +347,192 @@ async def test_update_indexing_status_success(
     )
 
     assert result == indexing_job
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "job_status, bumped",
+    [
+        (JobStatus.FAILED, False),
+        (JobStatus.RUNNING, False),
+        (JobStatus.SUCCESS, True)
+    ]
+)
+async def test_update_indexing_status_bumps_generations(
+        mock_gitlab_repo,
+        mock_job_repo,
+        indexing_job,
+        job_status,
+        bumped
+):
+    """Test that successfully reindexed repositories get new cache generations."""
+    mock_cache_repo = AsyncMock()
+    indexing_job.status = job_status
+    mock_job_repo.update_job_status.return_value = indexing_job
+
+    service = IndexService(mock_gitlab_repo, mock_job_repo, mock_cache_repo)
+
+    await service.update_indexing_status(
+        job_id=indexing_job.id,
+        status_update=JobStatusUpdate(status=job_status)
+    )
+
+    if bumped:
+        mock_cache_repo.bump_generations.assert_awaited_once_with(indexing_job.repository_ids)
+    else:
+        mock_cache_repo.bump_generations.assert_not_called()
+
+
+def push_event(**fields):
+    """Create GitLab's push event to the default branch."""
+    event = {
+        "object_kind": "push",
+        "ref": "refs/heads/main",
+        "before": "1" * 40,
+        "after": "2" * 40,
+        "project": {"id": 42, "default_branch": "main"},
+        "commits": [
+            {"added": ["src/new.py"], "modified": ["src/a.py"], "removed": []},
+            {"added": [], "modified": ["src/b.py"], "removed": ["src/a.py"]},
+        ],
+        "total_commits_count": 2,
+    }
+    event.update(fields)
+    return GitLabWebhookEvent.model_validate(event)
+
+
+@pytest.mark.asyncio
+async def test_receive_webhook_queues_pushed_changes(
+        mock_gitlab_repo,
+        mock_job_repo,
+        gitlab_config,
+        mocker
+):
+    """Test that push to default branch is queued with its range and last state of files."""
+    mocker.patch(
+        "src.application.services.index_service.decrypt_data",
+        side_effect=lambda x: f"decrypted_{x}"
+    )
+    mock_gitlab_repo.get_config.return_value = gitlab_config
+    mock_debouncer = AsyncMock()
+    service = IndexService(mock_gitlab_repo, mock_job_repo, push_debouncer=mock_debouncer)
+
+    result = await service.receive_webhook(push_event())
+
+    mock_debouncer.add.assert_awaited_once_with(RepositoryChanges(
+        repository_id=repository_id("https://test.com/", 42),
+        before="1" * 40,
+        after="2" * 40,
+        paths=["src/new.py", "src/b.py"],
+        removed_paths=["src/a.py"]
+    ))
+    assert result["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_receive_webhook_with_truncated_commits(
+        mock_gitlab_repo,
+        mock_job_repo,
+        gitlab_config,
+        mocker
+):
+    """Test that push with commits left out of the event reindexes all files."""
+    mocker.patch(
+        "src.application.services.index_service.decrypt_data",
+        side_effect=lambda x: f"decrypted_{x}"
+    )
+    mock_gitlab_repo.get_config.return_value = gitlab_config
+    mock_debouncer = AsyncMock()
+    service = IndexService(mock_gitlab_repo, mock_job_repo, push_debouncer=mock_debouncer)
+
+    await service.receive_webhook(push_event(total_commits_count=25))
+
+    assert mock_debouncer.add.await_args.args[0].paths is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("event", [
+    push_event(ref="refs/heads/feature"),
+    push_event(after="0" * 40),
+    push_event(object_kind="merge_request"),
+    push_event(object_kind="tag_push", ref="refs/tags/v1"),
+])
+async def test_receive_webhook_ignores_other_events(
+        mock_gitlab_repo,
+        mock_job_repo,
+        event
+):
+    """Test that events other than pushes to default branch aren't queued."""
+    mock_debouncer = AsyncMock()
+    service = IndexService(mock_gitlab_repo, mock_job_repo, push_debouncer=mock_debouncer)
+
+    result = await service.receive_webhook(event)
+
+    mock_debouncer.add.assert_not_awaited()
+    assert result == {"status": "ok", "message": "Event is ignored."}
+
+
+@pytest.mark.asyncio
+async def test_trigger_incremental_indexing_success(
+        mock_gitlab_repo,
+        mock_job_repo,
+        gitlab_config,
+        indexing_job,
+        mocker
+):
+    """Test that service triggers indexing of changed files and creates job."""
+    mock_gitlab_repo.get_config.return_value = gitlab_config
+    mocker.patch(
+        "src.application.services.index_service.decrypt_data",
+        side_effect=lambda x: f"decrypted_{x}"
+    )
+    changes = RepositoryChanges(
+        repository_id=indexing_job.repository_ids[0],
+        before="1" * 40,
+        after="2" * 40,
+        paths=["src/a.py"]
+    )
+    service = IndexService(mock_gitlab_repo, mock_job_repo)
+    mock_client = AsyncMock()
+    mock_client.trigger_incremental_indexing.return_value = indexing_job
+    service.mlops_client = mock_client
+
+    result = await service.trigger_incremental_indexing(changes)
+
+    mock_client.trigger_incremental_indexing.assert_awaited_once_with(
+        changes=changes,
+        gitlab_url="https://test.com/",
+        gitlab_token="decrypted_encrypted_test_token"
+    )
+    mock_job_repo.create_job.assert_awaited_once_with(
+        job_id=indexing_job.id,
+        repo_ids=[changes.repository_id],
+        status=indexing_job.status,
+        details=None
+    )
+    assert result == indexing_job
+
+
+@pytest.mark.asyncio
+async def test_list_repositories_from_config_holder(
+        mock_gitlab_repo,
+        mock_job_repo,
+        repository
+):
+    """Test that config is taken from config holder when service has one."""
+    mock_holder = AsyncMock()
+    mock_holder.get.return_value = GitLabCredentials(url="https://test.com/", token="raw")
+    mock_client = AsyncMock()
+    mock_client.list_projects.return_value = [repository]
+    service = IndexService(
+        mock_gitlab_repo,
+        mock_job_repo,
+        gitlab_client=mock_client,
+        config_holder=mock_holder
+    )
+
+    result = await service.list_repositories()
+
+    mock_holder.get.assert_awaited_once_with(mock_gitlab_repo.get_config)
+    mock_client.list_projects.assert_awaited_once_with(base_url="https://test.com/", token="raw")
+    assert result == [repository]
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import pytest
+
+from src.infrastructure.security import jwt as jwt_module
+from src.infrastructure.security.jwt import (
+    clear_token_cache,
+    create_access_token,
+    decode_access_token,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    """Start every test with empty cache of verified tokens."""
+    clear_token_cache()
+    yield
+    clear_token_cache()
+
+
+def test_decode_valid_token():
+    """Test that token's payload is returned."""
+    token = create_access_token({"sub": "user_id", "role": "user"})
+
+    payload = decode_access_token(token)
+
+    assert payload["sub"] == "user_id"
+    assert payload["role"] == "user"
+
+
+def test_decode_invalid_token():
+    """Test that None is returned for token with wrong signature."""
+    token = create_access_token({"sub": "user_id"})
+    tampered_token = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+
+    assert decode_access_token(tampered_token) is None
+    assert decode_access_token("not a token") is None
+
+
+def test_decode_expired_token():
+    """Test that expired token isn't accepted nor cached."""
+    token = create_access_token({"sub": "user_id"}, expires_delta=timedelta(seconds=-1))
+
+    assert decode_access_token(token) is None
+    assert len(jwt_module._payload_cache) == 0
+
+
+def test_decode_verified_once(mocker):
+    """Test that repeated decoding of the same token is served from cache."""
+    token = create_access_token({"sub": "user_id"})
+    jose_decode = mocker.spy(jwt_module.jwt, "decode")
+
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+
+    assert first == second
+    jose_decode.assert_called_once()
+
+
+def test_cached_payload_is_not_shared():
+    """Test that changing returned payload doesn't change the cached one."""
+    token = create_access_token({"sub": "user_id"})
+
+    decode_access_token(token)["sub"] = "other_id"
+
+    assert decode_access_token(token)["sub"] == "user_id"
+
+
+def test_cached_payload_expires_with_token(mocker):
+    """Test that cache entry lives no longer than the token."""
+    token = create_access_token({"sub": "user_id"}, expires_delta=timedelta(seconds=60))
+    cache_set = mocker.spy(jwt_module._payload_cache, "set")
+
+    decode_access_token(token)
+
+    assert 0 < cache_set.call_args.kwargs["ttl"] <= 60
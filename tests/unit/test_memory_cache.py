@@ -0,0 +1,116 @@
+import pytest
+
+from src.infrastructure.cache.memory import InMemoryTTLCache
+
+
+@pytest.fixture
+def clock(mocker):
+    """Patch monotonic clock used by the cache."""
+    now = [1000.0]
+    mocker.patch("src.infrastructure.cache.memory.time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def test_get_missing_key():
+    """Test that None is returned for a key that wasn't set."""
+    cache = InMemoryTTLCache(maxsize=2, ttl=10)
+
+    assert cache.get("missing") is None
+
+
+def test_set_and_get(clock):
+    """Test that value is returned until it expires."""
+    cache = InMemoryTTLCache(maxsize=2, ttl=10)
+    cache.set("key", "value")
+
+    clock[0] += 9
+    assert cache.get("key") == "value"
+
+    clock[0] += 1
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_custom_ttl(clock):
+    """Test that per-entry ttl overrides the default one."""
+    cache = InMemoryTTLCache(maxsize=2, ttl=10)
+    cache.set("key", "value", ttl=1)
+
+    clock[0] += 1
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_is_evicted():
+    """Test that the least recently used entry is evicted over maxsize."""
+    cache = InMemoryTTLCache(maxsize=2, ttl=10)
+    cache.set("key1", "value1")
+    cache.set("key2", "value2")
+    cache.get("key1")
+
+    cache.set("key3", "value3")
+
+    assert cache.get("key1") == "value1"
+    assert cache.get("key2") is None
+    assert cache.get("key3") == "value3"
+
+
+def test_pop_and_clear():
+    """Test that entries can be removed one by one and all at once."""
+    cache = InMemoryTTLCache(maxsize=3, ttl=10)
+    cache.set("key1", "value1")
+    cache.set("key2", "value2")
+
+    assert cache.pop("key1") == "value1"
+    assert cache.pop("key1") is None
+    assert cache.get("key1") is None
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+class SizedCache(InMemoryTTLCache):
+
+    """Cache sizing values by their length."""
+
+    def sizeof(self, value):
+        """Size of value is its length."""
+        return len(value)
+
+
+def test_evicted_over_maxbytes():
+    """Test that the least recently used entries are evicted over maxbytes."""
+    cache = SizedCache(maxsize=10, ttl=10, maxbytes=10)
+    cache.set("key1", "aaaa")
+    cache.set("key2", "bbbb")
+
+    cache.set("key3", "cccc")
+
+    assert cache.get("key1") is None
+    assert cache.get("key2") == "bbbb"
+    assert cache.nbytes == 8
+
+
+def test_too_large_value_is_not_stored():
+    """Test that value larger than maxbytes is skipped without evicting others."""
+    cache = SizedCache(maxsize=10, ttl=10, maxbytes=4)
+    cache.set("key1", "aaaa")
+
+    cache.set("key2", "bbbbbb")
+
+    assert cache.get("key1") == "aaaa"
+    assert cache.get("key2") is None
+
+
+def test_nbytes_follow_updates_and_removals():
+    """Test that total size is kept on replace, pop and clear."""
+    cache = SizedCache(maxsize=10, ttl=10, maxbytes=100)
+    cache.set("key1", "aaaa")
+    cache.set("key1", "aa")
+    cache.set("key2", "bbb")
+    assert cache.nbytes == 5
+
+    cache.pop("key1")
+    assert cache.nbytes == 3
+
+    cache.clear()
+    assert cache.nbytes == 0
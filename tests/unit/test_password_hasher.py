@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.core.metrics import metrics
+from src.infrastructure.security.password import PasswordHasher
+
+
+@pytest.fixture(scope="function")
+def password_hasher():
+    """Create PasswordHasher with two workers."""
+    metrics.reset()
+    password_hasher = PasswordHasher(max_workers=2)
+    yield password_hasher
+    password_hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify(password_hasher):
+    """Test that hashed password is verified off the event loop."""
+    hashed_password = await password_hasher.hash("test_password")
+
+    assert await password_hasher.verify("test_password", hashed_password)
+    assert not await password_hasher.verify("wrong_password", hashed_password)
+    assert metrics.get("password_hashing.calls") == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(password_hasher, mocker):
+    """Test that no more than max_workers calls run at once and the rest are queued."""
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+    max_queued = 0
+
+    def slow_verify(plain_password, hashed_password):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return True
+
+    mocker.patch("passlib.context.CryptContext.verify", side_effect=slow_verify)
+
+    async def watch_queue():
+        nonlocal max_queued
+        while True:
+            max_queued = max(max_queued, metrics.get("password_hashing.queued"))
+            await asyncio.sleep(0.01)
+
+    watcher = asyncio.create_task(watch_queue())
+    results = await asyncio.gather(*(password_hasher.verify("p", "h") for _ in range(6)))
+    watcher.cancel()
+
+    assert all(results)
+    assert max_running == 2
+    assert max_queued == 4
+    assert metrics.get("password_hashing.queued") == 0
+    assert metrics.get("password_hashing.running") == 0
+
+
+@pytest.mark.asyncio
+async def test_event_loop_is_not_blocked(password_hasher, mocker):
+    """Test that other coroutines run while password is verified."""
+    mocker.patch(
+        "passlib.context.CryptContext.verify",
+        side_effect=lambda *args: time.sleep(0.3) or True
+    )
+    verification = asyncio.create_task(password_hasher.verify("p", "h"))
+    await asyncio.sleep(0)
+
+    started_at = time.perf_counter()
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+    assert time.perf_counter() - started_at < 0.2
+    assert not verification.done()
+    assert await verification
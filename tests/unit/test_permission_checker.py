@@ -4,7 +4,7 @@ import pytest
 from fastapi import HTTPException
 
 from src.api.dependencies import PermissionChecker
-from src.core.security_policy import Action
+from src.core.security_policy import Action, role_permissions
 from src.domain.models.user import User, UserRole
 
 
@@ -45,3 +45,24 @@ def test_access_denied(user):
 
     with pytest.raises(HTTPException):
         checker(user)
+
+
+def test_custom_role_access(user):
+    """Test that permissions of role created at runtime are checked."""
+    auditor = user.model_copy(update={"role": "auditor"})
+    role_permissions.set_role("auditor", [Action.CHAT_READ.value])
+
+    try:
+        PermissionChecker(Action.CHAT_READ)(auditor)
+        with pytest.raises(HTTPException):
+            PermissionChecker(Action.CHAT_WRITE)(auditor)
+    finally:
+        role_permissions.reset()
+
+
+def test_unknown_role_denied(user):
+    """Test that user with unknown role has no access."""
+    stranger = user.model_copy(update={"role": "stranger"})
+
+    with pytest.raises(HTTPException):
+        PermissionChecker(Action.CHAT_READ)(stranger)
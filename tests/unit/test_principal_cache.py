@@ -0,0 +1,119 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.domain.models.user import Principal, User, UserRole
+from src.infrastructure.cache.memory import UserCache
+from src.infrastructure.cache.principal_cache import PrincipalCache, principal_key
+
+
+@pytest.fixture(scope="function")
+def user():
+    """Create a fixture for user."""
+    return User(
+        id=uuid.uuid4(),
+        username="test_username",
+        role=UserRole.USER,
+        hashed_password="secret_hash",
+        email="test@test.com"
+    )
+
+
+@pytest.fixture(scope="function")
+def mock_redis():
+    """Create AsyncMock for Redis client."""
+    redis = AsyncMock()
+    redis.get.return_value = None
+    return redis
+
+
+@pytest.fixture(scope="function")
+def mock_invalidation():
+    """Create AsyncMock for invalidation channel."""
+    return AsyncMock()
+
+
+@pytest.fixture(scope="function")
+def principal_cache(mock_redis, mock_invalidation):
+    """Create principal cache over mocked Redis."""
+    return PrincipalCache(
+        UserCache(maxsize=10, ttl=60),
+        mock_redis,
+        invalidation=mock_invalidation,
+        ttl=30
+    )
+
+
+@pytest.mark.asyncio
+async def test_put_drops_password_hash(principal_cache, mock_redis, user):
+    """Test that principal is cached in both tiers without password hash."""
+    principal = await principal_cache.put(user)
+
+    assert isinstance(principal, Principal)
+    assert not hasattr(principal, "hashed_password")
+    assert principal.username == user.username
+    assert principal_cache.local.get(user.id) == principal
+
+    key, data = mock_redis.set.call_args.args
+    assert key == principal_key(user.id)
+    assert b"secret_hash" not in data.encode()
+    assert mock_redis.set.call_args.kwargs == {"ex": 30}
+
+
+@pytest.mark.asyncio
+async def test_get_from_local_tier(principal_cache, mock_redis, user):
+    """Test that locally cached principal is served without Redis."""
+    principal = await principal_cache.put(user)
+
+    assert await principal_cache.get(user.id) == principal
+    mock_redis.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_from_redis_fills_local_tier(principal_cache, mock_redis, user):
+    """Test that principal cached by another worker is served and kept locally."""
+    principal = Principal.model_validate(user, from_attributes=True)
+    mock_redis.get.return_value = principal.model_dump_json().encode()
+
+    assert await principal_cache.get(user.id) == principal
+    assert principal_cache.local.get(user.id) == principal
+
+
+@pytest.mark.asyncio
+async def test_get_miss(principal_cache, user):
+    """Test that None is returned if principal isn't cached."""
+    assert await principal_cache.get(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_get_redis_error_is_miss(principal_cache, mock_redis, user):
+    """Test that unavailable Redis makes lookup fall through to the database."""
+    mock_redis.get.side_effect = RedisError("down")
+
+    assert await principal_cache.get(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate(principal_cache, mock_redis, mock_invalidation, user):
+    """Test that invalidated principal is dropped everywhere."""
+    await principal_cache.put(user)
+
+    await principal_cache.invalidate(user.id)
+
+    assert principal_cache.local.get(user.id) is None
+    mock_redis.delete.assert_awaited_once_with(principal_key(user.id))
+    mock_invalidation.publish.assert_awaited_once_with(str(user.id))
+
+
+@pytest.mark.asyncio
+async def test_local_only(user):
+    """Test that cache works without Redis."""
+    principal_cache = PrincipalCache(UserCache(maxsize=10, ttl=60))
+
+    await principal_cache.put(user)
+    assert (await principal_cache.get(user.id)).id == user.id
+
+    await principal_cache.invalidate(user.id)
+    assert await principal_cache.get(user.id) is None
@@ -0,0 +1,73 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.infrastructure.cache.pubsub import PubSubChannel
+
+
+def make_pubsub(messages, error=None):
+    """Create mock for Redis pub/sub which gets messages and then error or hangs."""
+    pubsub = MagicMock()
+    pubsub.subscribe = AsyncMock()
+    pubsub.aclose = AsyncMock()
+
+    async def listen():
+        for message in messages:
+            yield {"type": "message", "data": message}
+        if error is not None:
+            raise error
+        await asyncio.Event().wait()
+
+    pubsub.listen = listen
+    return pubsub
+
+
+@pytest.mark.asyncio
+async def test_publish_is_prefixed_with_origin():
+    """Test that published message carries worker's origin."""
+    redis = MagicMock()
+    redis.publish = AsyncMock()
+    channel = PubSubChannel(redis, "channel", on_message=MagicMock())
+
+    await channel.publish("key")
+
+    redis.publish.assert_awaited_once_with("channel", f"{channel.origin}:key")
+
+
+@pytest.mark.asyncio
+async def test_messages_from_other_workers_are_handled():
+    """Test that own messages are skipped and others are passed to handler."""
+    on_message = MagicMock()
+    redis = MagicMock()
+    channel = PubSubChannel(redis, "channel", on_message=on_message)
+    redis.pubsub.return_value = make_pubsub(
+        [f"{channel.origin}:own", b"other:a:b", "other:c"]
+    )
+
+    await channel.start()
+    await asyncio.sleep(0.01)
+    await channel.stop()
+
+    assert [call.args[0] for call in on_message.call_args_list] == ["a:b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_reset_after_subscription_restored(monkeypatch):
+    """Test that on_reset is called after resubscribing once channel broke."""
+    monkeypatch.setattr(PubSubChannel, "RETRY_INTERVAL", 0)
+    on_reset = MagicMock()
+    redis = MagicMock()
+    redis.pubsub.side_effect = [
+        make_pubsub([], error=ConnectionError("lost")),
+        make_pubsub([]),
+    ]
+    channel = PubSubChannel(redis, "channel", on_message=MagicMock(), on_reset=on_reset)
+
+    await channel.start()
+    await asyncio.sleep(0.01)
+    await channel.stop()
+
+    assert redis.pubsub.call_count == 2
+    on_reset.assert_called_once()
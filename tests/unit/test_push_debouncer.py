@@ -0,0 +1,163 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.domain.models.knowledge import RepositoryChanges
+from src.infrastructure.cache.push_debouncer import PushDebouncer, push_keys
+
+REPOSITORY_ID = uuid4()
+
+
+@pytest.fixture(scope="function")
+def mock_add():
+    """Create AsyncMock for registered script adding a push, asking to flush by default."""
+    return AsyncMock(return_value=1)
+
+
+@pytest.fixture(scope="function")
+def mock_take():
+    """Create AsyncMock for registered script taking pending pushes."""
+    return AsyncMock(return_value=[[], []])
+
+
+@pytest.fixture(scope="function")
+def mock_on_flush():
+    """Create AsyncMock for flush callback."""
+    return AsyncMock()
+
+
+@pytest.fixture(scope="function")
+def debouncer(mock_add, mock_take, mock_on_flush):
+    """Create PushDebouncer over mocked Redis with a short window."""
+    redis = MagicMock()
+    redis.register_script.side_effect = [mock_add, mock_take]
+    return PushDebouncer(redis, on_flush=mock_on_flush, window=0.01, ttl=3600)
+
+
+def make_changes(paths=None, removed_paths=()):
+    """Create changes of the repository."""
+    return RepositoryChanges(
+        repository_id=REPOSITORY_ID,
+        before="a" * 40,
+        after="b" * 40,
+        paths=paths,
+        removed_paths=list(removed_paths)
+    )
+
+
+@pytest.mark.asyncio
+async def test_add_merges_push_into_pending(debouncer, mock_add):
+    """Test that push is sent to Redis with its range, lease and state of paths."""
+    await debouncer.add(make_changes(paths=["src/a.py"], removed_paths=["src/b.py"]))
+    await debouncer.stop()
+
+    mock_add.assert_awaited_once_with(
+        keys=push_keys(REPOSITORY_ID),
+        args=["a" * 40, "b" * 40, 0, 3600, 20, "src/b.py", "removed", "src/a.py", "changed"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_push_of_window_flushes_after_it(
+        debouncer,
+        mock_add,
+        mock_take,
+        mock_on_flush
+):
+    """Test that the worker holding the lease passes merged changes on when window is over."""
+    mock_take.return_value = [
+        [b"before", b"1" * 40, b"after", b"3" * 40],
+        [b"src/a.py", b"changed", b"src/b.py", b"removed", b"src/c.py", b"changed"],
+    ]
+
+    await debouncer.add(make_changes(paths=["src/a.py"]))
+    mock_add.return_value = 0
+    await debouncer.add(make_changes(paths=["src/c.py"]))
+    mock_on_flush.assert_not_awaited()
+    await asyncio.sleep(0.05)
+
+    mock_take.assert_awaited_once_with(keys=push_keys(REPOSITORY_ID))
+    mock_on_flush.assert_awaited_once_with(RepositoryChanges(
+        repository_id=REPOSITORY_ID,
+        before="1" * 40,
+        after="3" * 40,
+        paths=["src/a.py", "src/c.py"],
+        removed_paths=["src/b.py"]
+    ))
+
+
+@pytest.mark.asyncio
+async def test_push_without_lease_isnt_flushed(debouncer, mock_add, mock_take, mock_on_flush):
+    """Test that pushes merged into another worker's window aren't flushed here."""
+    mock_add.return_value = 0
+
+    await debouncer.add(make_changes(paths=["src/a.py"]))
+    await asyncio.sleep(0.05)
+
+    mock_take.assert_not_awaited()
+    mock_on_flush.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_flush_of_unknown_files(debouncer, mock_take, mock_on_flush):
+    """Test that changes with unknown files are flushed as a whole repository's."""
+    mock_take.return_value = [
+        [b"before", b"1" * 40, b"after", b"2" * 40, b"full", b"1"],
+        [b"src/a.py", b"removed"],
+    ]
+
+    await debouncer.flush(REPOSITORY_ID)
+
+    changes = mock_on_flush.await_args.args[0]
+    assert changes.paths is None
+    assert changes.removed_paths == ["src/a.py"]
+
+
+@pytest.mark.asyncio
+async def test_flush_of_nothing(debouncer, mock_on_flush):
+    """Test that nothing is passed on if pending changes were taken already."""
+    await debouncer.flush(REPOSITORY_ID)
+
+    mock_on_flush.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_add_without_redis_flushes_right_away(debouncer, mock_add, mock_on_flush):
+    """Test that push isn't lost when Redis is unavailable."""
+    mock_add.side_effect = RedisError("down")
+    changes = make_changes(paths=["src/a.py"])
+
+    await debouncer.add(changes)
+    await asyncio.sleep(0)
+
+    mock_on_flush.assert_awaited_once_with(changes)
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_logged(debouncer, mock_take, mock_on_flush):
+    """Test that failure of flush callback doesn't escape the debouncer."""
+    mock_take.return_value = [[b"before", b"1" * 40, b"after", b"2" * 40], []]
+    mock_on_flush.side_effect = RuntimeError("db is down")
+
+    await debouncer.flush(REPOSITORY_ID)
+
+    mock_on_flush.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_waiting_changes(debouncer, mock_take, mock_on_flush):
+    """Test that stopped debouncer flushes pending changes right away, not after the window."""
+    mock_take.return_value = [[b"before", b"1" * 40, b"after", b"2" * 40], []]
+    await debouncer.add(make_changes(paths=["src/a.py"]))
+
+    await debouncer.stop()
+
+    mock_take.assert_awaited_once_with(keys=push_keys(REPOSITORY_ID))
+    mock_on_flush.assert_awaited_once()
+
+    await asyncio.sleep(0.05)
+
+    mock_take.assert_awaited_once()
@@ -0,0 +1,79 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.core.metrics import metrics
+from src.core.security_policy import RateLimit
+from src.infrastructure.cache.rate_limiter import RateLimiter, rate_limit_key
+
+LIMIT = RateLimit(rate=1, burst=2)
+
+
+@pytest.fixture(scope="function")
+def mock_script():
+    """Create AsyncMock for registered token bucket script, allowing by default."""
+    return AsyncMock(return_value=b"0")
+
+
+@pytest.fixture(scope="function")
+def limiter(mock_script):
+    """Create RateLimiter over mocked Redis."""
+    metrics.reset()
+    redis = MagicMock()
+    redis.register_script.return_value = mock_script
+    return RateLimiter(redis)
+
+
+@pytest.mark.asyncio
+async def test_acquire_allowed(limiter, mock_script):
+    """Test that request is allowed while the bucket has tokens."""
+    assert await limiter.acquire("chat:write", "user:1", LIMIT) == 0
+
+    mock_script.assert_awaited_once_with(
+        keys=[rate_limit_key("chat:write", "user:1")],
+        args=[LIMIT.rate, LIMIT.burst]
+    )
+    assert metrics.get("rate_limit.throttled") == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_throttled(limiter, mock_script):
+    """Test that throttled request gets time to wait and is counted."""
+    mock_script.return_value = b"0.75"
+
+    assert await limiter.acquire("chat:write", "user:1", LIMIT) == 0.75
+    assert metrics.get("rate_limit.throttled") == 1
+    assert metrics.get("rate_limit.throttled.chat:write") == 1
+
+
+@pytest.mark.asyncio
+async def test_throttled_client_checked_locally(limiter, mock_script):
+    """Test that throttled client's requests are rejected without Redis until a token is due."""
+    mock_script.return_value = b"10"
+    await limiter.acquire("chat:write", "user:1", LIMIT)
+
+    retry_after = await limiter.acquire("chat:write", "user:1", LIMIT)
+
+    assert 0 < retry_after <= 10
+    mock_script.assert_awaited_once()
+    assert metrics.get("rate_limit.throttled") == 2
+
+
+@pytest.mark.asyncio
+async def test_other_clients_not_affected(limiter, mock_script):
+    """Test that throttling of one client doesn't reject others locally."""
+    mock_script.return_value = b"10"
+    await limiter.acquire("chat:write", "user:1", LIMIT)
+    mock_script.return_value = b"0"
+
+    assert await limiter.acquire("chat:write", "user:2", LIMIT) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_error_fails_open(limiter, mock_script):
+    """Test that requests are let through if Redis is unavailable."""
+    mock_script.side_effect = RedisError("down")
+
+    assert await limiter.acquire("chat:write", "user:1", LIMIT) == 0
+    assert metrics.get("rate_limit.errors") == 1
@@ -0,0 +1,260 @@
+import asyncio
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.core.metrics import metrics
+from src.core.settings import settings
+from src.domain.models.chat import Message
+from src.infrastructure.cache.codecs import CacheEntry, MsgpackCodec
+from src.infrastructure.cache.keys import answer_cache_key
+from src.infrastructure.cache.repositories.redis_cache_repo import RedisCacheRepository
+
+
+def make_message(content="answer"):
+    """Create assistant's Message."""
+    return Message(
+        id=uuid4(),
+        role="assistant",
+        content=content,
+        created_at=datetime.now()
+    )
+
+
+@pytest.fixture(scope="function")
+def mock_lock():
+    """Create mock for Redis lock."""
+    lock = MagicMock()
+    lock.acquire = AsyncMock(return_value=True)
+    lock.release = AsyncMock()
+    lock.locked = AsyncMock(return_value=True)
+    return lock
+
+
+@pytest.fixture(scope="function")
+def mock_redis(mock_lock):
+    """Create mock for Redis client."""
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=None)
+    redis.set = AsyncMock()
+    redis.lock.return_value = mock_lock
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_hit(mock_redis):
+    """Test that cached value is returned without generation and locking."""
+    message = make_message()
+    mock_redis.get.return_value = MsgpackCodec().encode(CacheEntry(message=message))
+    generate = AsyncMock()
+
+    metrics.reset()
+
+    result = await RedisCacheRepository(mock_redis).get_or_generate("key", generate)
+
+    assert result == message
+    generate.assert_not_called()
+    mock_redis.lock.assert_not_called()
+    assert metrics.get("cache.exact_hits") == 1
+    assert metrics.get("cache.misses") == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_miss_under_lock(mock_redis, mock_lock):
+    """Test that lock holder generates and puts value, then releases the lock."""
+    message = make_message()
+    generate = AsyncMock(return_value=message)
+    metrics.reset()
+
+    result = await RedisCacheRepository(mock_redis).get_or_generate(
+        "key",
+        generate,
+        query="question"
+    )
+
+    assert result == message
+    generate.assert_awaited_once()
+    assert metrics.get("cache.misses") == 1
+    mock_redis.lock.assert_called_once()
+    assert mock_redis.lock.call_args.args[0] == "lock:key"
+    mock_redis.set.assert_awaited_once()
+    assert mock_redis.set.call_args.kwargs["name"] == "key"
+    entry = MsgpackCodec().decode(mock_redis.set.call_args.kwargs["value"])
+    assert entry.query == "question"
+    assert entry.message == message
+    mock_lock.release.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_waits_for_lock_holder(mock_redis, mock_lock, monkeypatch):
+    """Test that worker without lock takes the value generated by the lock holder."""
+    monkeypatch.setattr(settings, "CACHE_LOCK_POLL_INTERVAL", 0)
+    message = make_message()
+    mock_lock.acquire.return_value = False
+    mock_redis.get.side_effect = [None, None, MsgpackCodec().encode(CacheEntry(message=message))]
+    generate = AsyncMock()
+
+    result = await RedisCacheRepository(mock_redis).get_or_generate("key", generate)
+
+    assert result == message
+    generate.assert_not_called()
+    mock_redis.set.assert_not_called()
+    mock_lock.release.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_lock_holder_failed(mock_redis, mock_lock, monkeypatch):
+    """Test that value is generated if lock is gone but value didn't appear."""
+    monkeypatch.setattr(settings, "CACHE_LOCK_POLL_INTERVAL", 0)
+    message = make_message()
+    mock_lock.acquire.return_value = False
+    mock_lock.locked.return_value = False
+    generate = AsyncMock(return_value=message)
+
+    result = await RedisCacheRepository(mock_redis).get_or_generate("key", generate)
+
+    assert result == message
+    generate.assert_awaited_once()
+    mock_redis.set.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_cached_value_invalid(mock_redis):
+    """Test that error is raised for malformed cached value."""
+    mock_redis.get.return_value = b'{"content": "answer"}'
+
+    with pytest.raises(ValueError):
+        await RedisCacheRepository(mock_redis).get_cached_value("key")
+
+
+@pytest.mark.asyncio
+async def test_construct_cache_key_folds_generations(mock_redis):
+    """Test that key is built from repositories' current generations."""
+    repo_ids = [uuid4(), uuid4()]
+    first, second = sorted(str(repo_id) for repo_id in repo_ids)
+    mock_redis.mget = AsyncMock(return_value=[b"3", None])
+
+    key = await RedisCacheRepository(mock_redis).construct_cache_key("question", repo_ids)
+
+    mock_redis.mget.assert_awaited_once_with([f"generation:{first}", f"generation:{second}"])
+    assert key == answer_cache_key("question", repo_ids, {first: 3, second: 0})
+    assert key != answer_cache_key("question", repo_ids)
+
+
+@pytest.mark.asyncio
+async def test_bump_generations(mock_redis):
+    """Test that generation of every repository is incremented in one round trip."""
+    repo_id = uuid4()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1])
+    mock_redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    mock_redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    await RedisCacheRepository(mock_redis).bump_generations([repo_id, repo_id])
+
+    pipe.incr.assert_called_once_with(f"generation:{repo_id}")
+    pipe.execute.assert_awaited_once()
+
+
+def encoded(message, fresh_until):
+    """Encode cache entry with given freshness."""
+    return MsgpackCodec().encode(CacheEntry(message=message, fresh_until=fresh_until))
+
+
+@pytest.mark.asyncio
+async def test_put_cache_value_sets_soft_and_hard_ttl(mock_redis):
+    """Test that value is fresh for soft TTL and expires after hard TTL."""
+    before = time.time()
+
+    await RedisCacheRepository(mock_redis).put_cache_value("key", make_message())
+
+    kwargs = mock_redis.set.call_args.kwargs
+    assert kwargs["ex"] == settings.CACHE_TTL
+    fresh_until = MsgpackCodec().decode(kwargs["value"]).fresh_until
+    assert before + settings.CACHE_SOFT_TTL <= fresh_until <= time.time() + settings.CACHE_SOFT_TTL
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_is_not_refreshed(mock_redis):
+    """Test that fresh value doesn't start refresh."""
+    metrics.reset()
+    message = make_message()
+    mock_redis.get.return_value = encoded(message, time.time() + 60)
+    cache_repo = RedisCacheRepository(mock_redis)
+
+    assert await cache_repo.get_or_generate("key", AsyncMock()) == message
+
+    assert len(cache_repo.single_flight) == 0
+    assert metrics.get("cache.stale_hits") == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_hit_is_served_and_refreshed(mock_redis, mock_lock):
+    """Test that stale value is returned right away and refreshed in background once."""
+    metrics.reset()
+    stale, fresh = make_message("stale"), make_message("fresh")
+    mock_redis.get.return_value = encoded(stale, time.time() - 1)
+    generate = AsyncMock(return_value=fresh)
+    cache_repo = RedisCacheRepository(mock_redis)
+
+    results = await asyncio.gather(
+        cache_repo.get_or_generate("key", generate, query="question"),
+        cache_repo.get_or_generate("key", generate, query="question")
+    )
+    assert results == [stale, stale]
+
+    await cache_repo.single_flight.launch("refresh:key", AsyncMock())
+
+    generate.assert_awaited_once()
+    assert MsgpackCodec().decode(mock_redis.set.call_args.kwargs["value"]).message == fresh
+    mock_lock.release.assert_awaited_once()
+    assert metrics.get("cache.stale_hits") == 2
+    assert metrics.get("cache.exact_hits") == 2
+    assert metrics.get("cache.refreshes") == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_put_through_outer_tier(mock_redis, mock_lock):
+    """Test that refreshed value is put by put_refreshed, e.g. tiered cache's put."""
+    mock_redis.get.return_value = encoded(make_message("stale"), time.time() - 1)
+    fresh = make_message("fresh")
+    cache_repo = RedisCacheRepository(mock_redis)
+    cache_repo.put_refreshed = AsyncMock()
+
+    await cache_repo.get_or_generate("key", AsyncMock(return_value=fresh), query="question")
+    await cache_repo.single_flight.launch("refresh:key", AsyncMock())
+
+    cache_repo.put_refreshed.assert_awaited_once_with(key="key", message=fresh, query="question")
+
+
+@pytest.mark.asyncio
+async def test_refresh_skipped_without_lock(mock_redis, mock_lock):
+    """Test that value isn't refreshed if another worker holds the lock."""
+    mock_redis.get.return_value = encoded(make_message(), time.time() - 1)
+    mock_lock.acquire.return_value = False
+    generate = AsyncMock()
+    cache_repo = RedisCacheRepository(mock_redis)
+
+    await cache_repo.get_or_generate("key", generate)
+    await cache_repo.single_flight.launch("refresh:key", AsyncMock())
+
+    generate.assert_not_called()
+    mock_redis.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_refresh_error_is_counted(mock_redis, mock_lock):
+    """Test that failed refresh keeps stale value and is counted."""
+    metrics.reset()
+    mock_redis.get.return_value = encoded(make_message(), time.time() - 1)
+    cache_repo = RedisCacheRepository(mock_redis)
+
+    await cache_repo.get_or_generate("key", AsyncMock(side_effect=RuntimeError("llm is down")))
+    await cache_repo.single_flight.launch("refresh:key", AsyncMock())
+
+    mock_redis.set.assert_not_called()
+    mock_lock.release.assert_awaited_once()
+    assert metrics.get("cache.refresh_errors") == 1
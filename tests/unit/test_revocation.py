@@ -0,0 +1,170 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.infrastructure.cache.revocation import TokenRevocationList, revoked_key
+
+
+def scan_iter(*keys):
+    """Create fake scan_iter yielding given keys."""
+    async def _scan_iter(*args, **kwargs):
+        for key in keys:
+            yield key
+
+    return _scan_iter
+
+
+@pytest.fixture(scope="function")
+def mock_redis():
+    """Create mock for Redis client with no revoked tokens."""
+    redis = MagicMock()
+    redis.set = AsyncMock()
+    redis.exists = AsyncMock(return_value=0)
+    redis.publish = AsyncMock()
+    redis.scan_iter = scan_iter()
+    return redis
+
+
+@pytest.fixture(scope="function")
+def revocations(mock_redis):
+    """Create revocation list over mocked Redis."""
+    return TokenRevocationList(
+        mock_redis,
+        "token:revocation",
+        capacity=100,
+        false_positive_rate=0.01
+    )
+
+
+@pytest.mark.asyncio
+async def test_not_revoked_checked_locally(revocations, mock_redis):
+    """Test that Redis isn't consulted for tokens the filter doesn't contain."""
+    await revocations.load()
+
+    assert not await revocations.is_revoked("jti")
+    mock_redis.exists.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_revoke(revocations, mock_redis):
+    """Test that revoked id is stored until the token expires and broadcast."""
+    await revocations.load()
+    mock_redis.exists.return_value = 1
+
+    await revocations.revoke("jti", expires_at=time.time() + 60)
+
+    key, value = mock_redis.set.call_args.args
+    assert key == revoked_key("jti")
+    assert 0 < mock_redis.set.call_args.kwargs["ex"] <= 61
+    assert mock_redis.publish.call_args.args[1].endswith(":jti")
+    assert await revocations.is_revoked("jti")
+    mock_redis.exists.assert_awaited_once_with(revoked_key("jti"))
+
+
+@pytest.mark.asyncio
+async def test_revoke_expired_token(revocations, mock_redis):
+    """Test that expired token isn't stored."""
+    await revocations.revoke("jti", expires_at=time.time() - 60)
+
+    mock_redis.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_load_from_redis(revocations, mock_redis):
+    """Test that filter is filled with ids revoked before start."""
+    mock_redis.scan_iter = scan_iter(revoked_key("first").encode(), revoked_key("second"))
+
+    await revocations.load()
+
+    assert revocations.synced
+    assert "first" in revocations.bloom
+    assert "second" in revocations.bloom
+
+
+@pytest.mark.asyncio
+async def test_revoked_by_other_worker(revocations):
+    """Test that ids received over pub/sub are added to the filter."""
+    await revocations.load()
+
+    revocations.channel._handle(b"other:jti")
+
+    assert "jti" in revocations.bloom
+
+
+@pytest.mark.asyncio
+async def test_not_synced_checks_redis(revocations, mock_redis):
+    """Test that every check goes to Redis until the filter is loaded."""
+    assert not await revocations.is_revoked("jti")
+    mock_redis.exists.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_not_synced_retries_load(revocations, mock_redis):
+    """Test that the filter failed to load is loaded again on the next check."""
+    mock_redis.scan_iter = MagicMock(side_effect=RedisError("down"))
+    await revocations.load()
+    mock_redis.scan_iter = scan_iter(revoked_key("first"))
+
+    await revocations.is_revoked("jti")
+    await revocations._load_task
+
+    assert revocations.synced
+    assert "first" in revocations.bloom
+
+
+@pytest.mark.asyncio
+async def test_redis_error_fails_closed(revocations, mock_redis):
+    """Test that filter's positive is rejected if Redis is unavailable."""
+    await revocations.load()
+    revocations.channel._handle(b"other:jti")
+    mock_redis.exists.side_effect = RedisError("down")
+
+    assert await revocations.is_revoked("jti")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fail_closed", [False, True])
+async def test_redis_error_not_synced(mock_redis, fail_closed):
+    """Test that without the filter tokens are rejected if Redis is unavailable only if set so."""
+    revocations = TokenRevocationList(
+        mock_redis,
+        "token:revocation",
+        capacity=100,
+        false_positive_rate=0.01,
+        fail_closed=fail_closed
+    )
+    mock_redis.scan_iter = MagicMock(side_effect=RedisError("down"))
+    mock_redis.exists.side_effect = RedisError("down")
+
+    assert await revocations.is_revoked("jti") == fail_closed
+
+
+@pytest.mark.asyncio
+async def test_old_filter_served_while_rebuilt(revocations, mock_redis):
+    """Test that checks are answered by the old filter until the new one is loaded."""
+    await revocations.load()
+    scanned = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_scan_iter(*args, **kwargs):
+        scanned.set()
+        await release.wait()
+        yield revoked_key("first")
+
+    mock_redis.scan_iter = slow_scan_iter
+
+    revocations.reset()
+    await scanned.wait()
+    revocations.channel._handle(b"other:second")
+
+    assert not await revocations.is_revoked("first")
+    mock_redis.exists.assert_not_called()
+
+    release.set()
+    await revocations._load_task
+
+    assert "first" in revocations.bloom
+    assert "second" in revocations.bloom
@@ -0,0 +1,134 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import RedisError
+
+from src.core.security_policy import (
+    ACTION_BITS,
+    ROLE_PERMISSIONS,
+    Action,
+    RolePermissions,
+    compile_permissions,
+)
+from src.domain.models.user import Role, UserRole
+from src.infrastructure.cache.role_sync import ROLES_VERSION_KEY, RolePermissionsSync
+
+
+def test_compile_permissions():
+    """Test that known permissions are compiled to bits and unknown ones are ignored."""
+    mask = compile_permissions(["chat:read", "repo:read", "chat:use"])
+
+    assert mask == ACTION_BITS[Action.CHAT_READ] | ACTION_BITS[Action.REPO_READ]
+
+
+def test_built_in_roles():
+    """Test that built-in roles have permissions of ROLE_PERMISSIONS."""
+    permissions = RolePermissions()
+
+    for role, actions in ROLE_PERMISSIONS.items():
+        for action in Action:
+            assert permissions.allows(role.value, ACTION_BITS[action]) == (action in actions)
+
+
+def test_load_keeps_built_in_roles():
+    """Test that loaded roles replace previously loaded ones, but not built-in ones."""
+    permissions = RolePermissions()
+    permissions.set_role("old", ["chat:read"])
+
+    permissions.load({"auditor": ["chat:read"]}, version=3)
+
+    assert permissions.version == 3
+    assert permissions.allows("auditor", ACTION_BITS[Action.CHAT_READ])
+    assert not permissions.allows("old", ACTION_BITS[Action.CHAT_READ])
+    assert permissions.allows(UserRole.USER.value, ACTION_BITS[Action.CHAT_READ])
+
+
+def test_built_in_roles_arent_overridden():
+    """Test that roles named as built-in ones don't change their permissions."""
+    permissions = RolePermissions()
+    admin_access = ACTION_BITS[Action.ADMIN_ACCESS]
+
+    permissions.load({UserRole.USER.value: ["admin:access"]}, version=1)
+    permissions.set_role(UserRole.USER.value, ["admin:access"])
+    permissions.set_role(UserRole.ADMIN.value, [])
+
+    assert not permissions.allows(UserRole.USER.value, admin_access)
+    assert permissions.allows(UserRole.ADMIN.value, admin_access)
+
+
+@pytest.fixture(scope="function")
+def mock_redis():
+    """Create mock for Redis client."""
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=b"5")
+    redis.incr = AsyncMock(return_value=6)
+    redis.publish = AsyncMock()
+    return redis
+
+
+@pytest.fixture(scope="function")
+def role_sync(mock_redis):
+    """Create synchronizer loading one custom role."""
+    load_roles = AsyncMock(return_value=[
+        Role(id=uuid4(), name="auditor", permissions=["chat:read"])
+    ])
+    return RolePermissionsSync(mock_redis, "roles:changes", load_roles, RolePermissions())
+
+
+@pytest.mark.asyncio
+async def test_reload(role_sync):
+    """Test that roles and their version are loaded."""
+    await role_sync.reload()
+
+    assert role_sync.permissions.version == 5
+    assert role_sync.permissions.allows("auditor", ACTION_BITS[Action.CHAT_READ])
+
+
+@pytest.mark.asyncio
+async def test_publish(role_sync, mock_redis):
+    """Test that changed role is applied locally and sent with the next version."""
+    await role_sync.reload()
+
+    await role_sync.publish(Role(id=uuid4(), name="writer", permissions=["chat:write"]))
+
+    mock_redis.incr.assert_awaited_once_with(ROLES_VERSION_KEY)
+    message = json.loads(mock_redis.publish.call_args.args[1].partition(":")[2])
+    assert message == {"version": 6, "name": "writer", "permissions": ["chat:write"]}
+    assert role_sync.permissions.version == 6
+    assert role_sync.permissions.allows("writer", ACTION_BITS[Action.CHAT_WRITE])
+
+
+@pytest.mark.asyncio
+async def test_publish_redis_error(role_sync, mock_redis):
+    """Test that changed role is applied locally if Redis is unavailable."""
+    mock_redis.incr.side_effect = RedisError("down")
+
+    await role_sync.publish(Role(id=uuid4(), name="writer", permissions=["chat:write"]))
+
+    assert role_sync.permissions.allows("writer", ACTION_BITS[Action.CHAT_WRITE])
+
+
+@pytest.mark.asyncio
+async def test_receive_next_version(role_sync, mocker):
+    """Test that role changed by another worker is applied without reload."""
+    await role_sync.reload()
+    reset = mocker.patch.object(role_sync, "reset")
+
+    role_sync._receive(json.dumps({"version": 6, "name": "writer", "permissions": ["chat:write"]}))
+
+    reset.assert_not_called()
+    assert role_sync.permissions.version == 6
+    assert role_sync.permissions.allows("writer", ACTION_BITS[Action.CHAT_WRITE])
+
+
+@pytest.mark.asyncio
+async def test_receive_version_gap(role_sync, mocker):
+    """Test that all roles are reloaded if changes were missed."""
+    await role_sync.reload()
+    reset = mocker.patch.object(role_sync, "reset")
+
+    role_sync._receive(json.dumps({"version": 8, "name": "writer", "permissions": []}))
+
+    reset.assert_called_once()
@@ -0,0 +1,288 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.core.metrics import metrics
+from src.domain.models.chat import Message
+from src.infrastructure.cache.keys import answer_cache_key, scope_of_key
+from src.infrastructure.cache.repositories.semantic_cache_repo import SemanticCacheRepository
+from src.infrastructure.cache.semantic import HashingEmbedder, SemanticIndex
+
+
+def unit(*values):
+    """Create normalized float32 vector."""
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def make_message(content="answer"):
+    """Create assistant's Message."""
+    return Message(
+        id=uuid4(),
+        role="assistant",
+        content=content,
+        created_at=datetime.now()
+    )
+
+
+@pytest.mark.asyncio
+async def test_embedder_is_normalized_and_deterministic():
+    """Test that embeddings are unit float32 vectors stable between calls."""
+    embedder = HashingEmbedder(dim=64)
+
+    vector = await embedder.embed("How do I run the tests?")
+
+    assert vector.dtype == np.float32
+    assert vector.shape == (64,)
+    assert np.isclose(np.linalg.norm(vector), 1)
+    assert np.array_equal(vector, await HashingEmbedder(dim=64).embed("how do i run the tests"))
+    assert not (await embedder.embed("???")).any()
+
+
+@pytest.mark.asyncio
+async def test_embedder_similarity():
+    """Test that paraphrases are closer than unrelated questions."""
+    embedder = HashingEmbedder(dim=512)
+    query = await embedder.embed("How do I run the tests?")
+
+    paraphrase = float(query @ await embedder.embed("How can I run the tests"))
+    unrelated = float(query @ await embedder.embed("Where is the database configured?"))
+
+    assert paraphrase > unrelated
+
+
+def test_index_search_is_scoped():
+    """Test that the most similar key is found only within its scope."""
+    index = SemanticIndex(dim=2, scope_size=10, max_scopes=10)
+    index.add("a", unit(1, 0), "key1")
+    index.add("a", unit(0, 1), "key2")
+    index.add("b", unit(1, 0), "key3")
+
+    key, score = index.search("a", unit(1, 0.1))
+
+    assert key == "key1"
+    assert score == pytest.approx(0.995, abs=1e-3)
+    assert index.search("c", unit(1, 0)) is None
+
+
+def test_index_grows_and_overwrites_oldest():
+    """Test that scope's matrix grows up to scope_size and then reuses the oldest rows."""
+    index = SemanticIndex(dim=2, scope_size=100, max_scopes=10)
+    for i in range(100):
+        index.add("a", unit(1, i), f"key{i}")
+    assert index.search("a", unit(1, 99))[0] == "key99"
+
+    index.add("a", unit(-1, 0), "new")
+
+    assert index.search("a", unit(-1, 0))[0] == "new"
+    assert index.search("a", unit(1, 0))[0] != "key0"
+
+
+def test_index_discard_and_scopes_bound():
+    """Test that discarded keys aren't found and the least recently used scope is dropped."""
+    index = SemanticIndex(dim=2, scope_size=10, max_scopes=2)
+    index.add("a", unit(1, 0), "key1")
+    index.discard("a", "key1")
+    assert index.search("a", unit(1, 0)) is None
+
+    index.add("b", unit(1, 0), "key2")
+    index.add("c", unit(1, 0), "key3")
+
+    assert len(index) == 2
+    assert index.search("a", unit(1, 0)) is None
+
+
+@pytest.fixture(scope="function")
+def mock_exact():
+    """Create AsyncMock for exact cache tier."""
+    exact = AsyncMock()
+    exact.get_cached_value.return_value = None
+    return exact
+
+
+@pytest.fixture(scope="function")
+def cache_repo(mock_exact):
+    """Create semantic cache repository."""
+    metrics.reset()
+    return SemanticCacheRepository(
+        exact=mock_exact,
+        index=SemanticIndex(dim=512, scope_size=10, max_scopes=10),
+        embedder=HashingEmbedder(dim=512),
+        threshold=0.9
+    )
+
+
+def key_of(query, repo_ids, generations=None):
+    """Build answer's cache key."""
+    return answer_cache_key(query, repo_ids, generations)
+
+
+@pytest.mark.asyncio
+async def test_paraphrase_is_served_from_similar_query(cache_repo, mock_exact):
+    """Test that value of similar query in the same scope is returned as semantic hit."""
+    repo_ids = [uuid4(), uuid4()]
+    message = make_message()
+    cached_key = key_of("How do I run the tests?", repo_ids)
+    await cache_repo.put_cache_value(cached_key, message, "How do I run the tests?")
+    mock_exact.get_cached_value.side_effect = lambda key: message if key == cached_key else None
+
+    query = "how do I run the TESTS, please"
+    result = await cache_repo.get_cached_value(key_of(query, repo_ids), query)
+
+    assert result == message
+    assert metrics.get("cache.semantic_hits") == 1
+    assert metrics.get("cache.exact_hits") == 0
+
+    query = "How do I run the tests?!"
+    other_scopes = [
+        key_of(query, [uuid4()]),
+        key_of(query, repo_ids, {str(repo_ids[0]): 1})
+    ]
+    for key in other_scopes:
+        assert await cache_repo.get_cached_value(key, query) is None
+    assert metrics.get("cache.misses") == 2
+
+
+@pytest.mark.asyncio
+async def test_dissimilar_query_misses(cache_repo, mock_exact):
+    """Test that query below threshold isn't answered."""
+    repo_ids = [uuid4()]
+    await cache_repo.put_cache_value(
+        key_of("How do I run the tests?", repo_ids),
+        make_message(),
+        "How do I run the tests?"
+    )
+    key = key_of("Where is the database?", repo_ids)
+
+    result = await cache_repo.get_cached_value(key, "Where is the database?")
+
+    assert result is None
+    mock_exact.get_cached_value.assert_awaited_once_with(key)
+
+
+@pytest.mark.asyncio
+async def test_expired_similar_value_is_discarded(cache_repo, mock_exact):
+    """Test that similar query whose value expired is removed from index."""
+    repo_ids = [uuid4()]
+    query = "How do I run the tests?"
+    key = key_of(query, repo_ids)
+    await cache_repo.put_cache_value(key, make_message(), query)
+
+    assert await cache_repo.get_cached_value(key_of("x", repo_ids), query) is None
+    assert cache_repo.index.search(scope_of_key(key), await cache_repo._embed(query)) is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_exact_hit(cache_repo, mock_exact):
+    """Test that exact hit is returned by exact tier without generation."""
+    key = key_of("How to deploy?", [uuid4()])
+    message = make_message()
+    mock_exact.get_or_generate.return_value = message
+    generate = AsyncMock()
+
+    result = await cache_repo.get_or_generate(key, generate, "How to deploy?")
+
+    assert result == message
+    generate.assert_not_called()
+    assert mock_exact.get_or_generate.call_args.kwargs["key"] == key
+    vector = await cache_repo._embed("How to deploy")
+    assert cache_repo.index.search(scope_of_key(key), vector)[0] == key
+
+
+@pytest.fixture(scope="function")
+def exact_generating(mock_exact):
+    """Make exact tier's get_or_generate miss and call generate."""
+    async def get_or_generate(key, generate, query):
+        return await generate()
+
+    mock_exact.get_or_generate.side_effect = get_or_generate
+    return mock_exact
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_miss(cache_repo, exact_generating):
+    """Test that answer is generated when neither exact nor similar value is cached."""
+    key = key_of("How to deploy?", [uuid4()])
+    message = make_message()
+    generate = AsyncMock(return_value=message)
+
+    assert await cache_repo.get_or_generate(key, generate, "How to deploy?") == message
+
+    generate.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_similar(cache_repo, exact_generating):
+    """Test that similar query's value is used instead of generation."""
+    repo_ids = [uuid4()]
+    similar_key = key_of("How do I deploy it?", repo_ids)
+    message = make_message()
+    await cache_repo.put_cache_value(similar_key, message, "How do I deploy it?")
+    exact_generating.get_cached_value.side_effect = (
+        lambda key: message if key == similar_key else None
+    )
+    generate = AsyncMock()
+
+    query = "how do I deploy it, please"
+    result = await cache_repo.get_or_generate(key_of(query, repo_ids), generate, query)
+
+    assert result == message
+    generate.assert_not_called()
+    assert metrics.get("cache.semantic_hits") == 1
+    # similarity is probed on the exact tier's miss, without a lookup of its own
+    exact_generating.get_cached_value.assert_awaited_once_with(similar_key)
+    # similar query's answer isn't put under the key, so it can't outlive the similar one
+    exact_generating.put_cache_value.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_generated(cache_repo, mock_exact):
+    """Test that exact tier's refresh after a stale hit generates, not takes a similar value."""
+    repo_ids = [uuid4()]
+    similar_key = key_of("How do I deploy it?", repo_ids)
+    await cache_repo.put_cache_value(similar_key, make_message("similar"), "How do I deploy it?")
+    refreshes = []
+
+    async def get_or_generate(key, generate, query):
+        refreshes.append(generate)
+        return make_message("stale")
+
+    mock_exact.get_or_generate.side_effect = get_or_generate
+    fresh = make_message("fresh")
+
+    query = "how do I deploy it, please"
+    await cache_repo.get_or_generate(key_of(query, repo_ids), AsyncMock(return_value=fresh), query)
+
+    assert await refreshes[0]() == fresh
+
+
+@pytest.mark.asyncio
+async def test_embedding_failure_generates(cache_repo, exact_generating):
+    """Test that query is generated when it can't be embedded."""
+    cache_repo.embedder = AsyncMock()
+    cache_repo.embedder.embed.side_effect = ValueError("embedding service is down")
+    message = make_message("generated")
+    generate = AsyncMock(return_value=message)
+
+    query = "How to deploy?"
+    result = await cache_repo.get_or_generate(key_of(query, [uuid4()]), generate, query)
+
+    assert result == message
+    generate.assert_awaited_once()
+    assert metrics.get("cache.semantic_hits") == 0
+
+
+@pytest.mark.asyncio
+async def test_refresh_does_not_reuse_own_value(cache_repo, exact_generating):
+    """Test that the key's own stale value isn't taken as a similar one."""
+    key = key_of("How to deploy?", [uuid4()])
+    stale, fresh = make_message("stale"), make_message("fresh")
+    await cache_repo.put_cache_value(key, stale, "How to deploy?")
+    exact_generating.get_cached_value.return_value = stale
+
+    result = await cache_repo.get_or_generate(key, AsyncMock(return_value=fresh), "How to deploy?")
+
+    assert result == fresh
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.cache.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_run():
+    """Test that concurrent calls with the same key run fn once and get its result."""
+    single_flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def generate():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "answer"
+
+    callers = [asyncio.create_task(single_flight.do("key", generate)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers) == ["answer"] * 5
+    assert calls == 1
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    """Test that calls with different keys aren't coalesced."""
+    single_flight = SingleFlight()
+
+    async def generate(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        single_flight.do("a", lambda: generate("a")),
+        single_flight.do("b", lambda: generate("b"))
+    )
+
+    assert results == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_error_is_shared_and_not_cached():
+    """Test that all waiters get the error and the next call runs fn again."""
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("llm is down")
+
+    results = await asyncio.gather(
+        single_flight.do("key", failing),
+        single_flight.do("key", failing),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert calls == 1
+
+    with pytest.raises(RuntimeError):
+        await single_flight.do("key", failing)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    """Test that the run survives cancellation of the caller that started it."""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def generate():
+        await release.wait()
+        return "answer"
+
+    first = asyncio.create_task(single_flight.do("key", generate))
+    second = asyncio.create_task(single_flight.do("key", generate))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+
+    assert await second == "answer"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_launch_runs_in_background_once():
+    """Test that launched fn isn't started again while it's running."""
+    single_flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+
+    task = single_flight.launch("key", refresh)
+    assert single_flight.launch("key", refresh) is task
+
+    release.set()
+    await task
+
+    assert calls == 1
+    assert len(single_flight) == 0
@@ -0,0 +1,129 @@
+from datetime import datetime
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from src.core.metrics import metrics
+from src.domain.models.chat import Message
+from src.infrastructure.cache.memory import MessageCache
+from src.infrastructure.cache.repositories.tiered_cache_repo import TieredCacheRepository
+
+
+def make_message(content="answer"):
+    """Create assistant's Message."""
+    return Message(
+        id=uuid4(),
+        role="assistant",
+        content=content,
+        created_at=datetime.now()
+    )
+
+
+@pytest.fixture(scope="function")
+def mock_remote():
+    """Create AsyncMock for shared cache tier."""
+    remote = AsyncMock()
+    remote.get_cached_value.return_value = None
+    return remote
+
+
+@pytest.fixture(scope="function")
+def mock_invalidation():
+    """Create AsyncMock for invalidation channel."""
+    return AsyncMock()
+
+
+@pytest.fixture(scope="function")
+def cache_repo(mock_remote, mock_invalidation):
+    """Create two-tier cache repository."""
+    return TieredCacheRepository(
+        remote=mock_remote,
+        local=MessageCache(maxsize=10, ttl=60, maxbytes=1024 * 1024),
+        invalidation=mock_invalidation
+    )
+
+
+@pytest.mark.asyncio
+async def test_remote_hit_is_kept_locally(cache_repo, mock_remote):
+    """Test that value from Redis is served from memory next time."""
+    message = make_message()
+    mock_remote.get_cached_value.return_value = message
+
+    assert await cache_repo.get_cached_value("key") == message
+    assert await cache_repo.get_cached_value("key") == message
+
+    mock_remote.get_cached_value.assert_awaited_once_with("key")
+
+
+@pytest.mark.asyncio
+async def test_miss(cache_repo, mock_remote):
+    """Test that None is returned and not cached locally on miss."""
+    assert await cache_repo.get_cached_value("key") is None
+    assert await cache_repo.get_cached_value("key") is None
+
+    assert mock_remote.get_cached_value.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_put_invalidates_other_workers(cache_repo, mock_remote, mock_invalidation):
+    """Test that put value goes to both tiers and its key is broadcast."""
+    message = make_message()
+
+    await cache_repo.put_cache_value(key="key", message=message, query="question")
+
+    mock_remote.put_cache_value.assert_awaited_once_with(
+        key="key",
+        message=message,
+        query="question"
+    )
+    mock_invalidation.publish.assert_awaited_once_with("key")
+    assert await cache_repo.get_cached_value("key") == message
+    mock_remote.get_cached_value.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_local_hit(cache_repo, mock_remote):
+    """Test that local hit doesn't reach Redis."""
+    message = make_message()
+    cache_repo.local.set("key", message)
+    metrics.reset()
+
+    assert await cache_repo.get_or_generate(key="key", generate=AsyncMock()) == message
+
+    mock_remote.get_or_generate.assert_not_called()
+    assert metrics.get("cache.exact_hits") == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_local_miss(cache_repo, mock_remote):
+    """Test that local miss is delegated to Redis tier and kept locally."""
+    message = make_message()
+    generate = AsyncMock()
+    mock_remote.get_or_generate.return_value = message
+
+    assert await cache_repo.get_or_generate(key="key", generate=generate) == message
+
+    mock_remote.get_or_generate.assert_awaited_once_with(
+        key="key",
+        generate=generate,
+        query=None
+    )
+    assert cache_repo.local.get("key") == message
+
+
+@pytest.mark.asyncio
+async def test_keys_and_generations_are_delegated(cache_repo, mock_remote):
+    """Test that key construction and generations are handled by Redis tier."""
+    repo_ids = [uuid4()]
+    mock_remote.construct_cache_key.return_value = "key"
+
+    assert await cache_repo.construct_cache_key(query="question", repository_ids=repo_ids) \
+        == "key"
+    await cache_repo.bump_generations(repo_ids)
+
+    mock_remote.construct_cache_key.assert_awaited_once_with(
+        query="question",
+        repository_ids=repo_ids
+    )
+    mock_remote.bump_generations.assert_awaited_once_with(repo_ids)